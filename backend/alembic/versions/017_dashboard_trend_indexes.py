@@ -0,0 +1,26 @@
+"""Index created_at columns used by dashboard trend ranges
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-17 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_donations_created_at", "donations", ["created_at"], unique=False)
+    op.create_index("ix_users_created_at", "users", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at", table_name="users")
+    op.drop_index("ix_donations_created_at", table_name="donations")
@@ -0,0 +1,46 @@
+"""Composite (created_at, id) indexes for keyset pagination
+
+ix_donations_created_at_id covers 017's single-column
+ix_donations_created_at as a prefix, which is dropped.
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_donations_created_at_id", "donations", ["created_at", "id"]),
+    ("ix_donations_donor_id_created_at", "donations", ["donor_id", "created_at", "id"]),
+    ("ix_moving_bookings_created_at_id", "moving_bookings", ["created_at", "id"]),
+    ("ix_moving_bookings_requester_id_created_at", "moving_bookings", ["requester_id", "created_at", "id"]),
+    ("ix_notifications_user_id_created_at", "notifications", ["user_id", "created_at", "id"]),
+    ("ix_financial_transactions_created_at_id", "financial_transactions", ["created_at", "id"]),
+    ("ix_equipment_loans_created_at_id", "equipment_loans", ["created_at", "id"]),
+    ("ix_equipment_loans_borrower_id_created_at", "equipment_loans", ["borrower_id", "created_at", "id"]),
+    ("ix_pickup_requests_created_at_id", "pickup_requests", ["created_at", "id"]),
+    ("ix_pickup_requests_requester_id_created_at", "pickup_requests", ["requester_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    op.drop_index("ix_donations_created_at", table_name="donations")
+
+
+def downgrade() -> None:
+    op.create_index("ix_donations_created_at", "donations", ["created_at"], unique=False)
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
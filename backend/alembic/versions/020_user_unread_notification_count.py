@@ -0,0 +1,41 @@
+"""Denormalized unread notification counter on users
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-17 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("unread_notification_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE users
+        SET unread_notification_count = counts.unread
+        FROM (
+            SELECT user_id, COUNT(*) AS unread
+            FROM notifications
+            WHERE is_read = false
+            GROUP BY user_id
+        ) AS counts
+        WHERE users.id = counts.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "unread_notification_count")
@@ -0,0 +1,124 @@
+"""Range-partition notifications by created_at month
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-17 15:00:00.000000
+
+Rebuilds ``notifications`` as a table partitioned by month on ``created_at``
+with one partition per month from the oldest row through three months
+ahead, plus a default partition as a safety net. The
+``enforce_notification_retention`` job keeps creating partitions ahead and
+drops expired ones. The primary key becomes ``(id, created_at)`` because a
+partitioned table's unique constraints must include the partition key.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = "id, user_id, title, body, type, reference_type, reference_id, is_read, created_at"
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_notifications_user_id", "notifications", ["user_id"], unique=False)
+    op.create_index("ix_notifications_type", "notifications", ["type"], unique=False)
+    op.create_index("ix_notifications_user_id_created_at", "notifications", ["user_id", "created_at", "id"])
+    op.execute("CREATE INDEX idx_notifications_user_unread ON notifications (user_id, is_read) WHERE is_read = false")
+    op.execute("CREATE INDEX idx_notifications_created ON notifications (created_at DESC)")
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    op.execute("ALTER TABLE notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey")
+    for index in (
+        "ix_notifications_user_id",
+        "ix_notifications_type",
+        "ix_notifications_user_id_created_at",
+        "idx_notifications_user_unread",
+        "idx_notifications_created",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            title VARCHAR(255) NOT NULL,
+            body TEXT NOT NULL,
+            type VARCHAR(50) NOT NULL,
+            reference_type VARCHAR(50),
+            reference_id VARCHAR(36),
+            is_read BOOLEAN NOT NULL DEFAULT false,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month DATE := date_trunc('month', LEAST(
+                COALESCE((SELECT min(created_at) FROM notifications_unpartitioned), now()), now()
+            ))::date;
+            last_month DATE := (date_trunc('month', now()) + INTERVAL '3 months')::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + INTERVAL '1 month')::date
+                );
+                month := (month + INTERVAL '1 month')::date;
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+    _create_indexes()
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_unpartitioned")
+    op.execute("DROP TABLE notifications_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey")
+    for index in (
+        "ix_notifications_user_id",
+        "ix_notifications_type",
+        "ix_notifications_user_id_created_at",
+        "idx_notifications_user_unread",
+        "idx_notifications_created",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID NOT NULL PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            title VARCHAR(255) NOT NULL,
+            body TEXT NOT NULL,
+            type VARCHAR(50) NOT NULL,
+            reference_type VARCHAR(50),
+            reference_id VARCHAR(36),
+            is_read BOOLEAN NOT NULL DEFAULT false,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    _create_indexes()
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned")
+    op.execute("DROP TABLE notifications_partitioned")
@@ -0,0 +1,54 @@
+"""Version and highest bidder on auction items for optimistic bidding
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-17 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("auction_items", sa.Column("version", sa.Integer(), server_default="0", nullable=False))
+    op.add_column(
+        "auction_items",
+        sa.Column("highest_bidder_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_auction_items_highest_bidder_id_users",
+        "auction_items",
+        "users",
+        ["highest_bidder_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    # Current top bidder: highest pending/approved bid per item
+    op.execute(
+        """
+        UPDATE auction_items
+        SET highest_bidder_id = top.bidder_id
+        FROM (
+            SELECT DISTINCT ON (auction_item_id) auction_item_id, bidder_id
+            FROM auction_bids
+            WHERE status IN ('pending', 'approved')
+            ORDER BY auction_item_id, amount DESC
+        ) AS top
+        WHERE auction_items.id = top.auction_item_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_auction_items_highest_bidder_id_users", "auction_items", type_="foreignkey")
+    op.drop_column("auction_items", "highest_bidder_id")
+    op.drop_column("auction_items", "version")
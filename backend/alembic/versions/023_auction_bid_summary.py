@@ -0,0 +1,68 @@
+"""Bid count and highest bid on auction items
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-17 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("auction_items", sa.Column("bid_count", sa.Integer(), server_default="0", nullable=False))
+    op.add_column(
+        "auction_items",
+        sa.Column("highest_bid_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_auction_items_highest_bid_id_auction_bids",
+        "auction_items",
+        "auction_bids",
+        ["highest_bid_id"],
+        ["id"],
+        ondelete="SET NULL",
+        deferrable=True,
+        initially="DEFERRED",
+    )
+    op.execute(
+        """
+        UPDATE auction_items
+        SET bid_count = counts.bid_count
+        FROM (
+            SELECT auction_item_id, COUNT(*) AS bid_count
+            FROM auction_bids
+            GROUP BY auction_item_id
+        ) AS counts
+        WHERE auction_items.id = counts.auction_item_id
+        """
+    )
+    # Highest bid: the approved one once reviewed, else the top pending bid
+    op.execute(
+        """
+        UPDATE auction_items
+        SET highest_bid_id = top.id, highest_bidder_id = top.bidder_id
+        FROM (
+            SELECT DISTINCT ON (auction_item_id) auction_item_id, id, bidder_id
+            FROM auction_bids
+            WHERE status IN ('pending', 'approved')
+            ORDER BY auction_item_id, status = 'approved' DESC, amount DESC
+        ) AS top
+        WHERE auction_items.id = top.auction_item_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_auction_items_highest_bid_id_auction_bids", "auction_items", type_="foreignkey")
+    op.drop_column("auction_items", "highest_bid_id")
+    op.drop_column("auction_items", "bid_count")
@@ -0,0 +1,37 @@
+"""Indexes for auction bid ranking and history
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-17 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "024"
+down_revision: Union[str, None] = "023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_auction_bids_auction_item_id_amount",
+        "auction_bids",
+        ["auction_item_id", sa.text("amount DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_auction_bids_auction_item_id_created_at",
+        "auction_bids",
+        ["auction_item_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auction_bids_auction_item_id_created_at", table_name="auction_bids")
+    op.drop_index("ix_auction_bids_auction_item_id_amount", table_name="auction_bids")
@@ -0,0 +1,31 @@
+"""Partial index on end_time of open auctions for the close sweeper
+
+Revision ID: 025
+Revises: 024
+Create Date: 2026-10-17 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "025"
+down_revision: Union[str, None] = "024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_auction_items_open_end_time",
+        "auction_items",
+        ["end_time"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('ready', 'bidding')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auction_items_open_end_time", table_name="auction_items")
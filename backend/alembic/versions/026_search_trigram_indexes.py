@@ -0,0 +1,45 @@
+"""pg_trgm GIN indexes for substring search
+
+Revision ID: 026
+Revises: 025
+Create Date: 2026-10-17 21:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "026"
+down_revision: Union[str, None] = "025"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, column)
+INDEXES = [
+    ("ix_auction_items_title_trgm", "auction_items", "title"),
+    ("ix_users_full_name_trgm", "users", "full_name"),
+    ("ix_users_email_trgm", "users", "email"),
+    ("ix_medical_equipment_name_trgm", "medical_equipment", "name"),
+    ("ix_news_articles_title_trgm", "news_articles", "title"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    # The pg_trgm extension is left installed; other objects may depend on it
@@ -0,0 +1,94 @@
+"""Booking slot occupancy table replacing the CSV date/slot scan
+
+Revision ID: 027
+Revises: 026
+Create Date: 2026-10-17 22:00:00.000000
+"""
+
+import uuid
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "027"
+down_revision: Union[str, None] = "026"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _csv(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def _dates(value):
+    dates = set()
+    for raw in _csv(value):
+        try:
+            dates.add(date.fromisoformat(raw))
+        except ValueError:
+            continue
+    return dates
+
+
+def upgrade() -> None:
+    occupancy = op.create_table(
+        "booking_slot_occupancy",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("booking_date", sa.Date(), nullable=False),
+        sa.Column("time_slot", sa.String(length=5), nullable=False),
+        sa.Column(
+            "booking_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("moving_bookings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("requester_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.UniqueConstraint("booking_date", "time_slot", name="uq_booking_slot_occupancy_date_slot"),
+    )
+    op.create_index("ix_booking_slot_occupancy_booking_id", "booking_slot_occupancy", ["booking_id"])
+
+    # Occupy the upcoming slots of active bookings; past dates can no longer be booked
+    conn = op.get_bind()
+    today = date.today()
+    bookings = conn.execute(
+        sa.text(
+            """
+            SELECT id, requester_id, booking_date, booking_dates, time_slot, time_slots
+            FROM moving_bookings
+            WHERE status NOT IN ('rejected', 'cancelled')
+            ORDER BY created_at
+            """
+        )
+    ).all()
+    rows = []
+    for booking in bookings:
+        dates = {booking.booking_date, *_dates(booking.booking_dates)}
+        slots = {booking.time_slot, *_csv(booking.time_slots)}
+        rows.extend(
+            {
+                "id": uuid.uuid4(),
+                "booking_date": booking_date,
+                "time_slot": slot,
+                "booking_id": booking.id,
+                "requester_id": booking.requester_id,
+            }
+            for booking_date in dates
+            if booking_date >= today
+            for slot in slots
+        )
+    if rows:
+        # Earlier bookings keep a slot that legacy data double-booked
+        conn.execute(postgresql.insert(occupancy).on_conflict_do_nothing(), rows)
+
+    # Superseded by the occupancy unique key; it also blocked rebooking cancelled slots
+    op.drop_constraint("uq_booking_date_slot", "moving_bookings", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("uq_booking_date_slot", "moving_bookings", ["booking_date", "time_slot"])
+    op.drop_index("ix_booking_slot_occupancy_booking_id", table_name="booking_slot_occupancy")
+    op.drop_table("booking_slot_occupancy")
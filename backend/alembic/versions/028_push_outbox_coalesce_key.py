@@ -0,0 +1,33 @@
+"""Coalesce key on push outbox messages, rate-limited when drained
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-10-18 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "028"
+down_revision: Union[str, None] = "027"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("push_outbox", sa.Column("coalesce_key", sa.String(length=255), nullable=True))
+    op.create_index(
+        "ix_push_outbox_coalesce_key",
+        "push_outbox",
+        ["coalesce_key"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_push_outbox_coalesce_key", table_name="push_outbox")
+    op.drop_column("push_outbox", "coalesce_key")
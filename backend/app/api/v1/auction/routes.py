@@ -1,15 +1,20 @@
 """
 Auction API Routes - Lelang Barang
 """
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.deps import get_db, get_current_user, require_role
+from app.core.events import format_sse, get_auction_broker
+from app.core.pagination import CURSOR_QUERY, set_next_cursor
+from app.core.principal import Principal
 from app.core.media import save_upload_file
-from app.models.user import User
 from app.schemas.auction import (
     AuctionItemCreate,
     AuctionItemUpdate,
@@ -34,11 +39,41 @@ def _build_item_response(item) -> dict:
         **item.__dict__,
         "donor_name": item.donor.full_name if item.donor else "Unknown",
         "winner_name": item.winner.full_name if item.winner else None,
-        "bid_count": len(item.bids) if item.bids else 0,
         "images": item.images or [],
     }
 
 
+def _build_bid_response(bid, bidder_name: str) -> dict:
+    return {
+        **bid.__dict__,
+        "bidder_name": bidder_name,
+    }
+
+
+async def auction_price_events(request: Request, item_id: UUID, snapshot: dict) -> AsyncIterator[str]:
+    """
+    Stream an item's ``price`` events until the client disconnects.
+
+    Starts with `snapshot`, then relays the updates committed by bids and
+    approvals from the shared broker, skipping any not newer than the
+    version already sent.
+    """
+    async with get_auction_broker().subscribe(item_id) as queue:
+        yield "retry: 5000\n\n"
+        yield format_sse("price", snapshot)
+        version = snapshot["version"]
+        while not await request.is_disconnected():
+            try:
+                price_event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if price_event.data["version"] <= version:
+                continue
+            version = price_event.data["version"]
+            yield format_sse(price_event.event, price_event.data)
+
+
 @router.get("", response_model=AuctionItemListResponse)
 async def list_auctions(
     skip: int = Query(0, ge=0),
@@ -46,7 +81,7 @@ async def list_auctions(
     search: Optional[str] = None,
     status_filter: Optional[str] = Query(None, alias="status"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """List auctions by status bucket: ready, bidding, sold (or all)."""
     service = AuctionService(db)
@@ -59,7 +94,7 @@ async def list_my_bids(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     service = AuctionService(db)
     items, total = await service.get_my_bids(user_id=current_user.id, skip=skip, limit=limit)
@@ -70,43 +105,68 @@ async def list_my_bids(
 async def get_auction(
     item_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     service = AuctionService(db)
-    item = await service.get_item(item_id)
+    item = await service.get_item(item_id, with_bids=False)
 
     if not item:
         raise HTTPException(status_code=404, detail="Auction item not found")
 
-    is_highest_bidder = False
-    my_max_bid = None
-    if item.bids:
-        highest_bid = max(item.bids, key=lambda b: b.amount)
-        if highest_bid.bidder_id == current_user.id:
-            is_highest_bidder = True
-        user_bids = [b.amount for b in item.bids if b.bidder_id == current_user.id]
-        if user_bids:
-            my_max_bid = max(user_bids)
-
+    top_bids, my_max_bid, is_highest_bidder = await service.get_bid_ranking(item_id, current_user.id, limit=20)
     return {
         **_build_item_response(item),
-        "bids": [
-            {
-                **bid.__dict__,
-                "bidder_name": bid.bidder.full_name if bid.bidder else "Unknown",
-            }
-            for bid in sorted(item.bids, key=lambda b: b.amount, reverse=True)[:20]
-        ],
+        "bids": [_build_bid_response(bid, bidder_name) for bid, bidder_name in top_bids],
         "is_highest_bidder": is_highest_bidder,
         "my_max_bid": my_max_bid,
     }
 
 
+@router.get("/{item_id}/bids", response_model=List[AuctionBidResponse])
+async def list_auction_bids(
+    item_id: UUID,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """Full bid history of an item, newest first."""
+    service = AuctionService(db)
+    bids = await service.list_bids(item_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, [bid for bid, _ in bids], limit)
+    return [_build_bid_response(bid, bidder_name) for bid, bidder_name in bids]
+
+
+@router.get("/{item_id}/stream")
+async def stream_auction(
+    item_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Server-sent event stream of an item's price, bid count and top bidder.
+
+    Replaces refreshing ``GET /auctions/{item_id}`` while watching; only the
+    opening snapshot touches the database.
+    """
+    snapshot = await AuctionService(db).get_price_snapshot(item_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Auction item not found")
+    return StreamingResponse(
+        auction_price_events(request, item_id, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("", response_model=AuctionItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_auction(
     data: AuctionItemCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     service = AuctionService(db)
     item = await service.create_item(data=data, donor_id=current_user.id)
@@ -117,7 +177,7 @@ async def create_auction(
 @router.post("/upload-photo")
 async def upload_auction_photo(
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     photo_url = await save_upload_file(
         file=file,
@@ -133,7 +193,7 @@ async def update_auction(
     item_id: UUID,
     data: AuctionItemUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     service = AuctionService(db)
     item = await service.update_item(item_id=item_id, data=data)
@@ -146,15 +206,15 @@ async def place_bid(
     item_id: UUID,
     data: AuctionBidCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     service = AuctionService(db)
     bid = await service.place_bid(item_id=item_id, bidder_id=current_user.id, data=data)
     await db.commit()
-    return {
-        **bid.__dict__,
-        "bidder_name": current_user.full_name,
-    }
+    # Outbid notification in its own short transaction, after the item row is released
+    await service.send_outbid_notifications()
+    await db.commit()
+    return _build_bid_response(bid, current_user.full_name)
 
 
 @router.patch("/{item_id}/approve-bid", response_model=AuctionItemResponse)
@@ -162,7 +222,7 @@ async def approve_bid(
     item_id: UUID,
     data: AuctionBidApproveRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     service = AuctionService(db)
     item = await service.approve_bid(item_id=item_id, bid_id=data.bid_id, reviewer_id=current_user.id)
@@ -175,7 +235,7 @@ async def upload_payment_proof(
     item_id: UUID,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     proof_url = await save_upload_file(
         file=file,
@@ -194,7 +254,7 @@ async def verify_payment(
     item_id: UUID,
     data: AuctionPaymentVerifyRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     service = AuctionService(db)
     item = await service.verify_payment(item_id=item_id, verifier_id=current_user.id, status=data.status)
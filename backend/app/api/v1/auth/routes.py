@@ -11,14 +11,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.principal import Principal
 from app.core.rate_limit import enforce_rate_limit
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     generate_token_id,
-    verify_password,
+    verify_password_async,
 )
-from app.models.user import User
 from app.schemas.auth import (
     Token,
     LoginRequest,
@@ -64,8 +64,8 @@ async def login(
 ):
     """Login with email and password."""
     client_ip = request.client.host if request.client else "unknown"
-    enforce_rate_limit(f"auth:login:ip:{client_ip}", max_requests=20, window_seconds=60)
-    enforce_rate_limit(f"auth:login:email:{login_data.email.lower()}", max_requests=10, window_seconds=60)
+    await enforce_rate_limit(f"auth:login:ip:{client_ip}", max_requests=20, window_seconds=60)
+    await enforce_rate_limit(f"auth:login:email:{login_data.email.lower()}", max_requests=10, window_seconds=60)
 
     service = UserService(db)
     
@@ -77,7 +77,7 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(login_data.password, user.password_hash):
+    if not await verify_password_async(login_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Password salah",
@@ -114,7 +114,7 @@ async def refresh(
 ):
     """Refresh access token."""
     client_ip = request.client.host if request.client else "unknown"
-    enforce_rate_limit(f"auth:refresh:ip:{client_ip}", max_requests=30, window_seconds=60)
+    await enforce_rate_limit(f"auth:refresh:ip:{client_ip}", max_requests=30, window_seconds=60)
 
     from app.core.security import decode_token
     
@@ -165,10 +165,14 @@ async def refresh(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get current authenticated user info."""
-    return current_user
+    user = await UserService(db).get_by_id(str(current_user.id))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
 
 
 @router.post("/forgot-password")
@@ -182,8 +186,8 @@ async def forgot_password(
     Always returns success to avoid email enumeration.
     """
     client_ip = request.client.host if request.client else "unknown"
-    enforce_rate_limit(f"auth:forgot:ip:{client_ip}", max_requests=10, window_seconds=60)
-    enforce_rate_limit(f"auth:forgot:email:{payload.email.lower()}", max_requests=5, window_seconds=60)
+    await enforce_rate_limit(f"auth:forgot:ip:{client_ip}", max_requests=10, window_seconds=60)
+    await enforce_rate_limit(f"auth:forgot:email:{payload.email.lower()}", max_requests=5, window_seconds=60)
 
     user_service = UserService(db)
     reset_service = PasswordResetService(db)
@@ -220,7 +224,7 @@ async def reset_password(
 ):
     """Reset password using one-time token."""
     client_ip = request.client.host if request.client else "unknown"
-    enforce_rate_limit(f"auth:reset:ip:{client_ip}", max_requests=10, window_seconds=60)
+    await enforce_rate_limit(f"auth:reset:ip:{client_ip}", max_requests=10, window_seconds=60)
 
     reset_service = PasswordResetService(db)
     success = await reset_service.reset_password(payload.token, payload.new_password)
@@ -235,20 +239,29 @@ async def reset_password(
 
 @router.post("/logout")
 async def logout(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Revoke active refresh token for current user session."""
-    current_user.current_refresh_jti = None
+    user = await UserService(db).get_by_id(str(current_user.id))
+    if user:
+        user.current_refresh_jti = None
     return {"message": "Logged out successfully"}
 
 
 @router.post("/change-password")
 async def change_password(
     payload: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Change password for the current authenticated user."""
-    if not verify_password(payload.current_password, current_user.password_hash):
+    service = UserService(db)
+    user = await service.get_by_id(str(current_user.id))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    if not await verify_password_async(payload.current_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password saat ini tidak sesuai",
@@ -260,8 +273,5 @@ async def change_password(
             detail="Password baru tidak boleh sama dengan password lama",
         )
 
-    from app.core.security import get_password_hash
-
-    current_user.password_hash = get_password_hash(payload.new_password)
-    current_user.current_refresh_jti = None
+    await service.change_password(user, payload.new_password)
     return {"message": "Password berhasil diubah, silakan login ulang"}
@@ -3,14 +3,16 @@ Booking Routes
 """
 
 from datetime import date
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_role
+from app.core.pagination import CURSOR_QUERY, set_next_cursor
+from app.core.principal import Principal
 from app.models.user import User
 from app.schemas.booking import BookingCreate, BookingRejectRequest, BookingResponse, SlotsResponse
 from app.services.booking import BookingService
@@ -32,33 +34,40 @@ async def get_available_slots(
 
 @router.get("/my", response_model=List[BookingResponse])
 async def get_my_bookings(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's bookings."""
     service = BookingService(db)
-    bookings = await service.list_bookings(requester_id=str(current_user.id))
+    bookings = await service.list_bookings(limit=limit, requester_id=str(current_user.id), cursor=cursor)
+    set_next_cursor(response, bookings, limit)
     return bookings
 
 
 @router.get("", response_model=List[BookingResponse])
 async def list_bookings(
+    response: Response,
     status: str = Query(None, description="Filter by status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """List all bookings (Admin/Pengurus/Relawan only)."""
     service = BookingService(db)
-    bookings = await service.list_bookings(skip=skip, limit=limit, status=status)
+    bookings = await service.list_bookings(skip=skip, limit=limit, status=status, cursor=cursor)
+    set_next_cursor(response, bookings, limit)
     return bookings
 
 
 @router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def create_booking(
     booking_data: BookingCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new booking."""
@@ -100,7 +109,7 @@ async def create_booking(
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get booking details."""
@@ -122,7 +131,7 @@ async def get_booking(
 @router.patch("/{booking_id}/approve", response_model=BookingResponse)
 async def approve_booking(
     booking_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Approve a pending booking (Admin/Pengurus/Relawan)."""
@@ -137,7 +146,7 @@ async def approve_booking(
 async def reject_booking(
     booking_id: UUID,
     payload: BookingRejectRequest,
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Reject a pending booking (Admin/Pengurus/Relawan)."""
@@ -156,7 +165,7 @@ async def reject_booking(
 @router.patch("/{booking_id}/cancel", response_model=BookingResponse)
 async def cancel_booking(
     booking_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Cancel own pending booking."""
@@ -180,7 +189,7 @@ async def cancel_booking(
 async def assign_volunteer(
     booking_id: UUID,
     volunteer_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Assign volunteer to booking."""
@@ -195,7 +204,7 @@ async def assign_volunteer(
 async def update_booking_status(
     booking_id: UUID,
     status: str = Query(..., regex="^(in_progress|completed)$"),
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Update booking status (Admin/Pengurus/Relawan)."""
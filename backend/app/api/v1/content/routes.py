@@ -10,8 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_role
+from app.core.principal import Principal
 from app.core.media import save_upload_file
-from app.models.user import User
 from app.schemas.content import (
     ProgramCreate, ProgramResponse, ProgramUpdate,
     NewsCreate, NewsResponse, NewsUpdate, NewsReject, NewsGenerateRequest, NewsGenerateResponse,
@@ -47,7 +47,7 @@ async def list_programs(
 @router.post("/programs/upload-banner")
 async def upload_program_banner(
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     """Upload program banner image and return media URL."""
     banner_url = await save_upload_file(
@@ -86,7 +86,7 @@ async def get_program(
 @router.post("/programs", response_model=ProgramResponse, status_code=status.HTTP_201_CREATED)
 async def create_program(
     program_data: ProgramCreate,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Create new program (Admin/Pengurus only)."""
@@ -99,7 +99,7 @@ async def create_program(
 async def update_program(
     program_id: UUID,
     program_data: ProgramUpdate,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Update program (Admin/Pengurus only)."""
@@ -113,7 +113,7 @@ async def update_program(
 @router.delete("/programs/{program_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_program(
     program_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete program (Admin/Pengurus only)."""
@@ -129,7 +129,7 @@ async def delete_program(
 @router.post("/programs/{program_id}/publish", response_model=ProgramResponse)
 async def toggle_publish_program(
     program_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Toggle publish/unpublish on a program (Admin/Pengurus only)."""
@@ -151,13 +151,14 @@ async def list_news(
     category: str = Query(None),
     is_published: Optional[bool] = Query(None),
     news_status: str = Query(None, description="Filter by publishing status"),
+    search: str = Query(None, description="Search by title"),
     db: AsyncSession = Depends(get_db)
 ):
     """List news articles."""
     service = ContentService(db)
     articles = await service.list_news(
         skip=skip, limit=limit, category=category,
-        is_published=is_published, news_status=news_status,
+        is_published=is_published, news_status=news_status, search=search,
     )
     return articles
 
@@ -165,7 +166,7 @@ async def list_news(
 @router.post("/news/upload-banner")
 async def upload_news_banner(
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     """Upload news banner image and return media URL."""
     banner_url = await save_upload_file(
@@ -180,7 +181,7 @@ async def upload_news_banner(
 @router.post("/news/generate-content", response_model=NewsGenerateResponse)
 async def generate_news_content(
     payload: NewsGenerateRequest,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     """Generate long-form news content from short text using Gemini."""
     service = AIContentService()
@@ -204,7 +205,7 @@ async def get_news(
 @router.post("/news", response_model=NewsResponse, status_code=status.HTTP_201_CREATED)
 async def create_news(
     news_data: NewsCreate,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Create new news article (Admin/Pengurus only)."""
@@ -217,7 +218,7 @@ async def create_news(
 async def update_news(
     news_id: UUID,
     news_data: NewsUpdate,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Update news article (Admin/Pengurus only)."""
@@ -231,7 +232,7 @@ async def update_news(
 @router.delete("/news/{news_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_news(
     news_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete news article (Admin/Pengurus only)."""
@@ -245,7 +246,7 @@ async def delete_news(
 @router.post("/news/{news_id}/submit", response_model=NewsResponse)
 async def submit_news_for_review(
     news_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Submit a draft article for review."""
@@ -264,7 +265,7 @@ async def submit_news_for_review(
 @router.post("/news/{news_id}/approve", response_model=NewsResponse)
 async def approve_news(
     news_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Approve a pending news article (Admin/Pengurus only)."""
@@ -288,7 +289,7 @@ async def approve_news(
 async def reject_news(
     news_id: UUID,
     body: NewsReject,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Reject a pending news article with a reason (Admin/Pengurus only)."""
@@ -311,7 +312,7 @@ async def reject_news(
 @router.patch("/news/{news_id}/publish", response_model=NewsResponse)
 async def publish_news(
     news_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Toggle publish/unpublish on a news article (Admin/Pengurus only)."""
@@ -4,16 +4,17 @@ Donation Routes
 
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, UploadFile, File, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_user, get_optional_current_user, require_role
+from app.core.pagination import CURSOR_QUERY, set_next_cursor
+from app.core.principal import Principal
 from app.core.media import save_upload_file
 from app.core.rate_limit import enforce_rate_limit
 from app.core.security import verify_hmac_signature
-from app.models.user import User
 from app.schemas.donation import DonationCreate, DonationResponse, DonationVerify
 from app.services.donation import DonationService
 
@@ -33,35 +34,42 @@ router = APIRouter()
 
 @router.get("", response_model=List[DonationResponse])
 async def list_donations(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: str = Query(None),
     donation_type: str = Query(None),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """List all donations (Admin/Pengurus only)."""
     service = DonationService(db)
     donations = await service.list_donations(
-        skip=skip, limit=limit, status=status, donation_type=donation_type
+        skip=skip, limit=limit, status=status, donation_type=donation_type, cursor=cursor
     )
+    set_next_cursor(response, donations, limit)
     return donations
 
 
 @router.get("/my", response_model=List[DonationResponse])
 async def get_my_donations(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's donations."""
     service = DonationService(db)
-    donations = await service.list_donations(donor_id=str(current_user.id))
+    donations = await service.list_donations(limit=limit, donor_id=str(current_user.id), cursor=cursor)
+    set_next_cursor(response, donations, limit)
     return donations
 
 
 @router.get("/summary")
 async def get_donation_summary(
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get donation summary (Admin/Pengurus only)."""
@@ -72,7 +80,7 @@ async def get_donation_summary(
 @router.get("/{donation_id}", response_model=DonationResponse)
 async def get_donation(
     donation_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get donation by ID."""
@@ -93,7 +101,7 @@ async def get_donation(
 @router.post("", response_model=DonationResponse, status_code=status.HTTP_201_CREATED)
 async def create_donation(
     donation_data: DonationCreate,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[Principal] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new donation (public or authenticated)."""
@@ -107,7 +115,7 @@ async def create_donation(
 async def verify_donation(
     donation_id: UUID,
     verify_data: DonationVerify,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Verify a donation (Admin/Pengurus only)."""
@@ -124,7 +132,7 @@ async def verify_donation(
 async def upload_payment_proof(
     donation_id: UUID,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload payment proof for manual transfer."""
@@ -159,7 +167,7 @@ async def handle_payment_webhook(
     TODO: Add rate limiting middleware to this endpoint.
     """
     client_ip = request.client.host if request.client else "unknown"
-    enforce_rate_limit(f"donation:webhook:ip:{client_ip}", max_requests=60, window_seconds=60)
+    await enforce_rate_limit(f"donation:webhook:ip:{client_ip}", max_requests=60, window_seconds=60)
 
     # Validate required payload fields
     if not payload or "transaction_status" not in payload:
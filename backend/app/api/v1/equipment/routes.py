@@ -2,15 +2,16 @@
 Equipment Routes
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_role
+from app.core.pagination import CURSOR_QUERY, set_next_cursor
+from app.core.principal import Principal
 from app.core.media import save_upload_file
-from app.models.user import User
 from app.schemas.equipment import EquipmentCreate, EquipmentResponse, EquipmentUpdate, EquipmentLoanCreate, EquipmentLoanResponse
 from app.services.equipment import EquipmentService
 
@@ -26,12 +27,13 @@ async def list_equipment(
     limit: int = Query(20, ge=1, le=100),
     category: str = Query(None),
     available_only: bool = Query(False),
+    search: str = Query(None, description="Search by name"),
     db: AsyncSession = Depends(get_db)
 ):
     """List all equipment."""
     service = EquipmentService(db)
     equipment = await service.list_equipment(
-        skip=skip, limit=limit, category=category, available_only=available_only
+        skip=skip, limit=limit, category=category, available_only=available_only, search=search
     )
     return equipment
 
@@ -47,23 +49,31 @@ async def get_equipment_stats(
 
 @router.get("/my-loans", response_model=List[EquipmentLoanResponse])
 async def get_my_loans(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's equipment loans."""
     service = EquipmentService(db)
-    loans = await service.list_loans(borrower_id=str(current_user.id))
+    loans = await service.list_loans(limit=limit, borrower_id=str(current_user.id), cursor=cursor)
+    set_next_cursor(response, loans, limit)
     return loans
 
 
 @router.get("/loans/my", response_model=List[EquipmentLoanResponse])
 async def get_my_loans_alias(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Alias endpoint for mobile client compatibility."""
     service = EquipmentService(db)
-    loans = await service.list_loans(borrower_id=str(current_user.id))
+    loans = await service.list_loans(limit=limit, borrower_id=str(current_user.id), cursor=cursor)
+    set_next_cursor(response, loans, limit)
     return loans
 
 
@@ -83,7 +93,7 @@ async def get_equipment(
 @router.post("", response_model=EquipmentResponse, status_code=status.HTTP_201_CREATED)
 async def create_equipment(
     equipment_data: EquipmentCreate,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Create new equipment (Admin/Pengurus only)."""
@@ -95,7 +105,7 @@ async def create_equipment(
 @router.post("/upload-photo")
 async def upload_equipment_photo(
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
 ):
     """Upload equipment photo and return media URL."""
     media_url = await save_upload_file(
@@ -111,7 +121,7 @@ async def upload_equipment_photo(
 async def update_equipment(
     equipment_id: UUID,
     equipment_data: EquipmentUpdate,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Update equipment (Admin/Pengurus only)."""
@@ -125,7 +135,7 @@ async def update_equipment(
 @router.delete("/{equipment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_equipment(
     equipment_id: UUID,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete equipment (Admin only)."""
@@ -140,11 +150,13 @@ async def delete_equipment(
 
 @router.get("/loans/all", response_model=List[EquipmentLoanResponse])
 async def list_loans(
+    response: Response,
     status: str = Query(None),
     equipment_id: UUID = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """List all loans (Admin/Pengurus only)."""
@@ -153,8 +165,10 @@ async def list_loans(
         skip=skip, 
         limit=limit, 
         status=status,
-        equipment_id=str(equipment_id) if equipment_id else None
+        equipment_id=str(equipment_id) if equipment_id else None,
+        cursor=cursor,
     )
+    set_next_cursor(response, loans, limit)
     return loans
 
 
@@ -162,7 +176,7 @@ async def list_loans(
 async def request_loan(
     equipment_id: UUID,
     loan_data: EquipmentLoanCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Request to borrow equipment."""
@@ -175,7 +189,7 @@ async def request_loan(
 async def request_loan_alias(
     equipment_id: UUID,
     loan_data: EquipmentLoanCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Alias endpoint for mobile client compatibility."""
@@ -187,7 +201,7 @@ async def request_loan_alias(
 @router.patch("/loans/{loan_id}/approve", response_model=EquipmentLoanResponse)
 async def approve_loan(
     loan_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Approve a loan request (Admin/Pengurus only)."""
@@ -201,7 +215,7 @@ async def approve_loan(
 @router.patch("/loans/{loan_id}/reject", response_model=EquipmentLoanResponse)
 async def reject_loan(
     loan_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Reject a loan request (Admin/Pengurus only)."""
@@ -215,7 +229,7 @@ async def reject_loan(
 @router.patch("/loans/{loan_id}/borrowed", response_model=EquipmentLoanResponse)
 async def mark_as_borrowed(
     loan_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark loan as borrowed."""
@@ -229,7 +243,7 @@ async def mark_as_borrowed(
 @router.patch("/loans/{loan_id}/returned", response_model=EquipmentLoanResponse)
 async def mark_as_returned(
     loan_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark loan as returned."""
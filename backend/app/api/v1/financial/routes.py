@@ -10,7 +10,8 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db, require_role
-from app.models.user import User
+from app.core.pagination import CURSOR_QUERY, next_cursor
+from app.core.principal import Principal
 from app.schemas.financial import (
     FinanceCategoryCreate,
     FinanceCategoryResponse,
@@ -51,7 +52,7 @@ def _serialize_transaction(item) -> FinancialTransactionResponse:
 @router.get("/categories", response_model=list[FinanceCategoryResponse])
 async def list_categories(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "superadmin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "superadmin", "pengurus")),
 ):
     service = FinancialService(db)
     return await service.list_categories()
@@ -61,7 +62,7 @@ async def list_categories(
 async def create_category(
     payload: FinanceCategoryCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "superadmin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "superadmin", "pengurus")),
 ):
     service = FinancialService(db)
     return await service.create_category(payload.name)
@@ -76,8 +77,9 @@ async def list_transactions(
     category_id: Optional[UUID] = Query(default=None),
     date_from: Optional[date_type] = Query(default=None),
     date_to: Optional[date_type] = Query(default=None),
+    cursor: Optional[str] = CURSOR_QUERY,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "superadmin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "superadmin", "pengurus")),
 ):
     service = FinancialService(db)
     items, total = await service.list_transactions(
@@ -88,10 +90,12 @@ async def list_transactions(
         category_id=category_id,
         date_from=date_from,
         date_to=date_to,
+        cursor=cursor,
     )
     return {
         "transactions": [_serialize_transaction(item) for item in items],
         "total": total,
+        "next_cursor": next_cursor(items, limit),
     }
 
 
@@ -99,7 +103,7 @@ async def list_transactions(
 async def create_transaction(
     payload: FinancialTransactionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "superadmin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "superadmin", "pengurus")),
 ):
     service = FinancialService(db)
     transaction = await service.create_transaction(
@@ -118,7 +122,7 @@ async def review_transaction(
     transaction_id: UUID,
     payload: FinancialTransactionReview,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "superadmin")),
+    current_user: Principal = Depends(require_role("admin", "superadmin")),
 ):
     service = FinancialService(db)
     transaction = await service.review_transaction(
@@ -134,7 +138,7 @@ async def review_transaction(
 @router.get("/balances", response_model=FinancialBalanceResponse)
 async def get_balances(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("admin", "superadmin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "superadmin", "pengurus")),
 ):
     service = FinancialService(db)
     return await service.get_balances()
@@ -1,14 +1,19 @@
 """
 Notification API Routes
 """
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.deps import get_db, get_current_user
-from app.models.user import User
+from app.core.events import format_sse, get_event_broker
+from app.core.pagination import CURSOR_QUERY
+from app.core.principal import Principal
 from app.schemas.notification import (
     PushTokenCreate,
     PushTokenResponse,
@@ -22,13 +27,33 @@ from app.services.notification_service import NotificationService
 router = APIRouter()
 
 
+async def notification_events(request: Request, user_id: UUID, unread_count: int) -> AsyncIterator[str]:
+    """
+    Stream the user's events until the client disconnects.
+
+    Starts with the current unread count, then relays ``notification`` and
+    ``unread_count`` events; a comment line every ``SSE_HEARTBEAT_SECONDS``
+    keeps proxies from closing the idle connection.
+    """
+    async with get_event_broker().subscribe(user_id) as queue:
+        yield "retry: 5000\n\n"
+        yield format_sse("unread_count", {"count": unread_count})
+        while not await request.is_disconnected():
+            try:
+                user_event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(user_event.event, user_event.data)
+
+
 # ============== Push Tokens ==============
 
 @router.post("/push-token", response_model=PushTokenResponse, status_code=status.HTTP_201_CREATED)
 async def register_push_token(
     data: PushTokenCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Register a push token for the current user."""
     service = NotificationService(db)
@@ -45,7 +70,7 @@ async def register_push_token(
 async def remove_push_token(
     token: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Remove a push token (e.g., on logout)."""
     service = NotificationService(db)
@@ -65,8 +90,9 @@ async def list_notifications(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     include_read: bool = Query(True),
+    cursor: Optional[str] = CURSOR_QUERY,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Get notifications for the current user."""
     service = NotificationService(db)
@@ -75,19 +101,21 @@ async def list_notifications(
         limit=limit,
         offset=offset,
         include_read=include_read,
+        cursor=cursor,
     )
     
     return {
         "notifications": result["notifications"],
         "unread_count": result["unread_count"],
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
     }
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 async def get_unread_count(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Get unread notification count."""
     service = NotificationService(db)
@@ -95,11 +123,31 @@ async def get_unread_count(
     return {"count": count}
 
 
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Server-sent event stream of new notifications and unread-count changes.
+
+    Replaces polling the list and ``/unread-count`` while connected; on
+    (re)connect the first event carries the current unread count.
+    """
+    count = await NotificationService(db).get_unread_count(current_user.id)
+    return StreamingResponse(
+        notification_events(request, current_user.id, count),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{notification_id}/read")
 async def mark_as_read(
     notification_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Mark a notification as read."""
     service = NotificationService(db)
@@ -113,7 +161,7 @@ async def mark_as_read(
 @router.patch("/read-all")
 async def mark_all_as_read(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Mark all notifications as read."""
     service = NotificationService(db)
@@ -2,15 +2,16 @@
 Pickup Routes
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Body
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, UploadFile, File, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.media import save_upload_file
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_role
-from app.models.user import User
+from app.core.pagination import CURSOR_QUERY, set_next_cursor
+from app.core.principal import Principal
 from app.schemas.pickup import PickupCreate, PickupResponse, PickupSchedule, PickupComplete, PickupReviewRequest
 from app.services.pickup import PickupService
 
@@ -21,36 +22,43 @@ MAX_PICKUP_IMAGE_SIZE = 8 * 1024 * 1024
 
 @router.get("", response_model=List[PickupResponse])
 async def list_pickups(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: str = Query(None),
     pickup_type: str = Query(None),
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """List all pickups (Admin/Pengurus only)."""
     service = PickupService(db)
     pickups = await service.list_pickups(
-        skip=skip, limit=limit, status=status, pickup_type=pickup_type
+        skip=skip, limit=limit, status=status, pickup_type=pickup_type, cursor=cursor
     )
+    set_next_cursor(response, pickups, limit)
     return pickups
 
 
 @router.get("/my", response_model=List[PickupResponse])
 async def get_my_pickups(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = CURSOR_QUERY,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's pickup requests."""
     service = PickupService(db)
-    pickups = await service.list_pickups(requester_id=str(current_user.id))
+    pickups = await service.list_pickups(limit=limit, requester_id=str(current_user.id), cursor=cursor)
+    set_next_cursor(response, pickups, limit)
     return pickups
 
 
 @router.get("/assigned", response_model=List[PickupResponse])
 async def get_assigned_pickups(
     status: str = Query(None),
-    current_user: User = Depends(require_role("relawan")),
+    current_user: Principal = Depends(require_role("relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get pickups assigned to current volunteer."""
@@ -61,7 +69,7 @@ async def get_assigned_pickups(
 
 @router.get("/stats")
 async def get_pickup_stats(
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get pickup statistics (Admin/Pengurus only)."""
@@ -72,7 +80,7 @@ async def get_pickup_stats(
 @router.get("/{pickup_id}", response_model=PickupResponse)
 async def get_pickup(
     pickup_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get pickup by ID."""
@@ -94,7 +102,7 @@ async def get_pickup(
 @router.post("", response_model=PickupResponse, status_code=status.HTTP_201_CREATED)
 async def create_pickup(
     pickup_data: PickupCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new pickup request."""
@@ -106,7 +114,7 @@ async def create_pickup(
 @router.post("/upload-photo")
 async def upload_pickup_photo(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Upload pickup item photo and return media URL."""
     media_url = await save_upload_file(
@@ -122,7 +130,7 @@ async def upload_pickup_photo(
 async def review_pickup(
     pickup_id: UUID,
     review_data: PickupReviewRequest,
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Review incoming pickup request: accept now or confirm later."""
@@ -137,7 +145,7 @@ async def review_pickup(
 async def assign_pickup(
     pickup_id: UUID,
     volunteer_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Assign volunteer to pickup (Admin/Pengurus only)."""
@@ -152,7 +160,7 @@ async def assign_pickup(
 async def schedule_pickup(
     pickup_id: UUID,
     schedule_data: PickupSchedule,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Schedule a pickup (Admin/Pengurus only)."""
@@ -166,7 +174,7 @@ async def schedule_pickup(
 @router.patch("/{pickup_id}/start", response_model=PickupResponse)
 async def start_pickup(
     pickup_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark pickup as in_progress."""
@@ -188,7 +196,7 @@ async def start_pickup(
 async def complete_pickup(
     pickup_id: UUID,
     complete_data: PickupComplete,
-    current_user: User = Depends(require_role("admin", "pengurus", "relawan")),
+    current_user: Principal = Depends(require_role("admin", "pengurus", "relawan")),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark pickup as completed."""
@@ -211,7 +219,7 @@ async def cancel_pickup(
     pickup_id: UUID,
     reason: str = Query(None),
     payload: dict | None = Body(default=None),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Cancel a pickup request."""
@@ -13,25 +13,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_role
+from app.core.principal import Principal
 from app.schemas.user import UserResponse, UserUpdate, UserCreate, UserRoleUpdate
 from app.services.user import UserService
-from app.models.user import User
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_my_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user's profile."""
-    return current_user
+    user = await UserService(db).get_by_id(str(current_user.id))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
 
 
 @router.put("/me", response_model=UserResponse)
 async def update_my_profile(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update current user's profile."""
@@ -49,7 +53,7 @@ async def update_my_profile(
 async def export_users(
     search: str = Query(None),
     role: str = Query(None),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Export users as CSV (Admin/Pengurus only)."""
@@ -86,7 +90,7 @@ async def list_users(
     search: str = Query(None, description="Search by name or email"),
     role: str = Query(None, description="Filter by role"),
     is_active: bool = Query(None, description="Filter by active status"),
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """List all users with pagination and filters (Admin/Pengurus)."""
@@ -98,7 +102,7 @@ async def list_users(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    current_user: User = Depends(require_role("admin", "pengurus")),
+    current_user: Principal = Depends(require_role("admin", "pengurus")),
     db: AsyncSession = Depends(get_db)
 ):
     """Get user by ID (Admin/Pengurus)."""
@@ -116,7 +120,7 @@ async def get_user(
 async def create_user(
     user_data: UserCreate,
     role: str = Query("sahabat", description="Role for the new user"),
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new user with specific role (Admin only)."""
@@ -138,7 +142,7 @@ async def create_user(
 async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Update any user (Admin only)."""
@@ -155,7 +159,7 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: UUID,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Deactivate a user (Admin only - soft delete)."""
@@ -173,58 +177,49 @@ async def delete_user(
 async def change_user_role(
     user_id: UUID,
     role_data: UserRoleUpdate,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Change user role (Admin only)."""
     service = UserService(db)
-    user = await service.get_by_id(str(user_id))
+    user = await service.set_role(str(user_id), role_data.role)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    user.role = role_data.role
-    await db.flush()
-    await db.refresh(user)
     return user
 
 
 @router.post("/{user_id}/deactivate", response_model=UserResponse)
 async def deactivate_user(
     user_id: UUID,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Deactivate (soft-delete) a user (Admin only)."""
     service = UserService(db)
-    user = await service.get_by_id(str(user_id))
+    user = await service.set_active(str(user_id), False)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    user.is_active = False
-    await db.flush()
-    await db.refresh(user)
     return user
 
 
 @router.post("/{user_id}/activate", response_model=UserResponse)
 async def activate_user(
     user_id: UUID,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Reactivate a user (Admin only)."""
     service = UserService(db)
-    user = await service.get_by_id(str(user_id))
+    user = await service.set_active(str(user_id), True)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    user.is_active = True
-    await db.flush()
-    await db.refresh(user)
     return user
 
 
 @router.post("/{user_id}/reset-password")
 async def admin_reset_password(
     user_id: UUID,
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
     db: AsyncSession = Depends(get_db)
 ):
     """Initiate admin-triggered password reset email (Admin only)."""
@@ -0,0 +1,207 @@
+"""
+Aggregate query helpers for dashboard and reporting endpoints.
+"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+BUCKET_UNITS = ("month", "week")
+
+
+def _dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def _bucket_start(day: date, unit: str) -> date:
+    if unit == "month":
+        return day.replace(day=1)
+    return day - timedelta(days=day.weekday())
+
+
+def _shift_bucket(start: date, unit: str, steps: int) -> date:
+    if unit == "week":
+        return start + timedelta(weeks=steps)
+    month_index = start.year * 12 + (start.month - 1) + steps
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def bucket_starts(unit: str, periods: int, today: Optional[date] = None) -> List[date]:
+    """Return the start dates of the last `periods` buckets, oldest first."""
+    if unit not in BUCKET_UNITS:
+        raise ValueError(f"Unsupported bucket unit: {unit}")
+    current = _bucket_start(today or datetime.now(timezone.utc).date(), unit)
+    return [_shift_bucket(current, unit, -offset) for offset in range(periods - 1, -1, -1)]
+
+
+def _bucket_expression(dialect: str, column, unit: str):
+    # Constants are inlined (not bound) so SELECT and GROUP BY render the
+    # same expression; PostgreSQL rejects the query otherwise.
+    if dialect == "sqlite":
+        if unit == "month":
+            return func.strftime(literal_column("'%Y-%m-01'"), column)
+        # Roll forward to Sunday, then back to that week's Monday (ISO week start).
+        return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    return func.date_trunc(literal_column(f"'{unit}'"), column)
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _bound(column, day: date):
+    if isinstance(column.type, DateTime):
+        return datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return day
+
+
+async def time_bucket_series(
+    db: AsyncSession,
+    column,
+    aggregate,
+    *,
+    unit: str,
+    periods: int,
+    filters: Sequence = (),
+    default: Any = 0,
+    today: Optional[date] = None,
+) -> List[Tuple[date, Any]]:
+    """
+    Aggregate rows into calendar buckets with a single GROUP BY query.
+
+    Args:
+        db: Database session
+        column: Date/DateTime column that places a row in a bucket
+        aggregate: Aggregate expression, e.g. ``func.sum(Donation.amount)``
+        unit: Bucket size, ``"month"`` or ``"week"`` (ISO weeks, Monday start)
+        periods: Number of buckets ending with the current one
+        filters: Extra WHERE criteria
+        default: Value used for buckets without rows
+
+    Returns:
+        List of ``(bucket_start, value)`` tuples, oldest first and zero-filled.
+
+    Note:
+        Rows are selected with a plain range on ``column`` so an index on it
+        can be used; bucketing uses ``date_trunc`` on PostgreSQL and
+        ``strftime``/``date`` on SQLite (tests).
+    """
+    starts = bucket_starts(unit, periods, today)
+    range_end = _shift_bucket(starts[-1], unit, 1)
+
+    bucket = _bucket_expression(_dialect_name(db), column, unit).label("bucket")
+    query = (
+        select(bucket, aggregate)
+        .where(
+            column >= _bound(column, starts[0]),
+            column < _bound(column, range_end),
+            *filters,
+        )
+        .group_by(bucket)
+    )
+    rows = (await db.execute(query)).all()
+
+    values = {_as_date(bucket_value): value for bucket_value, value in rows}
+    return [(start, values.get(start, default) or default) for start in starts]
+
+
+def count_if(condition, dialect: str = "postgresql"):
+    """
+    Count rows matching `condition` inside a larger aggregate SELECT.
+
+    Renders ``COUNT(*) FILTER (WHERE ...)`` on PostgreSQL and a portable
+    ``SUM(CASE ...)`` elsewhere (SQLite in tests).
+    """
+    if dialect == "postgresql":
+        return func.count().filter(condition)
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+async def filtered_counts(
+    db: AsyncSession,
+    source,
+    counters: Mapping[str, Any],
+    *,
+    filters: Sequence = (),
+    extra: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Compute several counters over one table in a single scan.
+
+    Args:
+        db: Database session
+        source: Model or table to scan
+        counters: Name -> condition; ``None`` counts every (filtered) row
+        filters: WHERE criteria applied to all counters
+        extra: Name -> additional aggregate expression (e.g. a SUM)
+
+    Returns:
+        Dict of counter names to ints, plus raw values for `extra`.
+    """
+    dialect = _dialect_name(db)
+    columns = [
+        (func.count() if condition is None else count_if(condition, dialect)).label(name)
+        for name, condition in counters.items()
+    ]
+    columns += [expression.label(name) for name, expression in (extra or {}).items()]
+
+    query = select(*columns).select_from(source)
+    if filters:
+        query = query.where(*filters)
+    row = (await db.execute(query)).one()._mapping
+
+    result: Dict[str, Any] = {name: int(row[name] or 0) for name in counters}
+    result.update({name: row[name] for name in (extra or {})})
+    return result
+
+
+QueryJob = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def fan_out(
+    db: AsyncSession,
+    jobs: Mapping[str, QueryJob],
+    *,
+    limit: int,
+    concurrent: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Run independent read-only queries concurrently on separate pooled sessions.
+
+    Args:
+        db: Request session; its engine supplies the extra connections
+        jobs: Name -> coroutine function taking the session to query with
+        limit: Max jobs in flight (and so pooled connections held) at once
+        concurrent: Force or disable fan-out; defaults to every dialect but
+            SQLite, whose connections serialize and cannot see rows the
+            request session has not committed yet (tests)
+
+    Returns:
+        Dict of job names to results.
+
+    Note:
+        Each job sees its own snapshot of the database, so counts taken by
+        different jobs may be a few rows apart under concurrent writes.
+    """
+    if concurrent is None:
+        concurrent = _dialect_name(db) != "sqlite"
+    if not concurrent or len(jobs) < 2:
+        return {name: await job(db) for name, job in jobs.items()}
+
+    session_factory = async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(job: QueryJob) -> Any:
+        async with semaphore:
+            async with session_factory() as session:
+                return await job(session)
+
+    results = await asyncio.gather(*(run(job) for job in jobs.values()))
+    return dict(zip(jobs, results))
@@ -37,6 +37,22 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.scheduled_jobs.expire_unpaid_donations_task",
         "schedule": 3600.0,  # Once hourly
     },
+    "refresh-dashboard-snapshots": {
+        "task": "app.tasks.scheduled_jobs.refresh_dashboard_snapshots_task",
+        "schedule": float(settings.DASHBOARD_SNAPSHOT_REFRESH_SECONDS),
+    },
+    "drain-push-outbox": {
+        "task": "app.tasks.scheduled_jobs.drain_push_outbox_task",
+        "schedule": float(settings.PUSH_OUTBOX_DRAIN_SECONDS),
+    },
+    "process-push-receipts": {
+        "task": "app.tasks.scheduled_jobs.process_push_receipts_task",
+        "schedule": float(settings.PUSH_RECEIPT_CHECK_SECONDS),
+    },
+    "enforce-notification-retention": {
+        "task": "app.tasks.scheduled_jobs.enforce_notification_retention_task",
+        "schedule": 86400.0,  # Once daily
+    },
 }
 
 # Create task placeholders (will be implemented in later phases)
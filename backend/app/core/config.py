@@ -3,7 +3,7 @@ Application Configuration Settings
 """
 
 import json
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import validator
 
@@ -20,6 +20,59 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_CACHE_ENABLED: bool = True
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+
+    # Rate limiting (in-process fallback when Redis is down)
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 100_000
+
+    # Dashboard snapshots (refreshed by Celery beat)
+    DASHBOARD_SNAPSHOT_REFRESH_SECONDS: int = 60
+    DASHBOARD_SNAPSHOT_TTL_SECONDS: int = 300
+    # Max aggregate queries a dashboard payload runs at once (one pooled connection each)
+    DASHBOARD_QUERY_CONCURRENCY: int = 4
+
+    # Authenticated principal cache (get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+    PRINCIPAL_CACHE_REDIS: bool = False
+
+    # RBAC permission matrix (in-memory, revalidated against a Redis version stamp)
+    RBAC_VERSION_CHECK_SECONDS: int = 5
+    RBAC_MATRIX_MAX_AGE_SECONDS: int = 300
+
+    # Push notifications
+    EXPO_PUSH_URL: str = "https://exp.host/--/api/v2/push/send"
+    # Push outbox drain (Celery beat); failed sends retry with exponential backoff
+    PUSH_OUTBOX_DRAIN_SECONDS: int = 5
+    PUSH_OUTBOX_BATCH_SIZE: int = 500
+    PUSH_OUTBOX_MAX_ATTEMPTS: int = 6
+    PUSH_OUTBOX_RETRY_BASE_SECONDS: int = 30
+    PUSH_OUTBOX_RETRY_MAX_SECONDS: int = 3600
+    # Push receipts (Expo recommends waiting ~15 minutes after sending)
+    EXPO_RECEIPTS_URL: str = "https://exp.host/--/api/v2/push/getReceipts"
+    PUSH_RECEIPT_CHECK_SECONDS: int = 900
+    PUSH_RECEIPT_DELAY_SECONDS: int = 900
+    PUSH_RECEIPT_BATCH_SIZE: int = 5000
+    # Outbox rows in a final state are purged this long after they were queued
+    PUSH_OUTBOX_RETENTION_HOURS: int = 48
+
+    # Coalesced notifications (e.g. outbids): at most one push per key in this window
+    NOTIFICATION_COALESCE_PUSH_SECONDS: int = 300
+
+    # Notification retention (monthly partitions on PostgreSQL)
+    NOTIFICATION_RETENTION_MONTHS: int = 6
+    NOTIFICATION_PARTITIONS_AHEAD: int = 3
+    # Export expired partitions here as gzip CSV before dropping them (unset: drop only)
+    NOTIFICATION_ARCHIVE_DIR: Optional[str] = None
+
+    # Auctions past end_time are closed in batches of this size (Celery beat)
+    AUCTION_CLOSE_BATCH_SIZE: int = 200
+
+    # Server-sent event streams ("memory": per worker, "redis": shared over pub/sub)
+    EVENT_BROKER_BACKEND: str = "memory"
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_QUEUE_SIZE: int = 100
 
     # JWT
     JWT_SECRET_KEY: str = ""
@@ -27,6 +80,9 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing (bcrypt threads per worker process)
+    PASSWORD_HASH_WORKERS: int = 2
+
     # Password reset
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
     PASSWORD_RESET_URL_BASE: str = "yski://auth/reset-password"
@@ -3,24 +3,54 @@ FastAPI Dependencies - Authentication, Database, RBAC
 """
 
 from typing import Optional
+from uuid import UUID
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.principal import Principal, cache_principal, get_cached_principal
+from app.core.rbac import get_permission_matrix
 from app.core.security import decode_token
 from app.models.user import User
-from app.models.rbac import RolePermission
 from sqlalchemy import select
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+async def load_principal(db: AsyncSession, user_id: str) -> Optional[Principal]:
+    """
+    Resolve a token subject to a principal, hitting the database only on a cache miss.
+
+    Returns:
+        Principal (active or not), or None if the subject is not a known user.
+    """
+    try:
+        uuid_id = UUID(str(user_id))
+    except ValueError:
+        return None
+
+    principal = await get_cached_principal(uuid_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(
+        select(User).where(User.id == uuid_id)
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+
+    principal = Principal.from_user(user)
+    await cache_principal(principal)
+    return principal
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Extract and validate user from JWT access token.
     
@@ -29,7 +59,8 @@ async def get_current_user(
         db: Database session
         
     Returns:
-        User: Authenticated user instance
+        Principal: Detached snapshot of the authenticated user (cached briefly,
+        see app.core.principal). Load the `User` row to modify it.
         
     Raises:
         HTTPException: If token is invalid or user not found
@@ -54,11 +85,8 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    # Fetch user from database
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    # Resolve user (cached principal or database)
+    user = await load_principal(db, user_id)
     
     if user is None:
         raise credentials_exception
@@ -75,7 +103,7 @@ async def get_current_user(
 async def get_optional_current_user(
     request: Request,
     db: AsyncSession = Depends(get_db),
-) -> Optional[User]:
+) -> Optional[Principal]:
     """
     Extract user from JWT access token if present, otherwise return None.
     Used for endpoints that support both authenticated and anonymous access.
@@ -96,10 +124,7 @@ async def get_optional_current_user(
     if user_id is None:
         return None
 
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await load_principal(db, user_id)
     if user is None or not user.is_active:
         return None
 
@@ -107,16 +132,16 @@ async def get_optional_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Ensure user is active.
     
     Args:
-        current_user: User from get_current_user dependency
+        current_user: Principal from get_current_user dependency
         
     Returns:
-        User: Active user instance
+        Principal: Active user
     """
     if not current_user.is_active:
         raise HTTPException(
@@ -139,13 +164,13 @@ def require_role(*allowed_roles: str):
     Example:
         @router.get("/admin-only")
         async def admin_endpoint(
-            current_user: User = Depends(require_role("admin"))
+            current_user: Principal = Depends(require_role("admin"))
         ):
             return {"message": "Hello Admin!"}
     """
     async def role_checker(
-        current_user: User = Depends(get_current_user),
-    ) -> User:
+        current_user: Principal = Depends(get_current_user),
+    ) -> Principal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -165,7 +190,7 @@ async def check_permission(
     Check if a role has permission for a specific resource and action.
     
     Args:
-        db: Database session
+        db: Database session (used only if the permission matrix must be reloaded)
         role: User role to check
         resource: Resource name (e.g., 'bookings', 'users')
         action: Action name (e.g., 'create', 'read', 'update')
@@ -173,25 +198,22 @@ async def check_permission(
     Returns:
         bool: True if permission exists, False otherwise
     """
-    result = await db.execute(
-        select(RolePermission).where(
-            RolePermission.role == role,
-            RolePermission.resource == resource,
-            RolePermission.action == action,
-        )
-    )
-    return result.scalar_one_or_none() is not None
+    matrix = await get_permission_matrix(db)
+    return matrix.allows(role, resource, action)
 
 
 class PermissionChecker:
     """
     Class-based permission checker for more complex permission scenarios.
+
+    Looks permissions up in the cached matrix (see app.core.rbac), so guarded
+    requests need no database session for the check itself.
     
     Example:
         @router.post("/bookings/{booking_id}/approve")
         async def approve_booking(
             booking_id: str,
-            current_user: User = Depends(get_current_user),
+            current_user: Principal = Depends(get_current_user),
             db: AsyncSession = Depends(get_db),
             _=Depends(PermissionChecker("bookings", "approve"))
         ):
@@ -205,11 +227,10 @@ class PermissionChecker:
     
     async def __call__(
         self,
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: Principal = Depends(get_current_user),
     ) -> bool:
-        has_perm = await check_permission(db, current_user.role, self.resource, self.action)
-        if not has_perm:
+        matrix = await get_permission_matrix()
+        if not matrix.allows(current_user.role, self.resource, self.action):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission denied: {self.resource}:{self.action}"
@@ -0,0 +1,232 @@
+"""
+Event brokers behind the server-sent event streams.
+
+Each open stream subscribes a bounded queue for its topic: a user for the
+notification stream, an auction item for the live price stream. Services
+queue events on the database session with `queue_user_event` or
+`queue_auction_event`; they are published only once that transaction commits
+and dropped if it rolls back.
+
+The in-process broker delivers to streams on the same worker. With
+``EVENT_BROKER_BACKEND = "redis"`` events are published through Redis
+pub/sub so streams on every API worker, and events raised by Celery jobs,
+reach their subscribers; while Redis is unreachable delivery degrades to the local
+worker. Publishing runs in background tasks: code whose event loop ends right
+after its last commit (Celery jobs) must await `flush_published_events` first. Delivery is best effort: clients resynchronize from the REST
+endpoints whenever they (re)connect.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence, Set, Union
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import REDIS_ERRORS, get_redis, mark_redis_unavailable
+
+logger = logging.getLogger(__name__)
+
+USER_CHANNEL_PREFIX = "events:user:"
+AUCTION_CHANNEL_PREFIX = "events:auction:"
+_PENDING_EVENTS_KEY = "pending_stream_events"
+
+
+class StreamEvent(NamedTuple):
+    """One server-sent event addressed to a topic (user or auction item id)."""
+
+    topic: str
+    event: str
+    data: dict
+
+    def to_json(self) -> str:
+        return json.dumps({"event": self.event, "data": self.data}, default=str)
+
+    @classmethod
+    def from_channel(cls, prefix: str, channel: str, raw: str) -> "StreamEvent":
+        payload = json.loads(raw)
+        return cls(channel[len(prefix):], payload["event"], payload["data"])
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class LocalEventBroker:
+    """Fans events out to the streams connected to this process."""
+
+    def __init__(self, queue_size: int, channel_prefix: str = USER_CHANNEL_PREFIX):
+        self.queue_size = queue_size
+        self.channel_prefix = channel_prefix
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, topic: Union[str, UUID]) -> AsyncIterator[asyncio.Queue]:
+        """Register a queue receiving the topic's events while the block runs."""
+        key = str(topic)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(key, set()).add(queue)
+        self._on_subscribe()
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[key]
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def deliver(self, stream_event: StreamEvent) -> None:
+        """Hand an event to this process's subscribers, dropping the oldest for slow ones."""
+        for queue in self._subscribers.get(stream_event.topic, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(stream_event)
+
+    async def publish(self, events: Sequence[StreamEvent]) -> None:
+        for stream_event in events:
+            self.deliver(stream_event)
+
+    async def close(self) -> None:
+        pass
+
+    def _on_subscribe(self) -> None:
+        pass
+
+
+class RedisEventBroker(LocalEventBroker):
+    """
+    Shares events between workers over Redis pub/sub.
+
+    Publishing goes to Redis only; one listener per process, started with
+    its first subscriber, receives every worker's events and delivers those
+    addressed to local subscribers.
+    """
+
+    def __init__(self, queue_size: int, channel_prefix: str = USER_CHANNEL_PREFIX):
+        super().__init__(queue_size, channel_prefix)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, events: Sequence[StreamEvent]) -> None:
+        client = get_redis()
+        if client is not None:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    for stream_event in events:
+                        pipe.publish(self.channel_prefix + stream_event.topic, stream_event.to_json())
+                    await pipe.execute()
+                return
+            except REDIS_ERRORS as exc:
+                mark_redis_unavailable(exc)
+        await super().publish(events)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    def _on_subscribe(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while self._subscribers:
+            client = get_redis()
+            if client is None:
+                await asyncio.sleep(1.0)
+                continue
+
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(self.channel_prefix + "*")
+                while self._subscribers:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.deliver(StreamEvent.from_channel(self.channel_prefix, message["channel"], message["data"]))
+            except REDIS_ERRORS as exc:
+                mark_redis_unavailable(exc)
+            finally:
+                await pubsub.aclose()
+
+
+_brokers: Dict[str, LocalEventBroker] = {}
+_publish_tasks: Set[asyncio.Task] = set()
+
+
+def get_event_broker(channel_prefix: str = USER_CHANNEL_PREFIX) -> LocalEventBroker:
+    """Process-wide broker for `channel_prefix` and the configured ``EVENT_BROKER_BACKEND``."""
+    broker = _brokers.get(channel_prefix)
+    if broker is None:
+        broker_class = RedisEventBroker if settings.EVENT_BROKER_BACKEND == "redis" else LocalEventBroker
+        broker = _brokers[channel_prefix] = broker_class(settings.SSE_QUEUE_SIZE, channel_prefix)
+    return broker
+
+
+def get_auction_broker() -> LocalEventBroker:
+    """Broker fanning live price updates out to the watchers of each auction item."""
+    return get_event_broker(AUCTION_CHANNEL_PREFIX)
+
+
+async def flush_published_events() -> None:
+    """Wait for the running loop's pending after-commit publishes to finish."""
+    loop = asyncio.get_running_loop()
+    while True:
+        pending = [task for task in _publish_tasks if task.get_loop() is loop]
+        if not pending:
+            return
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def close_event_brokers() -> None:
+    for broker in list(_brokers.values()):
+        await broker.close()
+
+
+def _queue_event(db: AsyncSession, channel_prefix: str, topic: Union[str, UUID], event_name: str, data: dict) -> None:
+    db.info.setdefault(_PENDING_EVENTS_KEY, []).append(
+        (channel_prefix, StreamEvent(str(topic), event_name, data))
+    )
+
+
+def queue_user_event(db: AsyncSession, user_id: Union[str, UUID], event_name: str, data: dict) -> None:
+    """Publish an event to a user's streams once `db`'s transaction commits."""
+    _queue_event(db, USER_CHANNEL_PREFIX, user_id, event_name, data)
+
+
+def queue_auction_event(db: AsyncSession, item_id: Union[str, UUID], event_name: str, data: dict) -> None:
+    """Publish an event to an auction item's watchers once `db`'s transaction commits."""
+    _queue_event(db, AUCTION_CHANNEL_PREFIX, item_id, event_name, data)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_EVENTS_KEY, None)
+    if not pending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("Dropping %d stream events committed outside an event loop", len(pending))
+        return
+    by_prefix: Dict[str, List[StreamEvent]] = {}
+    for channel_prefix, stream_event in pending:
+        by_prefix.setdefault(channel_prefix, []).append(stream_event)
+    for channel_prefix, events in by_prefix.items():
+        task = loop.create_task(get_event_broker(channel_prefix).publish(events))
+        _publish_tasks.add(task)
+        task.add_done_callback(_publish_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_EVENTS_KEY, None)
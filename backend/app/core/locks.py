@@ -0,0 +1,37 @@
+"""
+Transaction-scoped advisory locks on PostgreSQL.
+
+Serialize work on a logical key (e.g. a booking date) without locking
+table rows: two transactions only wait for each other when they share a
+key. Locks are released automatically when the transaction ends.
+"""
+
+import zlib
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Namespaces: the first key of the two-key ``pg_advisory_xact_lock(int, int)`` form
+BOOKING_DATE_LOCK = 1
+NOTIFICATION_COALESCE_LOCK = 2
+
+
+def lock_key(value: str) -> int:
+    """Stable signed 32-bit key for a string; collisions only serialize a little more."""
+    key = zlib.crc32(value.encode())
+    return key - 2**32 if key >= 2**31 else key
+
+
+async def advisory_xact_locks(db: AsyncSession, namespace: int, keys: Iterable[int]) -> None:
+    """
+    Take ``pg_advisory_xact_lock(namespace, key)`` for each of `keys`.
+
+    Keys are locked in ascending order, so transactions locking overlapping
+    sets cannot deadlock. No-op on other databases (SQLite in tests, which
+    serializes writers anyway).
+    """
+    if db.bind.dialect.name != "postgresql":
+        return
+    for key in sorted(set(keys)):
+        await db.execute(select(func.pg_advisory_xact_lock(namespace, key)))
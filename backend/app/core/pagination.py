@@ -0,0 +1,79 @@
+"""
+Keyset (cursor) pagination helpers.
+
+List endpoints ordered newest-first accept an opaque ``cursor`` that encodes
+the ``(created_at, id)`` of the last row already seen. The next page is then
+a range seek on a ``(created_at, id)`` index, so page 500 costs the same as
+page 1, unlike ``OFFSET`` which scans and discards every skipped row.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CURSOR_QUERY = Query(
+    None,
+    description="Opaque cursor from a previous page (X-Next-Cursor / next_cursor); replaces skip",
+)
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Encode the sort key of the last row on a page."""
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by `encode_cursor`; 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), UUID(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def paginate_newest_first(
+    query: Select,
+    model,
+    *,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Order `query` by ``created_at desc, id desc`` and select one page.
+
+    With a `cursor`, rows strictly after it are selected (keyset seek) and
+    `skip` is ignored; otherwise `skip` is applied as an OFFSET for backward
+    compatibility.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after `items`, or None when this page was the last."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    """Expose the next-page cursor on list endpoints that return a bare JSON array."""
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
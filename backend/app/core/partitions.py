@@ -0,0 +1,127 @@
+"""
+Monthly range partitions on PostgreSQL.
+
+Tables partitioned ``BY RANGE (created_at)`` get one child table per
+calendar month named ``<table>_YYYY_MM`` plus a ``<table>_default`` catch-all
+that should stay empty. Partitions are created ahead of time and old ones
+are detached and dropped, optionally after archiving them to gzip CSV files.
+"""
+
+import gzip
+import logging
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month.year:04d}_{month.month:02d}"
+
+
+def retention_cutoff(retention_months: int, now: Optional[datetime] = None) -> datetime:
+    """
+    Start of the oldest month still retained.
+
+    The current month counts as the first of `retention_months`; rows older
+    than the cutoff belong to partitions that are due to be dropped.
+    """
+    now = now or datetime.now(timezone.utc)
+    oldest = add_months(month_start(now), -(retention_months - 1))
+    return datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc)
+
+
+async def list_monthly_partitions(db: AsyncSession, table: str) -> List[Tuple[str, date]]:
+    """Monthly partitions of `table` as ``(name, first day of month)``, oldest first."""
+    result = await db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": table},
+    )
+    partitions = []
+    for (name,) in result.all():
+        match = _PARTITION_SUFFIX.search(name)
+        if match and name == partition_name(table, date(int(match[1]), int(match[2]), 1)):
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def ensure_monthly_partitions(
+    db: AsyncSession,
+    table: str,
+    months_ahead: int,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """Create the partitions for this month and the next `months_ahead`; returns new ones."""
+    existing = {name for name, _ in await list_monthly_partitions(db, table)}
+    current = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        await db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def archive_partition(db: AsyncSession, name: str, directory: str) -> Path:
+    """Export a partition to ``<directory>/<name>.csv.gz`` (with header) via COPY."""
+    path = Path(directory) / f"{name}.csv.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+
+    with gzip.open(path, "wb") as archive:
+        async def write(chunk: bytes) -> None:
+            archive.write(chunk)
+
+        await raw.driver_connection.copy_from_table(name, output=write, format="csv", header=True)
+    return path
+
+
+async def detach_partition(db: AsyncSession, table: str, name: str, lock_timeout: str = "5s") -> None:
+    """
+    Detach a partition; queries on `table` stop seeing its rows.
+
+    DETACH takes an ACCESS EXCLUSIVE lock on `table` until the transaction
+    ends: keep that transaction short. `lock_timeout` bounds how long it waits
+    behind running queries (which every later query on `table` would queue
+    behind) before failing, leaving the partition to the next run.
+    """
+    await db.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+    await db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+
+
+async def drop_detached_partition(db: AsyncSession, name: str) -> None:
+    await db.execute(text(f'DROP TABLE "{name}"'))
+    logger.info("Dropped partition %s", name)
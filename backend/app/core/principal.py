@@ -0,0 +1,181 @@
+"""
+Authenticated principal and its short-lived cache.
+
+`get_current_user` resolves the JWT subject to a `Principal` — a detached,
+immutable snapshot of the fields authorization needs — instead of loading the
+`User` row on every request. Entries expire after
+``PRINCIPAL_CACHE_TTL_SECONDS``; anything that changes a user's role, active
+flag, profile or password must call `invalidate_principal_on_commit`.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Optional, Set, Union
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import REDIS_ERRORS, get_redis, mark_redis_unavailable
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_KEY_PREFIX = "principal:"
+_PENDING_INVALIDATIONS_KEY = "pending_principal_invalidations"
+
+# Process-local entries: user id -> (expires_at, principal), least recently used first.
+_PRINCIPALS: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+_PRINCIPALS_LOCK = Lock()
+_invalidation_tasks: Set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user as seen by route handlers and permission checks."""
+
+    id: UUID
+    email: str
+    full_name: str
+    phone: Optional[str]
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id if isinstance(user.id, UUID) else UUID(str(user.id)),
+            email=user.email,
+            full_name=user.full_name,
+            phone=user.phone,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps({**asdict(self), "id": str(self.id)})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Principal":
+        data = json.loads(raw)
+        return cls(**{**data, "id": UUID(data["id"])})
+
+
+def _use_redis():
+    return get_redis() if settings.PRINCIPAL_CACHE_REDIS else None
+
+
+async def get_cached_principal(user_id: Union[str, UUID]) -> Optional[Principal]:
+    """Return the cached principal for a user id, or None on a miss."""
+    key = str(user_id)
+    client = _use_redis()
+    if client is not None:
+        try:
+            raw = await client.get(PRINCIPAL_KEY_PREFIX + key)
+            return Principal.from_json(raw) if raw else None
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
+
+    with _PRINCIPALS_LOCK:
+        entry = _PRINCIPALS.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _PRINCIPALS[key]
+            return None
+        _PRINCIPALS.move_to_end(key)
+        return entry[1]
+
+
+async def cache_principal(principal: Principal) -> None:
+    """Store a principal for ``PRINCIPAL_CACHE_TTL_SECONDS``."""
+    key = str(principal.id)
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    client = _use_redis()
+    if client is not None:
+        try:
+            await client.set(PRINCIPAL_KEY_PREFIX + key, principal.to_json(), ex=ttl)
+            return
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
+
+    with _PRINCIPALS_LOCK:
+        _PRINCIPALS[key] = (time.monotonic() + ttl, principal)
+        _PRINCIPALS.move_to_end(key)
+        while len(_PRINCIPALS) > settings.PRINCIPAL_CACHE_MAX_ENTRIES:
+            _PRINCIPALS.popitem(last=False)
+
+
+async def invalidate_principal(user_id: Union[str, UUID]) -> None:
+    """
+    Drop a cached principal so the next request reloads the user.
+
+    Note:
+        The process-local cache is only cleared in the calling worker; other
+        workers pick up the change when their entry expires. Enable
+        ``PRINCIPAL_CACHE_REDIS`` for immediate invalidation across workers.
+    """
+    key = str(user_id)
+    with _PRINCIPALS_LOCK:
+        _PRINCIPALS.pop(key, None)
+
+    client = _use_redis()
+    if client is not None:
+        try:
+            await client.delete(PRINCIPAL_KEY_PREFIX + key)
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
+
+
+async def invalidate_principal_on_commit(db: AsyncSession, user_id: Union[str, UUID]) -> None:
+    """
+    Drop a cached principal now and again once `db`'s transaction commits.
+
+    Until the commit, a concurrent request can still load the old row and
+    cache it; the second invalidation removes that entry so the change takes
+    effect on the next request.
+    """
+    await invalidate_principal(user_id)
+    db.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(str(user_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    keys = session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+    if not keys:
+        return
+    with _PRINCIPALS_LOCK:
+        for key in keys:
+            _PRINCIPALS.pop(key, None)
+
+    if not settings.PRINCIPAL_CACHE_REDIS:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("Skipping Redis invalidation of %d principals outside an event loop", len(keys))
+        return
+    task = loop.create_task(_delete_cached(keys))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+
+
+async def _delete_cached(keys: Set[str]) -> None:
+    client = _use_redis()
+    if client is None:
+        return
+    try:
+        await client.delete(*(PRINCIPAL_KEY_PREFIX + key for key in keys))
+    except REDIS_ERRORS as exc:
+        mark_redis_unavailable(exc)
@@ -1,34 +1,115 @@
 """
-Simple in-process rate limiter for sensitive endpoints.
+Rate limiter for sensitive endpoints.
+
+Limits are enforced in Redis so every worker shares the same counters; when
+Redis is unavailable each process falls back to its own in-memory buckets.
 """
 
-from collections import defaultdict, deque
+from collections import OrderedDict
 from threading import Lock
 import time
+import uuid
 
 from fastapi import HTTPException, status
 
-_RATE_BUCKETS: dict[str, deque[float]] = defaultdict(deque)
+from app.core.config import settings
+from app.core.redis import REDIS_ERRORS, get_redis, mark_redis_unavailable
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+
+# Sliding window log: one sorted-set member per request, scored by its timestamp (ms).
+# Trimming, counting and recording run atomically inside Redis.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) >= limit then
+    return 0
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+return 1
+"""
+
+# Local fallback state: key -> GCRA theoretical arrival time (one float per key),
+# ordered by last use so the least recently seen keys are evicted first.
+_RATE_STATE: "OrderedDict[str, float]" = OrderedDict()
 _RATE_LOCK = Lock()
 
+# Expired entries dropped from the LRU end on each call, besides the hard cap.
+_EVICT_BATCH = 8
 
-def enforce_rate_limit(key: str, max_requests: int, window_seconds: int) -> None:
+
+def _allow_local(key: str, max_requests: int, window_seconds: int) -> bool:
     """
-    Enforce fixed-window sliding limit.
+    Per-process GCRA limiter, used when Redis is unavailable.
 
-    Note:
-        This is per-process limiter. For distributed enforcement use Redis-based limiter.
+    Allows a burst of `max_requests`, then one request every
+    ``window_seconds / max_requests``. State is constant-size per key; keys
+    whose allowance has fully recovered are dropped, and at most
+    ``RATE_LIMIT_LOCAL_MAX_KEYS`` are kept (least recently used evicted), so
+    attacker-chosen keys such as login emails cannot grow memory unbounded.
     """
-    now = time.time()
-    window_start = now - window_seconds
+    now = time.monotonic()
+    interval = window_seconds / max_requests
 
     with _RATE_LOCK:
-        bucket = _RATE_BUCKETS[key]
-        while bucket and bucket[0] < window_start:
-            bucket.popleft()
-        if len(bucket) >= max_requests:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many requests, please try again later",
-            )
-        bucket.append(now)
+        tat = max(_RATE_STATE.pop(key, now), now)
+        allowed = tat + interval - now <= window_seconds
+        if allowed:
+            tat += interval
+        _RATE_STATE[key] = tat
+
+        for _ in range(_EVICT_BATCH):
+            oldest_key = next(iter(_RATE_STATE))
+            if _RATE_STATE[oldest_key] > now:
+                break
+            del _RATE_STATE[oldest_key]
+        while len(_RATE_STATE) > settings.RATE_LIMIT_LOCAL_MAX_KEYS:
+            _RATE_STATE.popitem(last=False)
+
+    return allowed
+
+
+async def _allow_redis(client, key: str, max_requests: int, window_seconds: int) -> bool:
+    script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    allowed = await script(
+        keys=[RATE_LIMIT_KEY_PREFIX + key],
+        args=[int(time.time() * 1000), window_seconds * 1000, max_requests, uuid.uuid4().hex],
+    )
+    return bool(int(allowed))
+
+
+async def check_rate_limit(key: str, max_requests: int, window_seconds: int) -> bool:
+    """
+    Record one request against `key` and report whether it is within the limit.
+
+    Note:
+        Shared across workers through Redis (``REDIS_URL``); degrades to a
+        per-process limit while Redis is unreachable.
+    """
+    client = get_redis()
+    if client is not None:
+        try:
+            return await _allow_redis(client, key, max_requests, window_seconds)
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
+
+    return _allow_local(key, max_requests, window_seconds)
+
+
+async def enforce_rate_limit(key: str, max_requests: int, window_seconds: int) -> None:
+    """
+    Enforce a sliding-window limit of `max_requests` per `window_seconds`.
+
+    Raises:
+        HTTPException: 429 when the limit for `key` is exhausted.
+    """
+    if not await check_rate_limit(key, max_requests, window_seconds):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+        )
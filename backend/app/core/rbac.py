@@ -0,0 +1,106 @@
+"""
+In-memory RBAC permission matrix.
+
+The whole ``role_permissions`` table is held as an immutable frozenset of
+``(role, resource, action)`` tuples so permission checks are O(1) set
+lookups without a database session. The matrix is revalidated at most every
+``RBAC_VERSION_CHECK_SECONDS`` against a version stamp in Redis (bumped by
+`notify_permissions_changed`) and reloaded from the database on a new stamp,
+when older than ``RBAC_MATRIX_MAX_AGE_SECONDS``, or on every check while
+Redis is unavailable.
+"""
+
+import logging
+import time
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import REDIS_ERRORS, get_redis, mark_redis_unavailable
+from app.models.rbac import RolePermission
+
+logger = logging.getLogger(__name__)
+
+RBAC_VERSION_KEY = "rbac:version"
+
+
+class PermissionMatrix(NamedTuple):
+    """Immutable snapshot of all role permissions."""
+
+    permissions: FrozenSet[Tuple[str, str, str]]
+    version: Optional[str]
+    loaded_at: float
+
+    def allows(self, role: str, resource: str, action: str) -> bool:
+        return (role, resource, action) in self.permissions
+
+
+_matrix: Optional[PermissionMatrix] = None
+_next_check = 0.0
+
+
+async def _current_version() -> Optional[str]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(RBAC_VERSION_KEY) or "0"
+    except REDIS_ERRORS as exc:
+        mark_redis_unavailable(exc)
+        return None
+
+
+async def load_permission_matrix(db: Optional[AsyncSession] = None) -> PermissionMatrix:
+    """Load the permission matrix from the database and make it current."""
+    global _matrix
+    version = await _current_version()
+    query = select(RolePermission.role, RolePermission.resource, RolePermission.action)
+    if db is not None:
+        rows = (await db.execute(query)).all()
+    else:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(query)).all()
+
+    _matrix = PermissionMatrix(frozenset(tuple(row) for row in rows), version, time.monotonic())
+    logger.debug("Loaded %d role permissions (version %s)", len(_matrix.permissions), version)
+    return _matrix
+
+
+async def get_permission_matrix(db: Optional[AsyncSession] = None) -> PermissionMatrix:
+    """
+    Return the current matrix, revalidating it when the check interval elapsed.
+
+    Between checks this does no I/O. Requests arriving while a check is in
+    flight keep using the previous matrix.
+    """
+    global _next_check
+    now = time.monotonic()
+    if _matrix is not None and now < _next_check:
+        return _matrix
+
+    _next_check = now + settings.RBAC_VERSION_CHECK_SECONDS
+    if _matrix is not None and now - _matrix.loaded_at < settings.RBAC_MATRIX_MAX_AGE_SECONDS:
+        version = await _current_version()
+        if version is not None and version == _matrix.version:
+            return _matrix
+    return await load_permission_matrix(db)
+
+
+async def notify_permissions_changed() -> None:
+    """
+    Signal that ``role_permissions`` changed; call after the change is committed.
+
+    Bumps the shared version stamp so every worker reloads on its next check,
+    and drops this process's matrix so the next lookup reloads immediately.
+    """
+    global _matrix
+    _matrix = None
+    client = get_redis()
+    if client is not None:
+        try:
+            await client.incr(RBAC_VERSION_KEY)
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
@@ -0,0 +1,62 @@
+"""
+Shared async Redis client with graceful degradation.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean "Redis is not usable right now"; callers fall back to local state.
+REDIS_ERRORS = (RedisError, OSError, asyncio.TimeoutError)
+
+_RETRY_AFTER_SECONDS = 30.0
+
+# One client per event loop: Celery tasks run each job in a fresh loop via asyncio.run.
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+_unavailable_until = 0.0
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Return the Redis client for the running event loop.
+
+    Returns:
+        Redis client, or None when Redis is disabled or recently failed.
+    """
+    if not settings.REDIS_CACHE_ENABLED or time.monotonic() < _unavailable_until:
+        return None
+
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None:
+        client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+        _CLIENTS[loop] = client
+    return client
+
+
+def mark_redis_unavailable(exc: BaseException) -> None:
+    """Skip Redis for a short cool-down after a connection failure."""
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + _RETRY_AFTER_SECONDS
+    logger.warning("Redis unavailable, using local fallback for %.0fs: %s", _RETRY_AFTER_SECONDS, exc)
+
+
+async def close_redis() -> None:
+    """Close the running event loop's client (end of an ``asyncio.run`` job or app shutdown)."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,57 @@
+"""
+Substring search for list endpoints.
+
+On PostgreSQL the searched columns carry pg_trgm GIN indexes (migration 026),
+which serve ``ILIKE '%term%'`` without reading the whole table, and results
+are ranked by trigram similarity so the closest matches come first; rows
+within the similarity threshold (``%`` operator) also match, which tolerates
+small typos. Other databases (SQLite in tests) fall back to a plain,
+unranked LIKE filter.
+"""
+
+from sqlalchemy import ColumnElement, Select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Minimum term length worth a trigram lookup; shorter terms match as substrings only
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input matches literally (escape char ``\\``)."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_dialect(db: AsyncSession) -> str:
+    return db.bind.dialect.name
+
+
+def search_condition(dialect: str, term: str, *columns) -> ColumnElement:
+    """Rows where any of `columns` contains `term` (or, on PostgreSQL, is trigram-similar to it)."""
+    pattern = f"%{escape_like(term)}%"
+    conditions = [column.ilike(pattern, escape="\\") for column in columns]
+    if dialect == "postgresql" and len(term) >= MIN_TRIGRAM_TERM_LENGTH:
+        conditions.extend(column.op("%")(term) for column in columns)
+    return or_(*conditions)
+
+
+def search_rank(term: str, *columns) -> ColumnElement:
+    """Trigram similarity of the closest of `columns` to `term` (PostgreSQL only); higher is better."""
+    similarities = [func.similarity(column, term) for column in columns]
+    return similarities[0] if len(similarities) == 1 else func.greatest(*similarities)
+
+
+def apply_search(query: Select, dialect: str, term: str, *columns) -> Select:
+    """
+    Filter `query` to rows matching `term` in any of `columns`, best matches first.
+
+    On PostgreSQL the similarity rank becomes the leading sort key and
+    ``ORDER BY`` clauses added afterwards only break ties; elsewhere the
+    query's own order is kept.
+    """
+    term = term.strip()
+    if not term:
+        return query
+    query = query.where(search_condition(dialect, term, *columns))
+    if dialect == "postgresql":
+        query = query.order_by(search_rank(term, *columns).desc())
+    return query
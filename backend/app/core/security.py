@@ -2,11 +2,15 @@
 Security utilities - JWT tokens, password hashing
 """
 
+import asyncio
 import hmac
 import hashlib
 import secrets
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any
+from typing import Callable, Dict, Optional, Any, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -15,6 +19,8 @@ from app.core.config import settings
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
@@ -26,6 +32,85 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """
+    Dedicated thread pool for bcrypt work.
+
+    A bcrypt round takes ~200 ms of CPU; run inline it stalls every request
+    on the worker's event loop. Calls here run on at most `workers` threads
+    (bcrypt releases the GIL). A per-loop semaphore with the same size keeps
+    callers waiting on the loop rather than in the executor queue, so
+    `stats()["waiting"]` is the live queue depth.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.workers)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a hashing function on the pool and await its result."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+        semaphore = self._semaphore()
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.total_wait_seconds += time.perf_counter() - queued_at
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue-depth and throughput counters since start-up."""
+        return {
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "running": self.running,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "avg_wait_ms": round(1000 * self.total_wait_seconds / self.completed, 2) if self.completed else 0.0,
+        }
+
+
+password_hash_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
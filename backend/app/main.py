@@ -10,7 +10,10 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.database import engine, Base
+from app.core.events import close_event_brokers, flush_published_events
+from app.core.redis import close_redis
 from app.api.v1.router import api_router
 
 
@@ -24,6 +27,9 @@ async def lifespan(app: FastAPI):
         pass
     yield
     # Shutdown
+    await flush_published_events()
+    await close_event_brokers()
+    await close_redis()
     await engine.dispose()
 
 
@@ -41,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API router
@@ -1,6 +1,6 @@
 from app.models.user import User
 from app.models.rbac import RolePermission
-from app.models.booking import MovingBooking
+from app.models.booking import BookingSlotOccupancy, MovingBooking
 from app.models.equipment import MedicalEquipment, EquipmentLoan
 from app.models.donation import Donation
 from app.models.pickup import PickupRequest
@@ -9,5 +9,5 @@ from app.models.content import Program, NewsArticle
 # Phase 5: Advanced Features
 from app.models.auction import AuctionItem, AuctionImage, AuctionBid
 from app.models.financial import FinancialReport, FinancialEntry, FinancialCategory, FinancialTransaction
-from app.models.notification import Notification, PushToken
+from app.models.notification import Notification, PushOutbox, PushToken
 from app.models.password_reset import PasswordResetToken
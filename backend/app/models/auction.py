@@ -2,7 +2,7 @@
 Auction models for Lelang Barang feature.
 """
 from decimal import Decimal
-from sqlalchemy import Column, ForeignKey, Numeric, String, Text, DateTime, SmallInteger, Index
+from sqlalchemy import Column, ForeignKey, Integer, Numeric, String, Text, DateTime, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import TimestampMixin, UUIDMixin
@@ -29,9 +29,29 @@ class AuctionItem(Base, UUIDMixin, TimestampMixin):
         nullable=True,
         index=True,
     )
+    # Bid at the current price and its bidder, maintained by place_bid and approve_bid
+    highest_bid_id = Column(
+        ForeignKey(
+            "auction_bids.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_auction_items_highest_bid_id_auction_bids",
+            # place_bid claims the price before inserting the bid it points to
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+        nullable=True,
+    )
+    highest_bidder_id = Column(
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    bid_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Status: ready, bidding, payment_pending, sold, cancelled
     status = Column(String(20), nullable=False, default="ready", index=True)
+    # Bumped on every price change; place_bid's conditional UPDATE is guarded by it
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     payment_status = Column(String(32), nullable=True)  # awaiting_payment, awaiting_verification, paid, rejected
     payment_proof_url = Column(Text, nullable=True)
     payment_verified_by = Column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
@@ -44,9 +64,26 @@ class AuctionItem(Base, UUIDMixin, TimestampMixin):
     # Relationships
     donor = relationship("User", foreign_keys=[donor_id], back_populates="donated_auction_items")
     winner = relationship("User", foreign_keys=[winner_id], back_populates="won_auctions")
+    highest_bidder = relationship("User", foreign_keys=[highest_bidder_id])
     payment_verifier = relationship("User", foreign_keys=[payment_verified_by])
     images = relationship("AuctionImage", back_populates="auction_item", cascade="all, delete-orphan")
-    bids = relationship("AuctionBid", back_populates="auction_item", cascade="all, delete-orphan")
+    bids = relationship(
+        "AuctionBid",
+        back_populates="auction_item",
+        foreign_keys="AuctionBid.auction_item_id",
+        cascade="all, delete-orphan",
+    )
+
+    __table_args__ = (
+        # Open auctions by end time, for the close_expired_auctions sweeper
+        Index(
+            'ix_auction_items_open_end_time',
+            'end_time',
+            postgresql_where=status.in_(['ready', 'bidding']),
+        ),
+        # Trigram index for substring search (app.core.search)
+        Index('ix_auction_items_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+    )
 
     def __repr__(self):
         return f"<AuctionItem(id={self.id}, title={self.title}, status={self.status})>"
@@ -91,9 +128,15 @@ class AuctionBid(Base, UUIDMixin, TimestampMixin):
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    auction_item = relationship("AuctionItem", back_populates="bids")
+    auction_item = relationship("AuctionItem", back_populates="bids", foreign_keys=[auction_item_id])
     bidder = relationship("User", back_populates="auction_bids", foreign_keys=[bidder_id])
     reviewer = relationship("User", foreign_keys=[reviewed_by])
 
+    __table_args__ = (
+        # Top bids of an item (detail view) and its bid history newest first
+        Index('ix_auction_bids_auction_item_id_amount', 'auction_item_id', 'amount', postgresql_ops={'amount': 'DESC'}),
+        Index('ix_auction_bids_auction_item_id_created_at', 'auction_item_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<AuctionBid(id={self.id}, amount={self.amount})>"
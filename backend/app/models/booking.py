@@ -7,7 +7,7 @@ from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
 
-from sqlalchemy import String, Text, Date, ForeignKey, Numeric, SmallInteger, DateTime, Boolean, func, UniqueConstraint
+from sqlalchemy import String, Text, Date, ForeignKey, Numeric, SmallInteger, DateTime, Boolean, Index, func, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -80,15 +80,17 @@ class MovingBooking(Base):
         nullable=True
     )
     
-    # Anti double-booking: UNIQUE constraint on date + slot
     __table_args__ = (
-        UniqueConstraint("booking_date", "time_slot", name="uq_booking_date_slot"),
+        # Keyset pagination: newest first, optionally per requester
+        Index("ix_moving_bookings_created_at_id", "created_at", "id"),
+        Index("ix_moving_bookings_requester_id_created_at", "requester_id", "created_at", "id"),
     )
     
     # Relationships
     requester = relationship("User", foreign_keys=[requester_id], back_populates="bookings")
     assigned_volunteer = relationship("User", foreign_keys=[assigned_to])
     approver = relationship("User", foreign_keys=[approved_by])
+    occupied_slots = relationship("BookingSlotOccupancy", back_populates="booking", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<MovingBooking(id={self.id}, code={self.booking_code}, date={self.booking_date}, slot={self.time_slot})>"
@@ -96,3 +98,44 @@ class MovingBooking(Base):
     @property
     def assigned_to_name(self) -> Optional[str]:
         return self.assigned_volunteer.full_name if self.assigned_volunteer else None
+
+
+class BookingSlotOccupancy(Base):
+    """
+    One (date, slot) held by an active booking.
+
+    Written with the booking and deleted when it is cancelled or rejected;
+    the unique constraint is the anti double-booking guarantee.
+    """
+    
+    __tablename__ = "booking_slot_occupancy"
+    
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    booking_date: Mapped[date] = mapped_column(Date, nullable=False)
+    time_slot: Mapped[str] = mapped_column(String(5), nullable=False)
+    booking_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("moving_bookings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    requester_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id"),
+        nullable=False
+    )
+    
+    # Anti double-booking: UNIQUE constraint on date + slot (also the lookup index by date)
+    __table_args__ = (
+        UniqueConstraint("booking_date", "time_slot", name="uq_booking_slot_occupancy_date_slot"),
+    )
+    
+    # Relationships
+    booking = relationship("MovingBooking", back_populates="occupied_slots")
+    
+    def __repr__(self) -> str:
+        return f"<BookingSlotOccupancy(date={self.booking_date}, slot={self.time_slot}, booking_id={self.booking_id})>"
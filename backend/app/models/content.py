@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 
-from sqlalchemy import String, Text, ForeignKey, DateTime, func, Numeric, Boolean, Integer
+from sqlalchemy import String, Text, ForeignKey, DateTime, Index, func, Numeric, Boolean, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -116,6 +116,11 @@ class NewsArticle(Base):
         nullable=True
     )
     
+    # Trigram index for substring search (app.core.search)
+    __table_args__ = (
+        Index("ix_news_articles_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
+    
     # Relationships
     creator = relationship("User", foreign_keys=[created_by])
     reviewer = relationship("User", foreign_keys=[reviewed_by])
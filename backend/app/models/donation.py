@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 
-from sqlalchemy import String, Text, Numeric, ForeignKey, DateTime, func
+from sqlalchemy import String, Text, Numeric, ForeignKey, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -56,10 +56,11 @@ class Donation(Base):
     
     message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Pesan dari donatur
     
+    # Indexed by ix_donations_created_at_id (created_at is its leading column)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
-        nullable=False
+        nullable=False,
     )
     updated_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
@@ -67,6 +68,12 @@ class Donation(Base):
         nullable=True
     )
     
+    # Keyset pagination: newest first, optionally per donor
+    __table_args__ = (
+        Index("ix_donations_created_at_id", "created_at", "id"),
+        Index("ix_donations_donor_id_created_at", "donor_id", "created_at", "id"),
+    )
+    
     # Relationships
     donor = relationship("User", foreign_keys=[donor_id], back_populates="donations")
     verifier = relationship("User", foreign_keys=[verified_by])
@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Text, Integer, ForeignKey, DateTime, func, Enum as SQLEnum
+from sqlalchemy import String, Text, Integer, ForeignKey, DateTime, Index, func, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -43,6 +43,11 @@ class MedicalEquipment(Base):
         nullable=True
     )
     
+    # Trigram index for substring search (app.core.search)
+    __table_args__ = (
+        Index("ix_medical_equipment_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+    
     # Relationships
     loans = relationship("EquipmentLoan", back_populates="equipment")
     
@@ -99,6 +104,12 @@ class EquipmentLoan(Base):
         nullable=True
     )
     
+    # Keyset pagination: newest first, optionally per borrower
+    __table_args__ = (
+        Index("ix_equipment_loans_created_at_id", "created_at", "id"),
+        Index("ix_equipment_loans_borrower_id_created_at", "borrower_id", "created_at", "id"),
+    )
+    
     # Relationships
     equipment = relationship("MedicalEquipment", back_populates="loans")
     borrower = relationship("User", foreign_keys=[borrower_id], back_populates="equipment_loans")
@@ -115,6 +115,7 @@ class FinancialTransaction(Base, UUIDMixin, TimestampMixin):
     __table_args__ = (
         Index("idx_financial_transactions_category_status", "category_id", "status"),
         Index("idx_financial_transactions_approved_at", "approved_at"),
+        Index("ix_financial_transactions_created_at_id", "created_at", "id"),
     )
 
     def __repr__(self):
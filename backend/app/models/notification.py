@@ -1,7 +1,7 @@
 """
 Notification models for in-app and push notifications.
 """
-from sqlalchemy import Column, ForeignKey, String, Text, Boolean, Index, DateTime
+from sqlalchemy import Column, ForeignKey, String, Text, Boolean, Index, DateTime, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -9,7 +9,13 @@ from app.models.base import UUIDMixin
 
 
 class Notification(Base, UUIDMixin):
-    """In-app notification for users."""
+    """
+    In-app notification for users.
+
+    On PostgreSQL the table is range-partitioned by ``created_at`` month
+    (migration 021) with primary key ``(id, created_at)``; the ORM keeps
+    identifying rows by ``id`` alone.
+    """
     __tablename__ = "notifications"
 
     user_id = Column(
@@ -36,6 +42,7 @@ class Notification(Base, UUIDMixin):
     __table_args__ = (
         Index('idx_notifications_user_unread', 'user_id', 'is_read', postgresql_where=(is_read == False)),
         Index('idx_notifications_created', 'created_at', postgresql_ops={'created_at': 'DESC'}),
+        Index('ix_notifications_user_id_created_at', 'user_id', 'created_at', 'id'),
     )
 
     def __repr__(self):
@@ -63,3 +70,47 @@ class PushToken(Base, UUIDMixin):
 
     def __repr__(self):
         return f"<PushToken(id={self.id}, user_id={self.user_id}, device_type={self.device_type})>"
+
+
+class PushOutbox(Base, UUIDMixin):
+    """
+    Pending Expo push message, one row per device token.
+
+    Written in the same transaction as the notification that triggers it and
+    delivered afterwards by the ``drain_push_outbox`` job, so request
+    transactions never wait on Expo.
+    """
+    __tablename__ = "push_outbox"
+
+    user_id = Column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    token = Column(Text, nullable=False)
+    title = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    data = Column(Text, nullable=True)  # JSON object as text
+
+    # 'pending' -> 'sent' -> 'delivered' / 'failed' / 'unconfirmed' (no receipt within a day);
+    # 'coalesced' when a push for the same coalesce_key already went out within the window
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    # Next send attempt while pending; when the receipt is due once sent
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    ticket_id = Column(String(64), nullable=True)  # Expo push ticket id once accepted
+    # Set for coalesced notifications: at most one push per key and device per window
+    coalesce_key = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_push_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+        Index('ix_push_outbox_coalesce_key', 'coalesce_key', postgresql_where=(status == 'pending')),
+    )
+
+    def __repr__(self):
+        return f"<PushOutbox(id={self.id}, user_id={self.user_id}, status={self.status})>"
@@ -7,7 +7,7 @@ from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
 
-from sqlalchemy import String, Text, Date, ForeignKey, DateTime, func, Numeric, Integer
+from sqlalchemy import String, Text, Date, ForeignKey, DateTime, Index, func, Numeric, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -90,6 +90,12 @@ class PickupRequest(Base):
         nullable=True
     )
     
+    # Keyset pagination: newest first, optionally per requester
+    __table_args__ = (
+        Index("ix_pickup_requests_created_at_id", "created_at", "id"),
+        Index("ix_pickup_requests_requester_id_created_at", "requester_id", "created_at", "id"),
+    )
+    
     # Relationships
     requester = relationship("User", foreign_keys=[requester_id], back_populates="pickup_requests")
     assigned_volunteer = relationship("User", foreign_keys=[assigned_to])
@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import String, Boolean, DateTime, func
+from sqlalchemy import String, Boolean, DateTime, Index, Integer, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -45,11 +45,19 @@ class User(Base):
         DateTime(timezone=True),
         nullable=True
     )
+    # Denormalized unread notification count, maintained by NotificationService
+    unread_notification_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
-        nullable=False
+        nullable=False,
+        index=True,
     )
     updated_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
@@ -57,6 +65,12 @@ class User(Base):
         nullable=True
     )
     
+    # Trigram indexes for substring search (app.core.search)
+    __table_args__ = (
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
+    
     # Relationships
     bookings: Mapped[List["MovingBooking"]] = relationship("MovingBooking", foreign_keys="MovingBooking.requester_id", back_populates="requester")
     equipment_loans: Mapped[List["EquipmentLoan"]] = relationship("EquipmentLoan", foreign_keys="EquipmentLoan.borrower_id", back_populates="borrower")
@@ -155,6 +155,7 @@ class FinancialTransactionResponse(BaseModel):
 class FinancialTransactionListResponse(BaseModel):
     transactions: List[FinancialTransactionResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class FinancialBalanceCategory(BaseModel):
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ============== Push Token Schemas ==============
@@ -50,7 +50,11 @@ class NotificationResponse(NotificationBase):
 class NotificationListResponse(BaseModel):
     notifications: List[NotificationResponse]
     unread_count: int
-    total: int
+    total: Optional[int] = Field(
+        None,
+        description="Notifications matching the filter; only on offset pages, null on cursor pages",
+    )
+    next_cursor: Optional[str] = None
 
 
 class NotificationMarkRead(BaseModel):
@@ -4,23 +4,36 @@ Auction Service - Lelang Barang
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import case, event, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.config import settings
+from app.core.events import queue_auction_event
+from app.core.pagination import paginate_newest_first
+from app.core.search import apply_search, search_dialect
 from app.models.auction import AuctionBid, AuctionImage, AuctionItem
 from app.models.user import User
 from app.schemas.auction import AuctionBidCreate, AuctionItemCreate, AuctionItemUpdate
 from app.services.notification_service import NotificationService
 
+_PENDING_OUTBIDS_KEY = "pending_outbid_notifications"
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_outbids_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_OUTBIDS_KEY, None)
+
 
 class AuctionService:
     """Service for managing auctions (lelang barang)."""
 
     MIN_INCREMENT = Decimal("5000.00")
+    # Conditional-update attempts per bid before reporting contention
+    MAX_BID_RETRIES = 5
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -53,18 +66,62 @@ class AuctionService:
 
         return await self.get_item(item.id)
 
-    async def get_item(self, item_id: UUID) -> Optional[AuctionItem]:
+    async def get_item(self, item_id: UUID, with_bids: bool = True) -> Optional[AuctionItem]:
+        options = [
+            selectinload(AuctionItem.images),
+            selectinload(AuctionItem.donor),
+            selectinload(AuctionItem.winner),
+        ]
+        if with_bids:
+            options.append(selectinload(AuctionItem.bids).selectinload(AuctionBid.bidder))
+        result = await self.db.execute(select(AuctionItem).options(*options).where(AuctionItem.id == item_id))
+        return result.scalar_one_or_none()
+
+    async def get_bid_ranking(
+        self,
+        item_id: UUID,
+        user_id: UUID,
+        limit: int = 20,
+    ) -> tuple[List[tuple[AuctionBid, str]], Optional[Decimal], bool]:
+        """
+        Top `limit` bids with bidder names, the user's highest bid, and whether they lead.
+
+        One query reading the ``(auction_item_id, amount desc)`` index, so the
+        cost does not grow with the number of bids on the item.
+        """
+        my_max_bid = (
+            select(func.max(AuctionBid.amount))
+            .where(AuctionBid.auction_item_id == item_id, AuctionBid.bidder_id == user_id)
+            .scalar_subquery()
+        )
         result = await self.db.execute(
-            select(AuctionItem)
-            .options(
-                selectinload(AuctionItem.images),
-                selectinload(AuctionItem.bids).selectinload(AuctionBid.bidder),
-                selectinload(AuctionItem.donor),
-                selectinload(AuctionItem.winner),
-            )
-            .where(AuctionItem.id == item_id)
+            select(AuctionBid, User.full_name, my_max_bid)
+            .join(User, User.id == AuctionBid.bidder_id)
+            .where(AuctionBid.auction_item_id == item_id)
+            .order_by(AuctionBid.amount.desc())
+            .limit(limit)
         )
-        return result.scalar_one_or_none()
+        rows = result.all()
+        if not rows:
+            return [], None, False
+        return [(bid, name) for bid, name, _ in rows], rows[0][2], rows[0][0].bidder_id == user_id
+
+    async def list_bids(
+        self,
+        item_id: UUID,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> List[tuple[AuctionBid, str]]:
+        """Bid history of an item with bidder names, newest first."""
+        query = (
+            select(AuctionBid, User.full_name)
+            .join(User, User.id == AuctionBid.bidder_id)
+            .where(AuctionBid.auction_item_id == item_id)
+        )
+        query = paginate_newest_first(query, AuctionBid, skip=skip, limit=limit, cursor=cursor)
+        result = await self.db.execute(query)
+        return [(bid, name) for bid, name in result.all()]
 
     async def list_items(
         self,
@@ -75,13 +132,12 @@ class AuctionService:
     ) -> tuple[List[AuctionItem], int]:
         query = select(AuctionItem).options(
             selectinload(AuctionItem.images),
-            selectinload(AuctionItem.bids),
             selectinload(AuctionItem.donor),
             selectinload(AuctionItem.winner),
         )
 
         if search:
-            query = query.where(AuctionItem.title.ilike(f"%{search}%"))
+            query = apply_search(query, search_dialect(self.db), search, AuctionItem.title)
 
         if status == "ready":
             query = query.where(AuctionItem.status == "ready")
@@ -127,56 +183,126 @@ class AuctionService:
         return await self.get_item(item_id)
 
     async def place_bid(self, item_id: UUID, bidder_id: UUID, data: AuctionBidCreate) -> AuctionBid:
-        result = await self.db.execute(select(AuctionItem).where(AuctionItem.id == item_id).with_for_update())
-        item = result.scalar_one_or_none()
-
-        if not item:
-            raise HTTPException(status_code=404, detail="Auction item not found")
-
-        if item.status not in ["ready", "bidding"]:
-            raise HTTPException(status_code=400, detail="Barang lelang tidak sedang dibuka untuk penawaran")
+        """
+        Place a bid without locking the item while it is validated.
+
+        The item is read without a lock and the price is claimed with a single
+        conditional UPDATE guarded by the `version` read; if another bid won
+        the race in between, the item is re-read and the claim retried (up to
+        `MAX_BID_RETRIES`). The same UPDATE maintains the item's bid summary
+        (`bid_count`, `highest_bid_id`, `highest_bidder_id`); the outbid bidder
+        comes from that row, so no query over the bids is needed. Bids after
+        the item's `end_time` are refused even before the sweeper closes it.
+        The outbid notification is only queued: callers commit, then run
+        `send_outbid_notifications`.
+        """
+        bid_id = uuid4()
+        for _ in range(self.MAX_BID_RETRIES):
+            result = await self.db.execute(
+                select(
+                    AuctionItem.title,
+                    AuctionItem.status,
+                    AuctionItem.donor_id,
+                    AuctionItem.current_price,
+                    AuctionItem.min_increment,
+                    AuctionItem.highest_bidder_id,
+                    AuctionItem.version,
+                    AuctionItem.end_time,
+                ).where(AuctionItem.id == item_id)
+            )
+            item = result.one_or_none()
+            now = datetime.now(timezone.utc)
 
-        if bidder_id == item.donor_id:
-            raise HTTPException(status_code=400, detail="Tidak bisa bid untuk barang sendiri")
+            if not item:
+                raise HTTPException(status_code=404, detail="Auction item not found")
 
-        min_bid = item.current_price + item.min_increment
-        if data.amount < min_bid:
-            raise HTTPException(status_code=400, detail=f"Bid minimal Rp {min_bid:,.0f}")
+            if item.status not in ["ready", "bidding"]:
+                raise HTTPException(status_code=400, detail="Barang lelang tidak sedang dibuka untuk penawaran")
 
-        prev_bid_result = await self.db.execute(
-            select(AuctionBid)
-            .where(AuctionBid.auction_item_id == item_id, AuctionBid.status.in_(["pending", "approved"]))
-            .order_by(AuctionBid.amount.desc())
-            .limit(1)
-        )
-        prev_bid = prev_bid_result.scalar_one_or_none()
+            end_time = item.end_time and (
+                item.end_time if item.end_time.tzinfo else item.end_time.replace(tzinfo=timezone.utc)
+            )
+            if end_time and end_time <= now:
+                raise HTTPException(status_code=400, detail="Waktu lelang sudah berakhir")
+
+            if bidder_id == item.donor_id:
+                raise HTTPException(status_code=400, detail="Tidak bisa bid untuk barang sendiri")
+
+            min_bid = item.current_price + item.min_increment
+            if data.amount < min_bid:
+                raise HTTPException(status_code=400, detail=f"Bid minimal Rp {min_bid:,.0f}")
+
+            claimed = await self.db.execute(
+                update(AuctionItem)
+                .where(
+                    AuctionItem.id == item_id,
+                    AuctionItem.version == item.version,
+                    AuctionItem.status.in_(["ready", "bidding"]),
+                    or_(AuctionItem.end_time.is_(None), AuctionItem.end_time > now),
+                    AuctionItem.current_price + AuctionItem.min_increment <= data.amount,
+                )
+                .values(
+                    current_price=data.amount,
+                    status="bidding",
+                    highest_bid_id=bid_id,
+                    highest_bidder_id=bidder_id,
+                    bid_count=AuctionItem.bid_count + 1,
+                    version=AuctionItem.version + 1,
+                )
+                .returning(AuctionItem.version)
+            )
+            if claimed.scalar_one_or_none() is not None:
+                break
+        else:
+            raise HTTPException(status_code=409, detail="Penawaran sedang ramai, silakan coba lagi")
 
         bid = AuctionBid(
+            id=bid_id,
             auction_item_id=item_id,
             bidder_id=bidder_id,
             amount=data.amount,
             status="pending",
         )
         self.db.add(bid)
+        await self.db.flush()
 
-        item.current_price = data.amount
-        item.status = "bidding"
+        if item.highest_bidder_id and item.highest_bidder_id != bidder_id:
+            self.db.info.setdefault(_PENDING_OUTBIDS_KEY, []).append((item_id, item.highest_bidder_id, item.title))
 
-        await self.db.flush()
+        await self._queue_price_update(item_id)
+        return bid
 
-        if prev_bid and prev_bid.bidder_id != bidder_id:
+    async def send_outbid_notifications(self) -> int:
+        """
+        Notify the bidders outbid by this session's committed bids.
+
+        Runs after `place_bid`'s transaction has committed (and before the
+        caller commits again), so the coalesced outbid notification, with its
+        locks and push outbox writes, is never written while the bid holds
+        the item row locked. Bids that rolled back queue nothing.
+        """
+        pending = self.db.info.pop(_PENDING_OUTBIDS_KEY, [])
+        for item_id, user_id, title in pending:
             await self.notification_service.create_notification(
-                user_id=prev_bid.bidder_id,
+                user_id=user_id,
                 title="Tawaran Anda Dilewati",
-                body=f"Ada tawaran lebih tinggi untuk '{item.title}'.",
+                body=f"Ada tawaran lebih tinggi untuk '{title}'.",
                 type="auction_outbid",
                 reference_type="auction",
                 reference_id=item_id,
+                coalesce=True,
             )
-
-        return bid
+        return len(pending)
 
     async def approve_bid(self, item_id: UUID, bid_id: UUID, reviewer_id: UUID) -> AuctionItem:
+        """
+        Approve one bid as the winner and reject the others.
+
+        The item is closed with the same guarded conditional UPDATE as
+        `place_bid` (`version` read, still open), so a bid placed meanwhile
+        or the sweeper closing the item makes the approval fail with 409
+        instead of overwriting that result.
+        """
         item = await self.get_item(item_id)
         if not item:
             raise HTTPException(status_code=404, detail="Auction item not found")
@@ -193,18 +319,35 @@ class AuctionService:
         if not approved_bid:
             raise HTTPException(status_code=404, detail="Bid tidak ditemukan")
 
+        claimed = await self.db.execute(
+            update(AuctionItem)
+            .where(
+                AuctionItem.id == item_id,
+                AuctionItem.version == item.version,
+                AuctionItem.status.in_(["ready", "bidding"]),
+            )
+            .values(
+                winner_id=approved_bid.bidder_id,
+                highest_bid_id=approved_bid.id,
+                highest_bidder_id=approved_bid.bidder_id,
+                current_price=approved_bid.amount,
+                version=AuctionItem.version + 1,
+                status="payment_pending",
+                payment_status="awaiting_payment",
+            )
+            .returning(AuctionItem.version)
+        )
+        if claimed.scalar_one_or_none() is None:
+            raise HTTPException(status_code=409, detail="Lelang sudah berubah, silakan muat ulang")
+
         now = datetime.now(timezone.utc)
         for bid in item.bids:
             bid.reviewed_by = reviewer_id
             bid.reviewed_at = now
             bid.status = "approved" if bid.id == bid_id else "rejected"
 
-        item.winner_id = approved_bid.bidder_id
-        item.current_price = approved_bid.amount
-        item.status = "payment_pending"
-        item.payment_status = "awaiting_payment"
-
         await self.db.flush()
+        await self._queue_price_update(item_id)
 
         await self.notification_service.create_notification(
             user_id=approved_bid.bidder_id,
@@ -217,6 +360,42 @@ class AuctionService:
 
         return await self.get_item(item_id)
 
+    async def get_price_snapshot(self, item_id: UUID) -> Optional[dict]:
+        """
+        Live price state of an item: the payload of its ``price`` stream events.
+
+        `version` increases with every accepted or approved bid, so watchers
+        can drop updates older than the state they already show.
+        """
+        result = await self.db.execute(
+            select(
+                AuctionItem.current_price,
+                AuctionItem.status,
+                AuctionItem.version,
+                AuctionItem.bid_count,
+                User.full_name.label("top_bidder_name"),
+            )
+            .outerjoin(User, User.id == AuctionItem.highest_bidder_id)
+            .where(AuctionItem.id == item_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return {
+            "item_id": str(item_id),
+            "current_price": row.current_price,
+            "bid_count": row.bid_count,
+            "top_bidder_name": row.top_bidder_name,
+            "status": row.status,
+            "version": row.version,
+        }
+
+    async def _queue_price_update(self, item_id: UUID) -> None:
+        """Broadcast the item's new price to its watchers once the bid commits."""
+        snapshot = await self.get_price_snapshot(item_id)
+        if snapshot is not None:
+            queue_auction_event(self.db, item_id, "price", snapshot)
+
     async def upload_payment_proof(self, item_id: UUID, user_id: UUID, proof_url: str) -> AuctionItem:
         item = await self.get_item(item_id)
         if not item:
@@ -300,7 +479,11 @@ class AuctionService:
 
         query = (
             select(AuctionItem)
-            .options(selectinload(AuctionItem.images), selectinload(AuctionItem.bids))
+            .options(
+                selectinload(AuctionItem.images),
+                selectinload(AuctionItem.donor),
+                selectinload(AuctionItem.winner),
+            )
             .join(subquery, AuctionItem.id == subquery.c.auction_item_id)
         )
 
@@ -311,6 +494,115 @@ class AuctionService:
         result = await self.db.execute(query)
         return list(result.scalars().all()), total
 
-    async def close_expired_auctions(self) -> int:
-        """Legacy scheduler: no-op for manual review flow."""
-        return 0
+    async def close_expired_auctions(self, batch_size: Optional[int] = None, now: Optional[datetime] = None) -> int:
+        """
+        Close one batch of open auctions past their `end_time` and commit.
+
+        Items are claimed with ``FOR UPDATE SKIP LOCKED`` through the partial
+        ``end_time`` index of open auctions, so concurrent sweeps take
+        disjoint batches and closed items are never scanned again. One window
+        query picks each item's highest pending bid; like `approve_bid`, it is
+        approved, the other pending bids are rejected and the item awaits
+        payment. Items without bids are cancelled. Winners are notified with
+        one bulk insert. Returns the number of items closed.
+        """
+        now = now or datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(
+                AuctionItem.id,
+                AuctionItem.title,
+                AuctionItem.current_price,
+                AuctionItem.bid_count,
+                AuctionItem.version,
+            )
+            .where(AuctionItem.end_time <= now, AuctionItem.status.in_(["ready", "bidding"]))
+            .order_by(AuctionItem.end_time)
+            .limit(batch_size or settings.AUCTION_CLOSE_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        items = {row.id: row for row in result.all()}
+        if not items:
+            return 0
+
+        ranked = (
+            select(
+                AuctionBid.id,
+                AuctionBid.auction_item_id,
+                AuctionBid.bidder_id,
+                AuctionBid.amount,
+                func.row_number()
+                .over(
+                    partition_by=AuctionBid.auction_item_id,
+                    order_by=(AuctionBid.amount.desc(), AuctionBid.created_at),
+                )
+                .label("rank"),
+            )
+            .where(AuctionBid.auction_item_id.in_(items), AuctionBid.status == "pending")
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(ranked.c.id, ranked.c.auction_item_id, ranked.c.bidder_id, ranked.c.amount, User.full_name)
+            .join(User, User.id == ranked.c.bidder_id)
+            .where(ranked.c.rank == 1)
+        )
+        winners = {row.auction_item_id: row for row in result.all()}
+
+        if winners:
+            await self.db.execute(
+                update(AuctionBid)
+                .where(AuctionBid.auction_item_id.in_(winners), AuctionBid.status == "pending")
+                .values(
+                    status=case((AuctionBid.id.in_([w.id for w in winners.values()]), "approved"), else_="rejected"),
+                    reviewed_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                update(AuctionItem),
+                [
+                    {
+                        "id": item_id,
+                        "winner_id": winner.bidder_id,
+                        "highest_bid_id": winner.id,
+                        "highest_bidder_id": winner.bidder_id,
+                        "current_price": winner.amount,
+                        "status": "payment_pending",
+                        "payment_status": "awaiting_payment",
+                        "version": items[item_id].version + 1,
+                    }
+                    for item_id, winner in winners.items()
+                ],
+            )
+        unsold = [item_id for item_id in items if item_id not in winners]
+        if unsold:
+            await self.db.execute(
+                update(AuctionItem)
+                .where(AuctionItem.id.in_(unsold))
+                .values(status="cancelled", version=AuctionItem.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+        await self.notification_service.create_notifications([
+            {
+                "user_id": winner.bidder_id,
+                "title": "Lelang Berakhir - Anda Menang",
+                "body": f"Anda memenangkan '{items[item_id].title}'. Silakan upload bukti transfer.",
+                "type": "auction_won",
+                "reference_type": "auction",
+                "reference_id": item_id,
+            }
+            for item_id, winner in winners.items()
+        ])
+        for item_id, item in items.items():
+            winner = winners.get(item_id)
+            queue_auction_event(self.db, item_id, "price", {
+                "item_id": str(item_id),
+                "current_price": winner.amount if winner else item.current_price,
+                "bid_count": item.bid_count,
+                "top_bidder_name": winner.full_name if winner else None,
+                "status": "payment_pending" if winner else "cancelled",
+                "version": item.version + 1,
+            })
+
+        await self.db.commit()
+        return len(items)
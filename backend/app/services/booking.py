@@ -9,12 +9,14 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError, ProgrammingError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.booking import MovingBooking
+from app.core.locks import BOOKING_DATE_LOCK, advisory_xact_locks
+from app.core.pagination import paginate_newest_first
+from app.models.booking import BookingSlotOccupancy, MovingBooking
 from app.schemas.booking import BookingCreate, BookingUpdate
 
 ALLOWED_SLOTS = ["08:00", "10:00", "13:00", "15:00", "17:00", "19:00", "21:00"]
@@ -27,33 +29,6 @@ def generate_booking_code() -> str:
     return "BKG-" + "".join(random.choices(string.ascii_uppercase + string.digits, k=8))
 
 
-def _extract_slots(booking: MovingBooking) -> set[str]:
-    """Extract all occupied slots from a booking row (supports legacy and multi-slot)."""
-    slots: set[str] = set()
-    if booking.time_slot:
-        slots.add(booking.time_slot)
-    if booking.time_slots:
-        slots.update({s.strip() for s in booking.time_slots.split(",") if s.strip()})
-    return slots
-
-
-def _extract_dates(booking: MovingBooking) -> set[date]:
-    """Extract all booked dates from a booking row (single-date and multi-date)."""
-    dates: set[date] = set()
-    if booking.booking_date:
-        dates.add(booking.booking_date)
-    if booking.booking_dates:
-        for raw in booking.booking_dates.split(","):
-            val = raw.strip()
-            if not val:
-                continue
-            try:
-                dates.add(date.fromisoformat(val))
-            except ValueError:
-                continue
-    return dates
-
-
 class BookingService:
     """Service class for booking operations."""
     
@@ -79,9 +54,10 @@ class BookingService:
         skip: int = 0,
         limit: int = 20,
         status: Optional[str] = None,
-        requester_id: Optional[str] = None
+        requester_id: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[MovingBooking]:
-        """List bookings with filters."""
+        """List bookings with filters, newest first (offset or keyset `cursor`)."""
         query = select(MovingBooking).options(selectinload(MovingBooking.assigned_volunteer))
         
         if status:
@@ -89,7 +65,7 @@ class BookingService:
         if requester_id:
             query = query.where(MovingBooking.requester_id == UUID(requester_id))
         
-        query = query.offset(skip).limit(limit).order_by(MovingBooking.created_at.desc())
+        query = paginate_newest_first(query, MovingBooking, skip=skip, limit=limit, cursor=cursor)
         result = await self.db.execute(query)
         return list(result.scalars().all())
     
@@ -133,30 +109,33 @@ class BookingService:
                     detail=f"Cannot book more than {MAX_ADVANCE_DAYS} days ahead"
                 )
 
-        # Lock active bookings up to max date, then validate overlaps safely.
-        all_rows_result = await self.db.execute(
-            select(MovingBooking)
-            .with_for_update()
-            .where(
-                MovingBooking.booking_date <= max(selected_dates),
-                MovingBooking.status.notin_(["rejected", "cancelled"])
-            )
+        # Serialize bookings per date: the checks below then see every committed
+        # booking for these dates, while bookings on other dates run in parallel.
+        await advisory_xact_locks(self.db, BOOKING_DATE_LOCK, (d.toordinal() for d in selected_dates))
+
+        # Slots already held on the selected dates (indexed by the occupancy unique key).
+        # The unique constraint stays the final guard against double booking.
+        occupancy_result = await self.db.execute(
+            select(
+                BookingSlotOccupancy.booking_date,
+                BookingSlotOccupancy.time_slot,
+                BookingSlotOccupancy.requester_id,
+            ).where(BookingSlotOccupancy.booking_date.in_(selected_dates))
         )
-        active_bookings = list(all_rows_result.scalars().all())
+        occupancy = occupancy_result.all()
 
         conflicts: list[str] = []
         for target_date in selected_dates:
             requester_occupied: set[str] = set()
             occupied_by_others: set[str] = set()
 
-            for booking_row in active_bookings:
-                if target_date not in _extract_dates(booking_row):
+            for occupied_date, occupied_slot, occupant_id in occupancy:
+                if occupied_date != target_date:
                     continue
-                occupied = _extract_slots(booking_row)
-                if booking_row.requester_id == requester_id:
-                    requester_occupied.update(occupied)
+                if occupant_id == requester_id:
+                    requester_occupied.add(occupied_slot)
                 else:
-                    occupied_by_others.update(occupied)
+                    occupied_by_others.add(occupied_slot)
 
             # User can book up to all slots in a day, but not duplicate own slot booking.
             if len(requester_occupied.union(selected_slots)) > MAX_SLOTS_PER_DAY_PER_USER:
@@ -206,6 +185,19 @@ class BookingService:
         self.db.add(booking)
         try:
             await self.db.flush()
+            await self.db.execute(
+                insert(BookingSlotOccupancy),
+                [
+                    {
+                        "booking_date": booking_date,
+                        "time_slot": slot,
+                        "booking_id": booking.id,
+                        "requester_id": requester_id,
+                    }
+                    for booking_date in selected_dates
+                    for slot in selected_slots
+                ],
+            )
             await self.db.refresh(booking)
         except IntegrityError:
             await self.db.rollback()
@@ -249,18 +241,10 @@ class BookingService:
                 detail=f"Cannot check more than {MAX_ADVANCE_DAYS} days ahead"
             )
         
-        # Get active bookings up to target date (covers multi-date bookings stored in one row).
         result = await self.db.execute(
-            select(MovingBooking).where(
-                MovingBooking.booking_date <= target_date,
-                MovingBooking.status.notin_(["rejected", "cancelled"])
-            )
+            select(BookingSlotOccupancy.time_slot).where(BookingSlotOccupancy.booking_date == target_date)
         )
-        booked_slots: set[str] = set()
-        for booking in result.scalars().all():
-            if target_date not in _extract_dates(booking):
-                continue
-            booked_slots.update(_extract_slots(booking))
+        booked_slots = set(result.scalars().all())
         
         return [
             {"time": slot, "available": slot not in booked_slots}
@@ -313,6 +297,12 @@ class BookingService:
         elif new_status in ("in_progress", "completed"):
             booking.assigned_to = user_id
 
+        if new_status in ("rejected", "cancelled"):
+            # Free the booking's slots for others
+            await self.db.execute(
+                delete(BookingSlotOccupancy).where(BookingSlotOccupancy.booking_id == booking.id)
+            )
+
         await self.db.flush()
         await self.db.refresh(booking)
         return booking
@@ -10,6 +10,7 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.search import apply_search, search_dialect
 
 from app.models.content import Program, NewsArticle
 from app.schemas.content import ProgramCreate, ProgramUpdate, NewsCreate, NewsUpdate
@@ -168,10 +169,13 @@ class ContentService:
         category: Optional[str] = None,
         is_published: Optional[bool] = None,
         news_status: Optional[str] = None,
+        search: Optional[str] = None,
     ) -> List[NewsArticle]:
         """List news articles with filters."""
         query = select(NewsArticle)
 
+        if search:
+            query = apply_search(query, search_dialect(self.db), search, NewsArticle.title)
         if category:
             query = query.where(NewsArticle.category == category)
         if is_published is not None:
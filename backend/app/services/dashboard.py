@@ -0,0 +1,335 @@
+"""
+Dashboard Service - Aggregated metrics and cached snapshots for admin dashboards
+"""
+
+import json
+import logging
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.aggregates import QueryJob, fan_out, filtered_counts, time_bucket_series
+from app.core.config import settings
+from app.core.redis import REDIS_ERRORS, get_redis, mark_redis_unavailable
+from app.models.auction import AuctionItem
+from app.models.booking import MovingBooking
+from app.models.donation import Donation
+from app.models.equipment import MedicalEquipment, EquipmentLoan
+from app.models.pickup import PickupRequest
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY_PREFIX = "dashboard:snapshot:"
+
+# In-process fallback used when Redis is unavailable: name -> (expires_at, envelope).
+# It is per process: the beat refresh only fills the worker's own dict, so while
+# Redis is down each API process computes its snapshots on a miss and keeps them
+# for DASHBOARD_SNAPSHOT_TTL_SECONDS.
+_LOCAL_SNAPSHOTS: Dict[str, tuple[float, Dict[str, Any]]] = {}
+
+
+def _month_label(month_start: date) -> str:
+    return month_start.strftime("%b %Y")
+
+
+def _scalar(query) -> QueryJob:
+    async def job(session: AsyncSession) -> Any:
+        return (await session.execute(query)).scalar_one()
+    return job
+
+
+def _rows(query) -> QueryJob:
+    async def job(session: AsyncSession) -> List[Any]:
+        return (await session.execute(query)).all()
+    return job
+
+
+def _counts(source, counters: Dict[str, Any], **kwargs) -> QueryJob:
+    async def job(session: AsyncSession) -> Dict[str, Any]:
+        return await filtered_counts(session, source, counters, **kwargs)
+    return job
+
+
+def _series(column, aggregate, **kwargs) -> QueryJob:
+    async def job(session: AsyncSession) -> List[tuple]:
+        return await time_bucket_series(session, column, aggregate, **kwargs)
+    return job
+
+
+def _paid_donation_series(months: int = 12) -> QueryJob:
+    """Paid donation totals per calendar month, oldest first."""
+    return _series(
+        Donation.created_at,
+        func.sum(Donation.amount),
+        unit="month",
+        periods=months,
+        filters=[Donation.payment_status == "paid"],
+    )
+
+
+def _amount_trend(series: List[tuple]) -> List[Dict]:
+    return [{"label": _month_label(start), "amount": float(total)} for start, total in series]
+
+
+async def load_snapshot(name: str) -> Optional[Dict[str, Any]]:
+    """Return the latest stored snapshot envelope, or None (Redis miss or expired local copy)."""
+    client = get_redis()
+    if client is not None:
+        try:
+            raw = await client.get(SNAPSHOT_KEY_PREFIX + name)
+            return json.loads(raw) if raw else None
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
+
+    cached = _LOCAL_SNAPSHOTS.get(name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+async def save_snapshot(name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a freshly computed dashboard payload and return its envelope."""
+    envelope = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+    ttl = settings.DASHBOARD_SNAPSHOT_TTL_SECONDS
+    client = get_redis()
+    if client is not None:
+        try:
+            await client.set(SNAPSHOT_KEY_PREFIX + name, json.dumps(envelope), ex=ttl)
+            return envelope
+        except REDIS_ERRORS as exc:
+            mark_redis_unavailable(exc)
+
+    _LOCAL_SNAPSHOTS[name] = (time.monotonic() + ttl, envelope)
+    return envelope
+
+
+class DashboardService:
+    """Service class for dashboard metrics."""
+
+    # Snapshot name -> method computing the payload of the matching /dashboard route.
+    SNAPSHOTS = {
+        "overview": "get_overview",
+        "users": "get_user_metrics",
+        "donations": "get_donation_metrics",
+        "auctions": "get_auction_metrics",
+        "bookings": "get_booking_metrics",
+        "equipment": "get_equipment_metrics",
+    }
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _fan_out(self, jobs: Dict[str, QueryJob]) -> Dict[str, Any]:
+        """Run a payload's independent aggregates concurrently."""
+        return await fan_out(self.db, jobs, limit=settings.DASHBOARD_QUERY_CONCURRENCY)
+
+    # ============== Snapshots ==============
+
+    async def compute(self, name: str) -> Dict[str, Any]:
+        """Compute a dashboard payload directly from the database."""
+        return await getattr(self, self.SNAPSHOTS[name])()
+
+    async def refresh_snapshot(self, name: str) -> Dict[str, Any]:
+        """Recompute a payload, store it as the latest snapshot and return it."""
+        payload = await self.compute(name)
+        await save_snapshot(name, payload)
+        return payload
+
+    async def get_snapshot(self, name: str) -> Dict[str, Any]:
+        """Serve the latest snapshot, computing it on a miss."""
+        envelope = await load_snapshot(name)
+        if envelope is not None:
+            return envelope["payload"]
+        return await self.refresh_snapshot(name)
+
+    async def refresh_all_snapshots(self) -> int:
+        """Recompute every dashboard payload (Celery beat)."""
+        for name in self.SNAPSHOTS:
+            await self.refresh_snapshot(name)
+        return len(self.SNAPSHOTS)
+
+    # ============== Metrics ==============
+
+    async def get_overview(self) -> Dict[str, Any]:
+        """Overall counts + trends for all modules."""
+        results = await self._fan_out({
+            # --- counts (one scan per table) ---
+            "users": _counts(User, {"users": None, "active_users": User.is_active == True}),
+            "donations_amount": _scalar(
+                select(func.coalesce(func.sum(Donation.amount), 0)).where(
+                    Donation.payment_status == "paid"
+                )
+            ),
+            "active_auctions": _scalar(
+                select(func.count(AuctionItem.id)).where(
+                    AuctionItem.status.in_(["bidding", "ready"])
+                )
+            ),
+            "equipment_on_loan": _scalar(
+                select(func.count(EquipmentLoan.id)).where(EquipmentLoan.status == "borrowed")
+            ),
+            "pending_pickups": _scalar(
+                select(func.count(PickupRequest.id)).where(PickupRequest.status == "pending")
+            ),
+            # --- donation trend last 12 months ---
+            "donation_trend": _paid_donation_series(),
+            # --- bookings by status ---
+            "booking_statuses": _rows(
+                select(MovingBooking.status, func.count(MovingBooking.id)).group_by(
+                    MovingBooking.status
+                )
+            ),
+        })
+
+        user_counts = results["users"]
+        booking_statuses = results["booking_statuses"]
+        bookings_by_status = [{"status": s, "count": c} for s, c in booking_statuses]
+        pending_bookings = sum(c for s, c in booking_statuses if s == "pending")
+
+        return {
+            "totals": {
+                "users": user_counts["users"],
+                "active_users": user_counts["active_users"],
+                "donations_amount": float(results["donations_amount"]),
+                "active_auctions": results["active_auctions"],
+                "pending_bookings": pending_bookings,
+                "equipment_on_loan": results["equipment_on_loan"],
+                "pending_pickups": results["pending_pickups"],
+            },
+            "donation_trend": _amount_trend(results["donation_trend"]),
+            "bookings_by_status": bookings_by_status,
+        }
+
+    async def get_user_metrics(self) -> Dict[str, Any]:
+        """Users by role, active vs inactive, new signups per month."""
+        results = await self._fan_out({
+            "roles": _rows(select(User.role, func.count(User.id)).group_by(User.role)),
+            "activity": _counts(
+                User, {"active": User.is_active == True, "inactive": User.is_active == False}
+            ),
+            "signups": _series(User.created_at, func.count(User.id), unit="month", periods=6),
+        })
+
+        activity = results["activity"]
+        return {
+            "by_role": [{"role": r, "count": c} for r, c in results["roles"]],
+            "active": activity["active"],
+            "inactive": activity["inactive"],
+            "signups_per_month": [
+                {"label": _month_label(start), "count": cnt} for start, cnt in results["signups"]
+            ],
+        }
+
+    async def get_donation_metrics(self) -> Dict[str, Any]:
+        """Totals by type, by month, top donors."""
+        results = await self._fan_out({
+            "by_type": _rows(
+                select(
+                    Donation.donation_type,
+                    func.count(Donation.id),
+                    func.coalesce(func.sum(Donation.amount), 0),
+                )
+                .where(Donation.payment_status == "paid")
+                .group_by(Donation.donation_type)
+            ),
+            "monthly": _paid_donation_series(),
+            "total_all": _scalar(
+                select(func.coalesce(func.sum(Donation.amount), 0)).where(
+                    Donation.payment_status == "paid"
+                )
+            ),
+        })
+
+        return {
+            "total_amount": float(results["total_all"]),
+            "by_type": [
+                {"type": t, "count": c, "amount": float(a)} for t, c, a in results["by_type"]
+            ],
+            "monthly_trend": _amount_trend(results["monthly"]),
+        }
+
+    async def get_auction_metrics(self) -> Dict[str, Any]:
+        """Active auctions, total sold value, by status."""
+        results = await self._fan_out({
+            "by_status": _rows(
+                select(AuctionItem.status, func.count(AuctionItem.id)).group_by(
+                    AuctionItem.status
+                )
+            ),
+            "total_sold": _scalar(
+                select(func.coalesce(func.sum(AuctionItem.current_price), 0)).where(
+                    AuctionItem.status == "sold"
+                )
+            ),
+            "pending_payments": _scalar(
+                select(func.count(AuctionItem.id)).where(
+                    AuctionItem.status == "payment_pending"
+                )
+            ),
+        })
+
+        return {
+            "by_status": [{"status": s, "count": c} for s, c in results["by_status"]],
+            "total_sold_value": float(results["total_sold"]),
+            "pending_payments": results["pending_payments"],
+        }
+
+    async def get_booking_metrics(self) -> Dict[str, Any]:
+        """Bookings by status, by month."""
+        results = await self._fan_out({
+            "by_status": _rows(
+                select(MovingBooking.status, func.count(MovingBooking.id)).group_by(
+                    MovingBooking.status
+                )
+            ),
+            "weekly": _series(
+                MovingBooking.booking_date, func.count(MovingBooking.id), unit="week", periods=8
+            ),
+        })
+
+        return {
+            "by_status": [{"status": s, "count": c} for s, c in results["by_status"]],
+            "weekly_trend": [
+                {"label": str(week_start), "count": cnt} for week_start, cnt in results["weekly"]
+            ],
+        }
+
+    async def get_equipment_metrics(self) -> Dict[str, Any]:
+        """Equipment by condition, loan status breakdown."""
+        results = await self._fan_out({
+            "by_category": _rows(
+                select(MedicalEquipment.category, func.count(MedicalEquipment.id)).where(
+                    MedicalEquipment.is_active == True
+                ).group_by(MedicalEquipment.category)
+            ),
+            "by_condition": _rows(
+                select(MedicalEquipment.condition, func.count(MedicalEquipment.id)).where(
+                    MedicalEquipment.is_active == True
+                ).group_by(MedicalEquipment.condition)
+            ),
+            "loan_by_status": _rows(
+                select(EquipmentLoan.status, func.count(EquipmentLoan.id)).group_by(
+                    EquipmentLoan.status
+                )
+            ),
+        })
+
+        by_category = results["by_category"]
+        loan_by_status = results["loan_by_status"]
+        loans_per_status = dict(loan_by_status)
+
+        return {
+            "total_equipment": sum(n for _, n in by_category),
+            "on_loan": loans_per_status.get("borrowed", 0),
+            "pending_loans": loans_per_status.get("pending", 0),
+            "by_category": [{"category": c, "count": n} for c, n in by_category],
+            "by_condition": [{"condition": c, "count": n} for c, n in results["by_condition"]],
+            "loan_by_status": [{"status": s, "count": c} for s, c in loan_by_status],
+        }
@@ -15,6 +15,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.pagination import paginate_newest_first
 from app.models.donation import Donation
 from app.schemas.donation import DonationCreate, DonationVerify
 
@@ -137,9 +138,10 @@ class DonationService:
         limit: int = 20,
         status: Optional[str] = None,
         donor_id: Optional[str] = None,
-        donation_type: Optional[str] = None
+        donation_type: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[Donation]:
-        """List donations with filters."""
+        """List donations with filters, newest first (offset or keyset `cursor`)."""
         query = select(Donation).options(selectinload(Donation.verifier))
         
         if status:
@@ -149,7 +151,7 @@ class DonationService:
         if donation_type:
             query = query.where(Donation.donation_type == donation_type)
         
-        query = query.offset(skip).limit(limit).order_by(Donation.created_at.desc())
+        query = paginate_newest_first(query, Donation, skip=skip, limit=limit, cursor=cursor)
         result = await self.db.execute(query)
         return list(result.scalars().all())
     
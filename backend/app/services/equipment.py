@@ -12,6 +12,9 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.aggregates import filtered_counts
+from app.core.pagination import paginate_newest_first
+from app.core.search import apply_search, search_dialect
 from app.models.equipment import MedicalEquipment, EquipmentLoan
 from app.models.user import User
 from app.schemas.equipment import EquipmentCreate, EquipmentUpdate, EquipmentLoanCreate, EquipmentLoanUpdate
@@ -46,11 +49,14 @@ class EquipmentService:
         skip: int = 0,
         limit: int = 20,
         category: Optional[str] = None,
-        available_only: bool = False
+        available_only: bool = False,
+        search: Optional[str] = None,
     ) -> List[MedicalEquipment]:
         """List equipment with filters."""
         query = select(MedicalEquipment).where(MedicalEquipment.is_active == True)
         
+        if search:
+            query = apply_search(query, search_dialect(self.db), search, MedicalEquipment.name)
         if category:
             query = query.where(MedicalEquipment.category == category)
         if available_only:
@@ -123,9 +129,10 @@ class EquipmentService:
         limit: int = 20,
         status: Optional[str] = None,
         borrower_id: Optional[str] = None,
-        equipment_id: Optional[str] = None
+        equipment_id: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[EquipmentLoan]:
-        """List loans with filters."""
+        """List loans with filters, newest first (offset or keyset `cursor`)."""
         query = select(EquipmentLoan)
         query = query.options(selectinload(EquipmentLoan.equipment))
         
@@ -136,7 +143,7 @@ class EquipmentService:
         if equipment_id:
             query = query.where(EquipmentLoan.equipment_id == UUID(equipment_id))
         
-        query = query.offset(skip).limit(limit).order_by(EquipmentLoan.created_at.desc())
+        query = paginate_newest_first(query, EquipmentLoan, skip=skip, limit=limit, cursor=cursor)
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
@@ -305,29 +312,26 @@ class EquipmentService:
     
     async def get_stats(self) -> dict:
         """Get equipment statistics."""
-        total = await self.db.scalar(
-            select(func.count()).select_from(MedicalEquipment).where(MedicalEquipment.is_active == True)
+        inventory = await filtered_counts(
+            self.db,
+            MedicalEquipment,
+            {"total": None},
+            filters=[MedicalEquipment.is_active == True],
+            extra={"available": func.sum(MedicalEquipment.available_stock)},
         )
-        
-        borrowed = await self.db.scalar(
-            select(func.count()).select_from(EquipmentLoan).where(EquipmentLoan.status.in_(["approved", "borrowed"]))
-        )
-        borrowed_active = await self.db.scalar(
-            select(func.count()).select_from(EquipmentLoan).where(EquipmentLoan.status == "borrowed")
-        )
-        
-        pending = await self.db.scalar(
-            select(func.count()).select_from(EquipmentLoan).where(EquipmentLoan.status == "pending")
+        loans = await filtered_counts(
+            self.db,
+            EquipmentLoan,
+            {
+                "borrowed": EquipmentLoan.status.in_(["approved", "borrowed"]),
+                "borrowed_active": EquipmentLoan.status == "borrowed",
+                "pending": EquipmentLoan.status == "pending",
+            },
         )
-        
-        available = await self.db.scalar(
-            select(func.sum(MedicalEquipment.available_stock)).where(MedicalEquipment.is_active == True)
-        )
-        
         return {
-            "total": total or 0,
-            "borrowed": borrowed or 0,
-            "borrowed_active": borrowed_active or 0,
-            "pending_requests": pending or 0,
-            "available": available or 0
+            "total": inventory["total"],
+            "borrowed": loans["borrowed"],
+            "borrowed_active": loans["borrowed_active"],
+            "pending_requests": loans["pending"],
+            "available": inventory["available"] or 0
         }
@@ -11,6 +11,7 @@ from sqlalchemy import select, func, extract, and_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.pagination import paginate_newest_first
 from app.models.financial import (
     FinancialReport,
     FinancialEntry,
@@ -449,6 +450,7 @@ class FinancialService:
         category_id: Optional[UUID] = None,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
+        cursor: Optional[str] = None,
     ) -> tuple[List[FinancialTransaction], int]:
         filters = []
         if status_filter:
@@ -465,20 +467,17 @@ class FinancialService:
         where_clause = and_(*filters) if filters else None
 
         count_query = select(func.count()).select_from(FinancialTransaction)
-        data_query = (
-            select(FinancialTransaction)
-            .options(
-                selectinload(FinancialTransaction.category),
-                selectinload(FinancialTransaction.requester),
-                selectinload(FinancialTransaction.reviewer),
-            )
-            .order_by(FinancialTransaction.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        data_query = select(FinancialTransaction).options(
+            selectinload(FinancialTransaction.category),
+            selectinload(FinancialTransaction.requester),
+            selectinload(FinancialTransaction.reviewer),
         )
         if where_clause is not None:
             count_query = count_query.where(where_clause)
             data_query = data_query.where(where_clause)
+        data_query = paginate_newest_first(
+            data_query, FinancialTransaction, skip=skip, limit=limit, cursor=cursor
+        )
 
         total_result = await self.db.execute(count_query)
         result = await self.db.execute(data_query)
@@ -1,19 +1,191 @@
 """
 Notification Service - In-app and Push Notifications
 """
-from datetime import datetime, timezone
-from typing import List, Optional
+import asyncio
+import json
+import logging
+import weakref
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select, update, func
+from sqlalchemy import delete, insert, select, text, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import Notification, PushToken
+from app.core.config import settings
+from app.core.events import queue_user_event
+from app.core.locks import NOTIFICATION_COALESCE_LOCK, advisory_xact_locks, lock_key
+from app.core.pagination import next_cursor, paginate_newest_first
+from app.core.rate_limit import check_rate_limit
+from app.core.partitions import (
+    add_months,
+    archive_partition,
+    detach_partition,
+    drop_detached_partition,
+    ensure_monthly_partitions,
+    list_monthly_partitions,
+    retention_cutoff,
+)
+from app.models.notification import Notification, PushOutbox, PushToken
+from app.models.user import User
 import httpx
 
+logger = logging.getLogger(__name__)
 
-EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+EXPO_PUSH_CHUNK_SIZE = 100  # Expo accepts at most 100 messages per request
+EXPO_RECEIPT_CHUNK_SIZE = 1000  # Expo accepts at most 1000 receipt ids per request
+# Expo keeps receipts for about a day; tickets still unanswered after that are given up
+EXPO_RECEIPT_RETENTION = timedelta(hours=24)
+EXPO_PUSH_CONCURRENCY = 4
+# Outbox rows that are never picked up again, purged by purge_push_outbox
+PUSH_OUTBOX_FINAL_STATUSES = ("delivered", "failed", "coalesced", "unconfirmed")
+# Recipients per `IN (...)` lookup, well under driver bind-parameter limits
+RECIPIENT_QUERY_CHUNK_SIZE = 5000
+
+# One pooled client per event loop (Celery jobs run each task in a fresh loop).
+_PUSH_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def get_push_client() -> httpx.AsyncClient:
+    """Shared keep-alive HTTP client for Expo push requests."""
+    loop = asyncio.get_running_loop()
+    client = _PUSH_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=EXPO_PUSH_CONCURRENCY),
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        _PUSH_CLIENTS[loop] = client
+    return client
+
+
+async def close_push_client() -> None:
+    """Close the running event loop's Expo client (end of an ``asyncio.run`` job)."""
+    client = _PUSH_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def build_push_messages(
+    tokens: Iterable[str],
+    title: str,
+    body: str,
+    data: Optional[dict] = None,
+) -> List[dict]:
+    """Build Expo push messages for a set of device tokens."""
+    messages = []
+    for token in tokens:
+        message = {
+            "to": token,
+            "title": title,
+            "body": body,
+            "sound": "default",
+            "priority": "high",
+        }
+        if data:
+            message["data"] = data
+        messages.append(message)
+    return messages
+
+
+async def send_expo_messages(messages: Sequence[dict]) -> List[Optional[dict]]:
+    """
+    Send push messages to Expo in chunks of 100 over the shared client.
+
+    Returns:
+        One entry per message, in order: the Expo push ticket
+        (``{"status": "ok", "id": ...}`` or ``{"status": "error", ...}``), or
+        None when its chunk could not be delivered. Failed chunks are logged,
+        not raised.
+    """
+    if not messages:
+        return []
+
+    client = get_push_client()
+    semaphore = asyncio.Semaphore(EXPO_PUSH_CONCURRENCY)
+
+    async def post(chunk: Sequence[dict]) -> List[Optional[dict]]:
+        async with semaphore:
+            try:
+                response = await client.post(settings.EXPO_PUSH_URL, json=list(chunk))
+                response.raise_for_status()
+                tickets = response.json().get("data") or []
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Failed to send %d push notifications: %s", len(chunk), e)
+                return [None] * len(chunk)
+            if len(tickets) != len(chunk):
+                logger.warning("Expo returned %d tickets for %d messages", len(tickets), len(chunk))
+                tickets = (list(tickets) + [None] * len(chunk))[:len(chunk)]
+            return tickets
+
+    results = await asyncio.gather(*(post(chunk) for chunk in _chunks(messages, EXPO_PUSH_CHUNK_SIZE)))
+    return [ticket for chunk in results for ticket in chunk]
+
+
+async def fetch_expo_receipts(ticket_ids: Sequence[str]) -> Dict[str, dict]:
+    """
+    Fetch push receipts for ticket ids, 1000 ids per request.
+
+    Returns:
+        Receipts by ticket id. Ids Expo has no receipt for yet, and ids in
+        chunks that failed (logged, not raised), are absent.
+    """
+    if not ticket_ids:
+        return {}
+
+    client = get_push_client()
+    semaphore = asyncio.Semaphore(EXPO_PUSH_CONCURRENCY)
+
+    async def post(chunk: Sequence[str]) -> Dict[str, dict]:
+        async with semaphore:
+            try:
+                response = await client.post(settings.EXPO_RECEIPTS_URL, json={"ids": list(chunk)})
+                response.raise_for_status()
+                return response.json().get("data") or {}
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Failed to fetch %d push receipts: %s", len(chunk), e)
+                return {}
+
+    receipts: Dict[str, dict] = {}
+    for chunk in await asyncio.gather(*(post(chunk) for chunk in _chunks(ticket_ids, EXPO_RECEIPT_CHUNK_SIZE))):
+        receipts.update(chunk)
+    return receipts
+
+
+def _expo_error(result: dict) -> Optional[str]:
+    """Error code (e.g. ``DeviceNotRegistered``) of an Expo ticket or receipt."""
+    return (result.get("details") or {}).get("error")
+
+
+def _notification_event(notification: Notification) -> dict:
+    """Payload of a ``notification`` stream event, shaped like NotificationResponse."""
+    return {
+        "id": str(notification.id),
+        "user_id": str(notification.user_id),
+        "title": notification.title,
+        "body": notification.body,
+        "type": notification.type,
+        "reference_type": notification.reference_type,
+        "reference_id": notification.reference_id,
+        "is_read": False,
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+def push_retry_delay(attempts: int) -> timedelta:
+    """Backoff before retry number `attempts`: base * 2^(attempts - 1), capped."""
+    delay = settings.PUSH_OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.PUSH_OUTBOX_RETRY_MAX_SECONDS))
 
 
 class NotificationService:
@@ -96,25 +268,82 @@ class NotificationService:
         reference_type: Optional[str] = None,
         reference_id: Optional[UUID] = None,
         send_push: bool = True,
+        coalesce: bool = False,
     ) -> Notification:
-        """Create an in-app notification and optionally send push."""
-        notification = Notification(
-            user_id=user_id,
-            title=title,
-            body=body,
-            type=type,
-            reference_type=reference_type,
-            reference_id=str(reference_id) if reference_id else None,
-            is_read=False,
-        )
-        self.db.add(notification)
-        await self.db.flush()
+        """
+        Create an in-app notification and optionally queue a push.
+
+        With `coalesce`, an unread notification with the same user, type and
+        reference is updated in place (new text, moved to the top) instead of
+        adding a row, and pushes for that key are limited to one per device
+        and ``NOTIFICATION_COALESCE_PUSH_SECONDS`` — for bursts such as
+        repeated outbids in one auction. The limit is applied when the outbox
+        is drained, so a rolled-back transaction never uses up the window.
+        """
+        reference = str(reference_id) if reference_id else None
+        notification = None
+        coalesce_key = None
+        if coalesce:
+            coalesce_key = f"{user_id}:{type}:{reference_type}:{reference}"
+            # FOR UPDATE cannot lock an unread row that does not exist yet:
+            # serialize the key so concurrent first notifications add one row.
+            await advisory_xact_locks(self.db, NOTIFICATION_COALESCE_LOCK, [lock_key(coalesce_key)])
+            notification = await self._coalesce(user_id, title, body, type, reference_type, reference)
+            if notification is not None:
+                queue_user_event(self.db, user_id, "notification", _notification_event(notification))
+
+        if notification is None:
+            notification = Notification(
+                user_id=user_id,
+                title=title,
+                body=body,
+                type=type,
+                reference_type=reference_type,
+                reference_id=reference,
+                is_read=False,
+            )
+            self.db.add(notification)
+            await self.db.flush()
+            queue_user_event(self.db, user_id, "notification", _notification_event(notification))
+            await self._adjust_unread([user_id], 1)
         
-        # Send push notification
+        # Queue push notification; delivered by drain_push_outbox after commit
         if send_push:
-            await self._send_push_notification(user_id, title, body)
+            await self.enqueue_push([user_id], title, body, coalesce_key=coalesce_key)
         
         return notification
+
+    async def _coalesce(
+        self,
+        user_id: UUID,
+        title: str,
+        body: str,
+        type: str,
+        reference_type: Optional[str],
+        reference_id: Optional[str],
+    ) -> Optional[Notification]:
+        """Refresh the user's unread notification for this key; None if there is none."""
+        result = await self.db.execute(
+            select(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.is_read == False,
+                Notification.type == type,
+                Notification.reference_type == reference_type,
+                Notification.reference_id == reference_id,
+                Notification.created_at >= retention_cutoff(settings.NOTIFICATION_RETENTION_MONTHS),
+            )
+            .order_by(Notification.created_at.desc())
+            .limit(1)
+            .with_for_update()
+        )
+        notification = result.scalar_one_or_none()
+        if notification is not None:
+            notification.title = title
+            notification.body = body
+            notification.created_at = datetime.now(timezone.utc)
+            await self.db.flush()
+        return notification
     
     async def create_bulk_notifications(
         self,
@@ -124,72 +353,334 @@ class NotificationService:
         type: str,
         reference_type: Optional[str] = None,
         reference_id: Optional[UUID] = None,
+        send_push: bool = True,
     ) -> int:
-        """Create notifications for multiple users."""
-        count = 0
-        for user_id in user_ids:
-            await self.create_notification(
-                user_id=user_id,
-                title=title,
-                body=body,
-                type=type,
-                reference_type=reference_type,
-                reference_id=reference_id,
-                send_push=True,
-            )
-            count += 1
-        
-        return count
+        """
+        Create the same notification for many users.
+
+        Inserts all rows in one multi-row INSERT and queues the pushes for
+        every recipient's devices in the push outbox.
+        """
+        recipients = list(dict.fromkeys(user_ids))
+        return await self.create_notifications(
+            [
+                {
+                    "user_id": user_id,
+                    "title": title,
+                    "body": body,
+                    "type": type,
+                    "reference_type": reference_type,
+                    "reference_id": reference_id,
+                }
+                for user_id in recipients
+            ],
+            send_push=send_push,
+        )
+
+    async def create_notifications(self, entries: Sequence[dict], send_push: bool = True) -> int:
+        """
+        Create individual notifications in one multi-row INSERT.
+
+        Each entry holds the `create_notification` fields (``user_id``,
+        ``title``, ``body``, ``type`` and optionally ``reference_type`` and
+        ``reference_id``); their pushes are queued together.
+        """
+        if not entries:
+            return 0
+
+        result = await self.db.execute(
+            insert(Notification).returning(Notification),
+            [
+                {
+                    "user_id": entry["user_id"],
+                    "title": entry["title"],
+                    "body": entry["body"],
+                    "type": entry["type"],
+                    "reference_type": entry.get("reference_type"),
+                    "reference_id": str(entry["reference_id"]) if entry.get("reference_id") else None,
+                    "is_read": False,
+                }
+                for entry in entries
+            ],
+        )
+        for notification in result.scalars():
+            queue_user_event(self.db, notification.user_id, "notification", _notification_event(notification))
+
+        # Users may receive several entries; one counter update per distinct increment
+        received = Counter(entry["user_id"] for entry in entries)
+        for delta in sorted(set(received.values())):
+            await self._adjust_unread([user_id for user_id, n in received.items() if n == delta], delta)
+
+        if send_push:
+            await self.enqueue_pushes([(entry["user_id"], entry["title"], entry["body"], None) for entry in entries])
+
+        return len(entries)
     
     # ============== Push Delivery ==============
     
-    async def _send_push_notification(
+    async def enqueue_push(
         self,
-        user_id: UUID,
+        user_ids: Sequence[UUID],
         title: str,
         body: str,
         data: Optional[dict] = None,
-    ):
-        """Send push notification via Expo."""
-        # Get user's push tokens
-        result = await self.db.execute(
-            select(PushToken.token).where(PushToken.user_id == user_id)
+        coalesce_key: Optional[str] = None,
+    ) -> int:
+        """
+        Queue a push to every device of the given users.
+
+        Rows are written to ``push_outbox`` in the caller's transaction, so
+        they are delivered only if it commits and the caller never waits on
+        Expo. A `coalesce_key` replaces that key's pushes still waiting in the
+        outbox and is rate-limited by the drain. Returns the number of
+        messages queued.
+        """
+        return await self.enqueue_pushes(
+            [(user_id, title, body, data) for user_id in user_ids], coalesce_key=coalesce_key
         )
-        tokens = [row[0] for row in result.all()]
-        
-        if not tokens:
-            return
-        
-        # Prepare messages
-        messages = []
-        for token in tokens:
-            message = {
-                "to": token,
+
+    async def enqueue_pushes(
+        self,
+        messages: Sequence[Tuple[UUID, str, str, Optional[dict]]],
+        coalesce_key: Optional[str] = None,
+    ) -> int:
+        """Queue ``(user_id, title, body, data)`` messages to each user's devices, like `enqueue_push`."""
+        pairs = await self._get_push_tokens(list(dict.fromkeys(user_id for user_id, *_ in messages)))
+        if not pairs:
+            return 0
+        if coalesce_key is not None:
+            # Only the newest text of a burst is worth sending. Rows a drain has
+            # claimed are skipped rather than waited for (it holds them while
+            # calling Expo); the drain's rate limit then coalesces the newer one.
+            superseded = (
+                select(PushOutbox.id)
+                .where(
+                    PushOutbox.coalesce_key == coalesce_key,
+                    PushOutbox.status == "pending",
+                    PushOutbox.attempts == 0,
+                )
+                .with_for_update(skip_locked=True)
+            )
+            await self.db.execute(delete(PushOutbox).where(PushOutbox.id.in_(superseded)))
+
+        tokens: Dict[UUID, List[str]] = {}
+        for user_id, token in pairs:
+            tokens.setdefault(user_id, []).append(token)
+        rows = [
+            {
+                "user_id": user_id,
+                "token": token,
                 "title": title,
                 "body": body,
-                "sound": "default",
-                "priority": "high",
+                "data": json.dumps(data) if data else None,
+                "status": "pending",
+                "attempts": 0,
+                "coalesce_key": coalesce_key,
             }
-            if data:
-                message["data"] = data
-            messages.append(message)
-        
-        # Send to Expo
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    EXPO_PUSH_URL,
-                    json=messages,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
-                    },
-                )
-                response.raise_for_status()
-        except httpx.HTTPError as e:
-            # Log error but don't fail the operation
-            print(f"Failed to send push notification: {e}")
+            for user_id, title, body, data in messages
+            for token in tokens.get(user_id, ())
+        ]
+        await self.db.execute(insert(PushOutbox), rows)
+        return len(rows)
+
+    async def _get_push_tokens(self, user_ids: Sequence[UUID]) -> List[Tuple[UUID, str]]:
+        """Load ``(user_id, token)`` for every device of the given users."""
+        pairs: List[Tuple[UUID, str]] = []
+        for chunk in _chunks(list(user_ids), RECIPIENT_QUERY_CHUNK_SIZE):
+            result = await self.db.execute(
+                select(PushToken.user_id, PushToken.token).where(PushToken.user_id.in_(chunk))
+            )
+            pairs.extend(tuple(row) for row in result.all())
+        return pairs
+
+    async def drain_push_outbox(self, batch_size: Optional[int] = None) -> int:
+        """
+        Deliver one batch of due outbox messages and commit the outcome.
+
+        Due rows are claimed with ``FOR UPDATE SKIP LOCKED`` so concurrent
+        drains take disjoint batches. Accepted messages are marked ``sent``
+        with their Expo ticket id, and their receipt falls due after
+        ``PUSH_RECEIPT_DELAY_SECONDS``; per-message errors from Expo are final
+        (``failed``); undelivered chunks are retried with exponential backoff
+        until ``PUSH_OUTBOX_MAX_ATTEMPTS``. Coalesced messages take their
+        rate-limit slot on their first attempt, and are marked ``coalesced``
+        instead of sent when the key already had a push to that device within
+        ``NOTIFICATION_COALESCE_PUSH_SECONDS``. Returns the number of rows claimed.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(PushOutbox)
+            .where(PushOutbox.status == "pending", PushOutbox.next_attempt_at <= now)
+            .order_by(PushOutbox.next_attempt_at)
+            .limit(batch_size or settings.PUSH_OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.scalars().all()
+        if not rows:
+            return 0
+
+        deliver = []
+        for row in rows:
+            if row.coalesce_key and row.attempts == 0 and not await check_rate_limit(
+                f"push:{row.coalesce_key}:{row.token}",
+                max_requests=1,
+                window_seconds=settings.NOTIFICATION_COALESCE_PUSH_SECONDS,
+            ):
+                row.status = "coalesced"
+            else:
+                deliver.append(row)
+
+        messages = [
+            build_push_messages([row.token], row.title, row.body, json.loads(row.data) if row.data else None)[0]
+            for row in deliver
+        ]
+        tickets = await send_expo_messages(messages) if messages else []
+
+        dead_tokens = []
+        for row, ticket in zip(deliver, tickets):
+            row.attempts += 1
+            if ticket is None:
+                if row.attempts >= settings.PUSH_OUTBOX_MAX_ATTEMPTS:
+                    row.status = "failed"
+                else:
+                    row.next_attempt_at = now + push_retry_delay(row.attempts)
+                row.last_error = "delivery to Expo failed"
+            elif ticket.get("status") == "ok":
+                row.status = "sent"
+                row.ticket_id = ticket.get("id")
+                row.sent_at = now
+                row.next_attempt_at = now + timedelta(seconds=settings.PUSH_RECEIPT_DELAY_SECONDS)
+            else:
+                row.status = "failed"
+                row.last_error = ticket.get("message") or _expo_error(ticket)
+                if _expo_error(ticket) == "DeviceNotRegistered":
+                    dead_tokens.append(row.token)
+
+        await self.prune_push_tokens(dead_tokens)
+        await self.db.commit()
+        return len(rows)
+
+    async def process_push_receipts(self, batch_size: Optional[int] = None) -> int:
+        """
+        Check Expo receipts for one batch of sent messages and commit.
+
+        Messages whose receipt is due are claimed with ``FOR UPDATE SKIP
+        LOCKED`` and marked ``delivered`` or ``failed`` from their receipt.
+        Tokens Expo reports as ``DeviceNotRegistered`` are deleted. Receipts
+        not available yet are checked again on a later run, until
+        ``EXPO_RECEIPT_RETENTION`` has passed. Returns the number of rows
+        claimed.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(PushOutbox)
+            .where(PushOutbox.status == "sent", PushOutbox.next_attempt_at <= now)
+            .order_by(PushOutbox.next_attempt_at)
+            .limit(batch_size or settings.PUSH_RECEIPT_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.scalars().all()
+        if not rows:
+            return 0
+
+        receipts = await fetch_expo_receipts([row.ticket_id for row in rows if row.ticket_id])
+
+        dead_tokens = []
+        for row in rows:
+            receipt = receipts.get(row.ticket_id)
+            if receipt is None:
+                sent_at = row.sent_at if row.sent_at.tzinfo else row.sent_at.replace(tzinfo=timezone.utc)
+                if not row.ticket_id or now - sent_at >= EXPO_RECEIPT_RETENTION:
+                    row.status = "unconfirmed"
+                else:
+                    row.next_attempt_at = now + timedelta(seconds=settings.PUSH_RECEIPT_DELAY_SECONDS)
+            elif receipt.get("status") == "ok":
+                row.status = "delivered"
+            else:
+                row.status = "failed"
+                row.last_error = receipt.get("message") or _expo_error(receipt)
+                if _expo_error(receipt) == "DeviceNotRegistered":
+                    dead_tokens.append(row.token)
+
+        await self.prune_push_tokens(dead_tokens)
+        await self.db.commit()
+        return len(rows)
+
+    async def purge_push_outbox(self, batch_size: Optional[int] = None, now: Optional[datetime] = None) -> int:
+        """
+        Delete one batch of outbox rows in a final state and commit.
+
+        Rows that were delivered, failed, coalesced or left unconfirmed are
+        removed once ``PUSH_OUTBOX_RETENTION_HOURS`` have passed since they were
+        queued (``sent`` rows become ``unconfirmed`` after the receipt window).
+        Returns the number of rows deleted.
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=settings.PUSH_OUTBOX_RETENTION_HOURS)
+        expired = (
+            select(PushOutbox.id)
+            .where(
+                PushOutbox.status.in_(PUSH_OUTBOX_FINAL_STATUSES),
+                PushOutbox.created_at < cutoff,
+            )
+            .limit(batch_size or settings.PUSH_RECEIPT_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(delete(PushOutbox).where(PushOutbox.id.in_(expired)))
+        await self.db.commit()
+        return result.rowcount
+
+    async def prune_push_tokens(self, tokens: Sequence[str]) -> int:
+        """
+        Delete push tokens Expo reported as no longer registered.
+
+        Messages still queued for them are failed rather than sent.
+        """
+        tokens = list(dict.fromkeys(tokens))
+        deleted = 0
+        for chunk in _chunks(tokens, RECIPIENT_QUERY_CHUNK_SIZE):
+            result = await self.db.execute(delete(PushToken).where(PushToken.token.in_(chunk)))
+            deleted += result.rowcount
+            await self.db.execute(
+                update(PushOutbox)
+                .where(PushOutbox.token.in_(chunk), PushOutbox.status == "pending")
+                .values(status="failed", last_error="DeviceNotRegistered")
+            )
+        if deleted:
+            logger.info("Pruned %d unregistered push tokens", deleted)
+        return deleted
     
+    # ============== Unread Counter ==============
+
+    async def _adjust_unread(self, user_ids: Sequence[UUID], delta: int) -> None:
+        """
+        Apply `delta` to the denormalized ``users.unread_notification_count``.
+
+        Runs in the caller's transaction, so the counter commits or rolls back
+        together with the notification rows it reflects; the new counts are
+        streamed to the users once it commits.
+        """
+        # An UPDATE locks rows in its scan order, whatever the IN list order:
+        # lock them in id order first so overlapping fan-outs cannot deadlock.
+        # Chunks follow the same order (uuid text order matches PostgreSQL's).
+        for chunk in _chunks(sorted(set(user_ids), key=str), RECIPIENT_QUERY_CHUNK_SIZE):
+            if len(chunk) > 1:
+                await self.db.execute(
+                    select(User.id).where(User.id.in_(chunk)).order_by(User.id).with_for_update()
+                )
+            result = await self.db.execute(
+                update(User)
+                .where(User.id.in_(chunk))
+                .values(
+                    unread_notification_count=User.unread_notification_count + delta,
+                    # Not a profile change: keep updated_at as it was
+                    updated_at=User.updated_at,
+                )
+                .returning(User.id, User.unread_notification_count)
+                .execution_options(synchronize_session=False)
+            )
+            for user_id, count in result.all():
+                queue_user_event(self.db, user_id, "unread_count", {"count": count})
+
     # ============== Notification Retrieval ==============
     
     async def get_notifications(
@@ -198,55 +689,65 @@ class NotificationService:
         limit: int = 50,
         offset: int = 0,
         include_read: bool = True,
+        cursor: Optional[str] = None,
     ) -> dict:
-        """Get notifications for a user."""
-        # Build query
-        query = select(Notification).where(Notification.user_id == user_id)
-        
-        if not include_read:
-            query = query.where(Notification.is_read == False)
-        
-        # Get total count
-        count_query = select(func.count()).where(Notification.user_id == user_id)
+        """
+        Get notifications for a user, newest first (offset or keyset `cursor`).
+
+        The page, the cached unread counter and, for offset pages, the
+        ``total`` match count (a ``count(*) OVER ()`` window, computed before
+        OFFSET/LIMIT) come back in one query. Cursor pages return ``total``
+        None so the keyset seek never counts the whole inbox. Only rows inside
+        the retention window are listed, so partitions already due to be
+        dropped are pruned from the plan.
+        """
+        cutoff = retention_cutoff(settings.NOTIFICATION_RETENTION_MONTHS)
+        conditions = [Notification.user_id == user_id, Notification.created_at >= cutoff]
         if not include_read:
-            count_query = count_query.where(Notification.is_read == False)
-        
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar()
-        
-        # Get paginated results
-        query = (
-            query.order_by(Notification.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            conditions.append(Notification.is_read == False)
+
+        unread_count = (
+            select(User.unread_notification_count)
+            .where(User.id == user_id)
+            .scalar_subquery()
         )
-        result = await self.db.execute(query)
-        notifications = result.scalars().all()
-        
-        # Get unread count
-        unread_result = await self.db.execute(
-            select(func.count()).where(
-                Notification.user_id == user_id,
-                Notification.is_read == False,
-            )
+        columns = [Notification, unread_count.label("unread_count")]
+        if cursor is None:
+            columns.append(func.count().over().label("total"))
+        query = paginate_newest_first(
+            select(*columns).where(*conditions),
+            Notification,
+            skip=offset,
+            limit=limit,
+            cursor=cursor,
         )
-        unread_count = unread_result.scalar()
-        
+        rows = (await self.db.execute(query)).all()
+
+        total = None
+        if rows:
+            unread = rows[0].unread_count
+            if cursor is None:
+                total = rows[0].total
+        else:
+            # Past the last page: no row to carry the counts
+            unread = await self.get_unread_count(user_id)
+            if cursor is None:
+                total = (await self.db.execute(select(func.count()).where(*conditions))).scalar()
+
+        notifications = [row[0] for row in rows]
         return {
-            "notifications": list(notifications),
-            "unread_count": unread_count,
+            "notifications": notifications,
+            "unread_count": unread or 0,
             "total": total,
+            "next_cursor": next_cursor(notifications, limit),
         }
     
     async def get_unread_count(self, user_id: UUID) -> int:
-        """Get unread notification count for a user."""
+        """Get unread notification count for a user (denormalized counter)."""
         result = await self.db.execute(
-            select(func.count()).where(
-                Notification.user_id == user_id,
-                Notification.is_read == False,
-            )
+            select(User.unread_notification_count).where(User.id == user_id)
         )
-        return result.scalar()
+        return result.scalar() or 0
     
     # ============== Mark as Read ==============
     
@@ -257,17 +758,27 @@ class NotificationService:
     ) -> bool:
         """Mark a single notification as read."""
         result = await self.db.execute(
-            select(Notification).where(
+            update(Notification)
+            .where(
                 Notification.id == notification_id,
                 Notification.user_id == user_id,
+                Notification.is_read == False,
             )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
         )
-        notification = result.scalar_one_or_none()
-        
-        if not notification:
-            raise HTTPException(status_code=404, detail="Notification not found")
-        
-        notification.is_read = True
+        if result.rowcount:
+            await self._adjust_unread([user_id], -result.rowcount)
+        else:
+            exists = await self.db.execute(
+                select(Notification.id).where(
+                    Notification.id == notification_id,
+                    Notification.user_id == user_id,
+                )
+            )
+            if exists.scalar_one_or_none() is None:
+                raise HTTPException(status_code=404, detail="Notification not found")
+
         await self.db.commit()
         return True
     
@@ -281,5 +792,80 @@ class NotificationService:
             )
             .values(is_read=True)
         )
+        if result.rowcount:
+            await self._adjust_unread([user_id], -result.rowcount)
+        await self.db.commit()
+        return result.rowcount
+    
+    # ============== Retention ==============
+    
+    async def enforce_retention(self, now: Optional[datetime] = None) -> int:
+        """
+        Remove notifications older than ``NOTIFICATION_RETENTION_MONTHS``.
+
+        On PostgreSQL this keeps monthly partitions created
+        ``NOTIFICATION_PARTITIONS_AHEAD`` months ahead. Each expired partition
+        is first archived to ``NOTIFICATION_ARCHIVE_DIR`` (if set) and its
+        unread rows are taken off the users' counters, reading the partition
+        directly while it is still attached; only then is it detached and
+        dropped in a short transaction of its own, so the lock on
+        ``notifications`` is held only for the detach. Other databases delete
+        the expired rows. Returns the number of partitions (or rows) removed.
+        """
+        cutoff = retention_cutoff(settings.NOTIFICATION_RETENTION_MONTHS, now)
+        if self.db.bind.dialect.name != "postgresql":
+            return await self._delete_expired(cutoff)
+
+        await ensure_monthly_partitions(
+            self.db, "notifications", settings.NOTIFICATION_PARTITIONS_AHEAD, now
+        )
+        await self.db.commit()
+
+        dropped = 0
+        for name, month in await list_monthly_partitions(self.db, "notifications"):
+            if add_months(month, 1) > cutoff.date():
+                break
+            if settings.NOTIFICATION_ARCHIVE_DIR:
+                await archive_partition(self.db, name, settings.NOTIFICATION_ARCHIVE_DIR)
+                await self.db.commit()
+
+            # Flipping the expired unread rows to read keeps a concurrent
+            # mark-as-read from taking them off the counter a second time.
+            result = await self.db.execute(
+                text(
+                    f"""
+                    WITH expired AS (
+                        UPDATE "{name}" SET is_read = true WHERE NOT is_read RETURNING user_id
+                    )
+                    UPDATE users
+                    SET unread_notification_count = GREATEST(users.unread_notification_count - expired_counts.unread, 0)
+                    FROM (
+                        SELECT user_id, COUNT(*) AS unread FROM expired GROUP BY user_id
+                    ) AS expired_counts
+                    WHERE users.id = expired_counts.user_id
+                    RETURNING users.id, users.unread_notification_count
+                    """
+                )
+            )
+            for user_id, count in result.all():
+                queue_user_event(self.db, user_id, "unread_count", {"count": count})
+            await self.db.commit()
+
+            await detach_partition(self.db, "notifications", name)
+            await drop_detached_partition(self.db, name)
+            await self.db.commit()
+            dropped += 1
+        return dropped
+
+    async def _delete_expired(self, cutoff: datetime) -> int:
+        expired = Notification.created_at < cutoff
+        unread = await self.db.execute(
+            select(Notification.user_id, func.count())
+            .where(expired, Notification.is_read == False)
+            .group_by(Notification.user_id)
+        )
+        for user_id, count in unread.all():
+            await self._adjust_unread([user_id], -count)
+        result = await self.db.execute(delete(Notification).where(expired))
         await self.db.commit()
         return result.rowcount
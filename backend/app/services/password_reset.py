@@ -13,7 +13,8 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import get_password_hash
+from app.core.principal import invalidate_principal_on_commit
+from app.core.security import get_password_hash_async
 from app.models.password_reset import PasswordResetToken
 from app.models.user import User
 
@@ -67,7 +68,7 @@ class PasswordResetService:
             return False
 
         token_row, user = row
-        user.password_hash = get_password_hash(new_password)
+        user.password_hash = await get_password_hash_async(new_password)
         user.current_refresh_jti = None
         token_row.used_at = now
 
@@ -79,6 +80,7 @@ class PasswordResetService:
             .values(used_at=now)
         )
         await self.db.flush()
+        await invalidate_principal_on_commit(self.db, user.id)
         return True
 
     async def _invalidate_user_tokens(self, user_id) -> None:
@@ -9,9 +9,11 @@ from uuid import UUID
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import and_, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.aggregates import filtered_counts
+from app.core.pagination import paginate_newest_first
 from app.models.pickup import PickupRequest
 from app.models.user import User
 from app.schemas.pickup import PickupCreate, PickupSchedule, PickupComplete, PickupReviewRequest
@@ -48,9 +50,10 @@ class PickupService:
         status: Optional[str] = None,
         requester_id: Optional[str] = None,
         assigned_to: Optional[str] = None,
-        pickup_type: Optional[str] = None
+        pickup_type: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[PickupRequest]:
-        """List pickup requests with filters."""
+        """List pickup requests with filters, newest first (offset or keyset `cursor`)."""
         query = select(PickupRequest)
         
         if status:
@@ -62,7 +65,7 @@ class PickupService:
         if pickup_type:
             query = query.where(PickupRequest.pickup_type == pickup_type)
         
-        query = query.offset(skip).limit(limit).order_by(PickupRequest.created_at.desc())
+        query = paginate_newest_first(query, PickupRequest, skip=skip, limit=limit, cursor=cursor)
         result = await self.db.execute(query)
         return list(result.scalars().all())
     
@@ -290,28 +293,16 @@ class PickupService:
     
     async def get_stats(self) -> dict:
         """Get pickup statistics."""
-        pending = await self.db.scalar(
-            select(func.count()).select_from(PickupRequest).where(PickupRequest.status == "pending")
+        return await filtered_counts(
+            self.db,
+            PickupRequest,
+            {
+                "pending": PickupRequest.status == "pending",
+                "scheduled": PickupRequest.status == "scheduled",
+                "in_progress": PickupRequest.status == "in_progress",
+                "completed_today": and_(
+                    PickupRequest.status == "completed",
+                    func.date(PickupRequest.completed_at) == func.date(func.now()),
+                ),
+            },
         )
-        
-        scheduled = await self.db.scalar(
-            select(func.count()).select_from(PickupRequest).where(PickupRequest.status == "scheduled")
-        )
-        
-        in_progress = await self.db.scalar(
-            select(func.count()).select_from(PickupRequest).where(PickupRequest.status == "in_progress")
-        )
-        
-        completed_today = await self.db.scalar(
-            select(func.count()).select_from(PickupRequest).where(
-                PickupRequest.status == "completed",
-                func.date(PickupRequest.completed_at) == func.date(func.now())
-            )
-        )
-        
-        return {
-            "pending": pending or 0,
-            "scheduled": scheduled or 0,
-            "in_progress": in_progress or 0,
-            "completed_today": completed_today or 0
-        }
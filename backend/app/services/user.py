@@ -5,12 +5,14 @@ User Service - Business logic for user management
 from typing import Optional, List
 from uuid import UUID
 from fastapi import HTTPException
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.core.principal import invalidate_principal_on_commit
+from app.core.search import apply_search, search_dialect
+from app.core.security import get_password_hash_async
 
 
 class UserService:
@@ -50,12 +52,7 @@ class UserService:
         query = select(User)
 
         if search:
-            query = query.where(
-                or_(
-                    User.full_name.ilike(f"%{search}%"),
-                    User.email.ilike(f"%{search}%")
-                )
-            )
+            query = apply_search(query, search_dialect(self.db), search, User.full_name, User.email)
 
         if role:
             query = query.where(User.role == role)
@@ -81,7 +78,7 @@ class UserService:
             interested_as_donatur=user_data.interested_as_donatur,
             interested_as_relawan=user_data.interested_as_relawan,
             wants_beneficiary_survey=user_data.wants_beneficiary_survey,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=await get_password_hash_async(user_data.password),
             avatar_url=user_data.avatar_url,
             role=role,
             is_active=True
@@ -107,14 +104,41 @@ class UserService:
         
         await self.db.flush()
         await self.db.refresh(user)
+        await invalidate_principal_on_commit(self.db, user.id)
         return user
     
     async def deactivate(self, user_id: str) -> bool:
         """Soft delete / deactivate user."""
+        user = await self.set_active(user_id, False)
+        return user is not None
+
+    async def set_active(self, user_id: str, is_active: bool) -> Optional[User]:
+        """Activate or deactivate a user."""
         user = await self.get_by_id(user_id)
         if not user:
-            return False
-        
-        user.is_active = False
+            return None
+
+        user.is_active = is_active
+        await self.db.flush()
+        await self.db.refresh(user)
+        await invalidate_principal_on_commit(self.db, user.id)
+        return user
+
+    async def set_role(self, user_id: str, role: str) -> Optional[User]:
+        """Change a user's role."""
+        user = await self.get_by_id(user_id)
+        if not user:
+            return None
+
+        user.role = role
+        await self.db.flush()
+        await self.db.refresh(user)
+        await invalidate_principal_on_commit(self.db, user.id)
+        return user
+
+    async def change_password(self, user: User, new_password: str) -> None:
+        """Set a new password and revoke the active refresh token."""
+        user.password_hash = await get_password_hash_async(new_password)
+        user.current_refresh_jti = None
         await self.db.flush()
-        return True
+        await invalidate_principal_on_commit(self.db, user.id)
@@ -2,21 +2,27 @@
 Scheduled Jobs for Phase 5
 Runs via Celery Beat or APScheduler
 """
+import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.events import flush_published_events
+from app.core.redis import close_redis
 from app.services.auction_service import AuctionService
-from app.services.notification_service import NotificationService
+from app.services.dashboard import DashboardService
+from app.services.notification_service import NotificationService, close_push_client
 
 logger = logging.getLogger(__name__)
 
 
 async def close_expired_auctions():
     """
-    Close expired auctions and determine winners.
+    Close expired auctions in batches and determine winners.
     Run every 5 minutes.
     """
     logger.info("Running job: close_expired_auctions")
@@ -24,7 +30,13 @@ async def close_expired_auctions():
     async with AsyncSessionLocal() as db:
         try:
             service = AuctionService(db)
-            closed_count = await service.close_expired_auctions()
+            batch_size = settings.AUCTION_CLOSE_BATCH_SIZE
+            closed_count = 0
+            while True:
+                closed = await service.close_expired_auctions(batch_size)
+                closed_count += closed
+                if closed < batch_size:
+                    break
             logger.info(f"Closed {closed_count} expired auctions")
         except Exception as e:
             logger.error(f"Error closing expired auctions: {e}")
@@ -112,6 +124,115 @@ async def expire_unpaid_donations():
             await db.rollback()
 
 
+async def refresh_dashboard_snapshots():
+    """
+    Recompute every /dashboard payload into the snapshot store.
+    Run every DASHBOARD_SNAPSHOT_REFRESH_SECONDS.
+    """
+    logger.info("Running job: refresh_dashboard_snapshots")
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            service = DashboardService(db)
+            refreshed = await service.refresh_all_snapshots()
+            logger.info(f"Refreshed {refreshed} dashboard snapshots")
+        except Exception as e:
+            logger.error(f"Error refreshing dashboard snapshots: {e}")
+            await db.rollback()
+
+
+async def drain_push_outbox():
+    """
+    Deliver queued push notifications in batches until none are due.
+    Run every PUSH_OUTBOX_DRAIN_SECONDS.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            service = NotificationService(db)
+            batch_size = settings.PUSH_OUTBOX_BATCH_SIZE
+            delivered = 0
+            while True:
+                claimed = await service.drain_push_outbox(batch_size)
+                delivered += claimed
+                if claimed < batch_size:
+                    break
+            if delivered:
+                logger.info(f"Processed {delivered} outbox push messages")
+        except Exception as e:
+            logger.error(f"Error draining push outbox: {e}")
+            await db.rollback()
+
+
+async def process_push_receipts():
+    """
+    Record Expo push receipts, prune unregistered device tokens and purge
+    finished outbox rows.
+    Run every PUSH_RECEIPT_CHECK_SECONDS.
+    """
+    logger.info("Running job: process_push_receipts")
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            service = NotificationService(db)
+            batch_size = settings.PUSH_RECEIPT_BATCH_SIZE
+            checked = 0
+            while True:
+                claimed = await service.process_push_receipts(batch_size)
+                checked += claimed
+                if claimed < batch_size:
+                    break
+            logger.info(f"Checked {checked} push receipts")
+
+            purged = 0
+            while True:
+                deleted = await service.purge_push_outbox(batch_size)
+                purged += deleted
+                if deleted < batch_size:
+                    break
+            logger.info(f"Purged {purged} finished outbox push messages")
+        except Exception as e:
+            logger.error(f"Error processing push receipts: {e}")
+            await db.rollback()
+
+
+async def enforce_notification_retention():
+    """
+    Create upcoming notification partitions and drop (or archive) expired ones.
+    Run once daily.
+    """
+    logger.info("Running job: enforce_notification_retention")
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            service = NotificationService(db)
+            removed = await service.enforce_retention()
+            logger.info(f"Removed {removed} expired notification partitions/rows")
+        except Exception as e:
+            logger.error(f"Error enforcing notification retention: {e}")
+            await db.rollback()
+
+
+def run_job(job: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run a job in a fresh event loop and release everything bound to that loop.
+
+    Stream events published after the job's commits are awaited first, as
+    the loop's remaining tasks are cancelled when it ends. Pooled asyncpg
+    connections and HTTP/Redis clients cannot be reused from the next task's
+    loop, so the engine pool is emptied and the clients are closed.
+    """
+    async def main() -> None:
+        try:
+            await job()
+        finally:
+            await flush_published_events()
+            await close_push_client()
+            await close_redis()
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
 # Celery task wrappers (for Celery integration)
 try:
     from celery import Celery
@@ -121,20 +242,37 @@ try:
     @celery_app.task
     def close_expired_auctions_task():
         """Celery task wrapper for close_expired_auctions."""
-        import asyncio
-        asyncio.run(close_expired_auctions())
+        run_job(close_expired_auctions)
     
     @celery_app.task
     def check_overdue_loans_task():
         """Celery task wrapper for check_overdue_loans."""
-        import asyncio
-        asyncio.run(check_overdue_loans())
+        run_job(check_overdue_loans)
     
     @celery_app.task
     def expire_unpaid_donations_task():
         """Celery task wrapper for expire_unpaid_donations."""
-        import asyncio
-        asyncio.run(expire_unpaid_donations())
+        run_job(expire_unpaid_donations)
+    
+    @celery_app.task
+    def refresh_dashboard_snapshots_task():
+        """Celery task wrapper for refresh_dashboard_snapshots."""
+        run_job(refresh_dashboard_snapshots)
+    
+    @celery_app.task
+    def drain_push_outbox_task():
+        """Celery task wrapper for drain_push_outbox."""
+        run_job(drain_push_outbox)
+    
+    @celery_app.task
+    def process_push_receipts_task():
+        """Celery task wrapper for process_push_receipts."""
+        run_job(process_push_receipts)
+    
+    @celery_app.task
+    def enforce_notification_retention_task():
+        """Celery task wrapper for enforce_notification_retention."""
+        run_job(enforce_notification_retention)
 
 except ImportError:
     # Celery not installed, skip task definitions
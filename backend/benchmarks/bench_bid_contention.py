@@ -0,0 +1,189 @@
+"""
+Benchmark: concurrent bidders on a single auction item.
+
+Seeds one open item and N bidders, then has every bidder place one bid at
+the same time, each on its own session and committing like the
+POST /auction/{id}/bid route. Compares the previous SELECT ... FOR UPDATE
+flow with the optimistic `AuctionService.place_bid` and reports outcomes,
+bid latency and how long the item row stayed locked per accepted bid.
+
+Runs against a temporary SQLite database by default, where all writers
+share one database lock; pass a PostgreSQL URL to measure row-lock
+contention (the database is reset: use a scratch database).
+Usage: python benchmarks/bench_bid_contention.py [bidders] [database_url]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import rate_limit
+from app.core.database import Base
+from app.models.auction import AuctionBid, AuctionItem
+from app.models.user import User
+from app.schemas.auction import AuctionBidCreate
+from app.services.auction_service import AuctionService
+
+START_PRICE = Decimal("100000")
+INCREMENT = Decimal("5000")
+
+
+async def locked_place_bid(db: AsyncSession, item_id, bidder_id, amount: Decimal, lock_started: list) -> None:
+    """The pre-optimistic flow: lock the item, look up the top bid, insert, notify."""
+    result = await db.execute(select(AuctionItem).where(AuctionItem.id == item_id).with_for_update())
+    lock_started.append(time.perf_counter())
+    item = result.scalar_one()
+    min_bid = item.current_price + item.min_increment
+    if amount < min_bid:
+        raise HTTPException(status_code=400, detail=f"Bid minimal Rp {min_bid:,.0f}")
+
+    prev_bid = (await db.execute(
+        select(AuctionBid)
+        .where(AuctionBid.auction_item_id == item_id, AuctionBid.status.in_(["pending", "approved"]))
+        .order_by(AuctionBid.amount.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+
+    db.add(AuctionBid(auction_item_id=item_id, bidder_id=bidder_id, amount=amount, status="pending"))
+    item.current_price = amount
+    item.status = "bidding"
+    await db.flush()
+
+    if prev_bid and prev_bid.bidder_id != bidder_id:
+        await AuctionService(db).notification_service.create_notification(
+            user_id=prev_bid.bidder_id,
+            title="Tawaran Anda Dilewati",
+            body=f"Ada tawaran lebih tinggi untuk '{item.title}'.",
+            type="auction_outbid",
+            reference_type="auction",
+            reference_id=item_id,
+        )
+
+
+async def optimistic_place_bid(db: AsyncSession, item_id, bidder_id, amount: Decimal, lock_started: list) -> None:
+    service = AuctionService(db)
+    execute = db.execute
+
+    async def timed_execute(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        if statement.is_dml and statement.table.name == AuctionItem.__tablename__:
+            lock_started.append(time.perf_counter())  # the item row is locked from the UPDATE on
+        return result
+
+    db.execute = timed_execute
+    await service.place_bid(item_id, bidder_id, AuctionBidCreate(amount=amount))
+
+
+async def setup(engine, bidders: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    user_ids = [uuid.uuid4() for _ in range(bidders + 1)]
+    item_id = uuid.uuid4()
+    async with session_factory() as session:
+        await session.execute(insert(User), [
+            {"id": user_id, "full_name": f"User {i}", "email": f"bidder{i}@example.com",
+             "password_hash": "x", "role": "sahabat", "is_active": True}
+            for i, user_id in enumerate(user_ids)
+        ])
+        await session.execute(insert(AuctionItem), [{
+            "id": item_id, "title": "Kursi roda", "starting_price": START_PRICE, "current_price": START_PRICE,
+            "min_increment": INCREMENT, "donor_id": user_ids[0], "status": "ready",
+        }])
+        await session.commit()
+    return session_factory, item_id, user_ids[1:]
+
+
+async def run(engine, bidders: int, place_bid) -> dict:
+    session_factory, item_id, bidder_ids = await setup(engine, bidders)
+    # Every bidder offers a distinct amount, arriving in random order.
+    amounts = [START_PRICE + INCREMENT * (i + 1) for i in range(bidders)]
+    random.Random(42).shuffle(amounts)
+    outcomes = {"accepted": 0, "too_low": 0, "conflict": 0, "error": 0}
+    latencies, lock_holds = [], []
+    start_gate = asyncio.Event()
+
+    async def bidder(bidder_id, amount):
+        await start_gate.wait()
+        lock_started = []
+        started = time.perf_counter()
+        async with session_factory() as session:
+            try:
+                await place_bid(session, item_id, bidder_id, amount, lock_started)
+                await session.commit()
+                if lock_started:
+                    lock_holds.append(time.perf_counter() - lock_started[-1])
+                # Like the route: queued outbid notifications go out after the bid commits
+                await AuctionService(session).send_outbid_notifications()
+                await session.commit()
+                outcomes["accepted"] += 1
+            except HTTPException as exc:
+                await session.rollback()
+                outcomes["conflict" if exc.status_code == 409 else "too_low"] += 1
+            except Exception:
+                await session.rollback()
+                outcomes["error"] += 1
+        latencies.append(time.perf_counter() - started)
+
+    tasks = [asyncio.create_task(bidder(b, a)) for b, a in zip(bidder_ids, amounts)]
+    started = time.perf_counter()
+    start_gate.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        final_price = (await session.execute(
+            select(AuctionItem.current_price).where(AuctionItem.id == item_id)
+        )).scalar_one()
+
+    latencies.sort()
+    return {
+        **outcomes,
+        "seconds": elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(len(latencies) * 0.99) - 1],
+        "lock_ms": 1000 * statistics.mean(lock_holds) if lock_holds else 0.0,
+        "final_price": final_price,
+    }
+
+
+async def main(bidders: int, database_url: str) -> None:
+    # Outbid pushes go through the coalescing limiter; keep it in-process.
+    rate_limit.get_redis = lambda: None
+    if database_url.startswith("sqlite"):
+        engine = create_async_engine(database_url, connect_args={"timeout": 30})
+    else:
+        engine = create_async_engine(database_url, pool_size=20, max_overflow=bidders)
+
+    print(f"{'mode':>10} {'accepted':>8} {'too low':>8} {'conflict':>8} {'error':>6} "
+          f"{'seconds':>8} {'p50 ms':>8} {'p99 ms':>8} {'lock ms':>8} {'final price':>12}")
+    for mode, place_bid in (("locked", locked_place_bid), ("optimistic", optimistic_place_bid)):
+        r = await run(engine, bidders, place_bid)
+        print(f"{mode:>10} {r['accepted']:>8} {r['too_low']:>8} {r['conflict']:>8} {r['error']:>6} "
+              f"{r['seconds']:>8.2f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['lock_ms']:>8.2f} "
+              f"{r['final_price']:>12,.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    bidders = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    url = sys.argv[2] if len(sys.argv) > 2 else (
+        f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bids.db')}"
+    )
+    asyncio.run(main(bidders, url))
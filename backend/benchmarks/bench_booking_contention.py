@@ -0,0 +1,168 @@
+"""
+Benchmark: concurrent bookers on different dates.
+
+Seeds a history of completed bookings and N requesters, then has every
+requester book one slot at the same time, each on its own session and
+committing like the POST /bookings route. Requesters spread over the
+bookable dates, so no two bookings conflict. Compares the previous lock,
+``SELECT ... FOR UPDATE`` over every active booking up to the last selected
+date (which serializes all bookings), with the per-date advisory locks
+taken by `BookingService.create_booking`.
+
+Runs against a temporary SQLite database by default, where all writers
+share one database lock and neither lock applies; pass a PostgreSQL URL to
+measure lock contention (the database is reset: use a scratch database).
+Usage: python benchmarks/bench_booking_contention.py [bookers] [database_url]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.booking import MovingBooking
+from app.models.user import User
+from app.schemas.booking import BookingCreate
+from app.services import booking as booking_service
+from app.services.booking import ALLOWED_SLOTS, MAX_ADVANCE_DAYS, BookingService
+
+HISTORY_BOOKINGS = 2000
+
+
+def booking_request(index: int) -> BookingCreate:
+    """Booker `index` takes its own (date, slot): dates first, then the next slot."""
+    booking_date = date.today() + timedelta(days=index % MAX_ADVANCE_DAYS + 1)
+    time_slot = ALLOWED_SLOTS[index // MAX_ADVANCE_DAYS % len(ALLOWED_SLOTS)]
+    return BookingCreate(
+        booking_date=booking_date,
+        booking_dates=[booking_date],
+        time_slot=time_slot,
+        time_slots=[time_slot],
+        pickup_address="Jl. Merdeka 1",
+        dropoff_address="RS Sehat",
+        purpose="Kontrol rutin",
+    )
+
+
+async def range_locked_create(db: AsyncSession, data: BookingCreate, requester_id) -> None:
+    """The previous flow: lock every active booking up to the last date, then book."""
+    await db.execute(
+        select(MovingBooking.id)
+        .where(
+            MovingBooking.booking_date <= max(data.booking_dates),
+            MovingBooking.status.notin_(["rejected", "cancelled"]),
+        )
+        .with_for_update()
+    )
+    await BookingService(db).create_booking(data, requester_id, "Pemesan", "0812")
+
+
+async def date_locked_create(db: AsyncSession, data: BookingCreate, requester_id) -> None:
+    await BookingService(db).create_booking(data, requester_id, "Pemesan", "0812")
+
+
+async def no_date_locks(*args, **kwargs) -> None:
+    return None
+
+
+async def setup(engine, bookers: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    user_ids = [uuid.uuid4() for _ in range(bookers)]
+    async with session_factory() as session:
+        await session.execute(insert(User), [
+            {"id": user_id, "full_name": f"User {i}", "email": f"booker{i}@example.com",
+             "password_hash": "x", "role": "sahabat", "is_active": True}
+            for i, user_id in enumerate(user_ids)
+        ])
+        # Completed trips in the past: all fall inside the old lock range.
+        await session.execute(insert(MovingBooking), [
+            {"booking_code": f"HIST{i:06d}", "booking_date": date.today() - timedelta(days=i % 365 + 1),
+             "time_slot": ALLOWED_SLOTS[i % len(ALLOWED_SLOTS)], "requester_id": user_ids[i % bookers],
+             "requester_name": "Pemesan", "requester_phone": "0812", "pickup_address": "Jl. Merdeka 1",
+             "dropoff_address": "RS Sehat", "status": "completed"}
+            for i in range(HISTORY_BOOKINGS)
+        ])
+        await session.commit()
+    return session_factory, user_ids
+
+
+async def run(engine, bookers: int, create) -> dict:
+    session_factory, user_ids = await setup(engine, bookers)
+    outcomes = {"booked": 0, "conflict": 0, "error": 0}
+    latencies = []
+    start_gate = asyncio.Event()
+
+    async def booker(index, requester_id):
+        await start_gate.wait()
+        started = time.perf_counter()
+        async with session_factory() as session:
+            try:
+                await create(session, booking_request(index), requester_id)
+                await session.commit()
+                outcomes["booked"] += 1
+            except HTTPException:
+                await session.rollback()
+                outcomes["conflict"] += 1
+            except Exception:
+                await session.rollback()
+                outcomes["error"] += 1
+        latencies.append(time.perf_counter() - started)
+
+    tasks = [asyncio.create_task(booker(i, user_id)) for i, user_id in enumerate(user_ids)]
+    started = time.perf_counter()
+    start_gate.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        **outcomes,
+        "seconds": elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+    }
+
+
+async def main(bookers: int, database_url: str) -> None:
+    if database_url.startswith("sqlite"):
+        engine = create_async_engine(database_url, connect_args={"timeout": 30})
+    else:
+        engine = create_async_engine(database_url, pool_size=20, max_overflow=bookers)
+
+    print(f"{'mode':>11} {'booked':>7} {'conflict':>8} {'error':>6} {'seconds':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    date_locks = booking_service.advisory_xact_locks
+    for mode, create, locks in (
+        ("range lock", range_locked_create, no_date_locks),
+        ("date locks", date_locked_create, date_locks),
+    ):
+        booking_service.advisory_xact_locks = locks
+        r = await run(engine, bookers, create)
+        print(f"{mode:>11} {r['booked']:>7} {r['conflict']:>8} {r['error']:>6} "
+              f"{r['seconds']:>8.2f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+    booking_service.advisory_xact_locks = date_locks
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    bookers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    url = sys.argv[2] if len(sys.argv) > 2 else (
+        f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bookings.db')}"
+    )
+    asyncio.run(main(bookers, url))
@@ -0,0 +1,125 @@
+"""
+Load test: latency of unrelated endpoints during a login storm.
+
+Runs the app in-process (one event loop, like one uvicorn worker) against a
+temporary SQLite database, fires concurrent logins and polls /health at the
+same time. Compares bcrypt run inline on the loop with the hashing pool.
+Usage: python benchmarks/bench_login_storm.py [logins] [concurrency]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.auth import routes as auth_routes
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.core.security import get_password_hash, password_hash_pool, verify_password
+from app.main import app
+from app.models.user import User
+
+EMAIL = "storm@example.com"
+PASSWORD = "password123"
+POLL_INTERVAL_SECONDS = 0.01
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return verify_password(plain_password, hashed_password)
+
+
+async def _no_rate_limit(*args, **kwargs) -> None:
+    return None
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def storm(client: AsyncClient, logins: int, concurrency: int) -> dict:
+    latencies = []
+    done = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            assert response.status_code == 200, response.text
+
+    async def poll_health():
+        # Fixed schedule: latency is measured from when the request was due,
+        # so time spent stuck behind a blocked loop is counted.
+        due = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/health")
+            latencies.append((time.perf_counter() - due) * 1000)
+            due += POLL_INTERVAL_SECONDS
+
+    poller = asyncio.create_task(poll_health())
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await poller
+
+    return {
+        "logins_per_s": logins / elapsed,
+        "health_p50_ms": statistics.median(latencies),
+        "health_p99_ms": _percentile(latencies, 0.99),
+        "health_max_ms": max(latencies),
+        "health_samples": len(latencies),
+    }
+
+
+async def main(logins: int, concurrency: int) -> None:
+    settings.REDIS_CACHE_ENABLED = False
+    auth_routes.enforce_rate_limit = _no_rate_limit
+
+    db_path = os.path.join(tempfile.mkdtemp(), "storm.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(User(full_name="Storm", email=EMAIL, password_hash=get_password_hash(PASSWORD), role="sahabat"))
+        await session.commit()
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    offloaded_verify = auth_routes.verify_password_async
+
+    print(f"{logins} logins, {concurrency} concurrent, {settings.PASSWORD_HASH_WORKERS} hash workers")
+    print(f"{'mode':>10} {'logins/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'samples':>8}")
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        for mode, verify in (("inline", _inline_verify), ("pool", offloaded_verify)):
+            auth_routes.verify_password_async = verify
+            result = await storm(client, logins, concurrency)
+            print(
+                f"{mode:>10} {result['logins_per_s']:>9.1f} {result['health_p50_ms']:>8.1f} "
+                f"{result['health_p99_ms']:>8.1f} {result['health_max_ms']:>8.1f} {result['health_samples']:>8}"
+            )
+    print(f"pool stats: {password_hash_pool.stats()}")
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    ))
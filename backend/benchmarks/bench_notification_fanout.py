@@ -0,0 +1,139 @@
+"""
+Benchmark: notification fan-out to many users against a local Expo stub.
+
+Starts an Expo-compatible push endpoint on localhost, seeds a temporary
+SQLite database with users and push tokens, then compares the per-recipient
+loop (`create_notification` for each user) with `create_bulk_notifications`.
+Both only queue pushes in the outbox; `drain` is the time the outbox drain
+then takes to deliver them.
+Usage: python benchmarks/bench_notification_fanout.py [users] [loop_users]
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.notification import PushToken
+from app.models.user import User
+from app.services.notification_service import NotificationService
+
+STUB_STATS = {"requests": 0, "messages": 0}
+
+
+async def expo_stub(scope, receive, send):
+    """Minimal ASGI app answering like Expo's /push/send."""
+    if scope["type"] != "http":
+        return
+    body = b""
+    while True:
+        event = await receive()
+        body += event.get("body", b"")
+        if not event.get("more_body"):
+            break
+    messages = json.loads(body or b"[]")
+    STUB_STATS["requests"] += 1
+    STUB_STATS["messages"] += len(messages)
+    payload = json.dumps({"data": [{"status": "ok", "id": str(uuid.uuid4())} for _ in messages]}).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": payload})
+
+
+def start_stub() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    server = uvicorn.Server(uvicorn.Config(expo_stub, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/--/api/v2/push/send"
+
+
+async def seed(session_factory, users: int) -> list:
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    async with session_factory() as session:
+        await session.execute(insert(User), [
+            {"id": user_id, "full_name": f"User {i}", "email": f"user{i}@example.com",
+             "password_hash": "x", "role": "sahabat", "is_active": True}
+            for i, user_id in enumerate(user_ids)
+        ])
+        await session.execute(insert(PushToken), [
+            {"user_id": user_id, "token": f"ExponentPushToken[{i}]", "device_type": "android"}
+            for i, user_id in enumerate(user_ids)
+        ])
+        await session.commit()
+    return user_ids
+
+
+def _reset_stub() -> None:
+    STUB_STATS.update(requests=0, messages=0)
+
+
+async def main(users: int, loop_users: int) -> None:
+    settings.EXPO_PUSH_URL = start_stub()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "fanout.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    user_ids = await seed(session_factory, users)
+
+    print(f"{'mode':>6} {'recipients':>11} {'seconds':>9} {'ms/recipient':>13} {'drain s':>8} {'expo requests':>14}")
+
+    async def drain() -> float:
+        started = time.perf_counter()
+        async with session_factory() as session:
+            while await NotificationService(session).drain_push_outbox():
+                pass
+        return time.perf_counter() - started
+
+    _reset_stub()
+    async with session_factory() as session:
+        service = NotificationService(session)
+        started = time.perf_counter()
+        for user_id in user_ids[:loop_users]:
+            await service.create_notification(user_id=user_id, title="Info", body="Loop fan-out", type="system")
+        await session.commit()
+        elapsed = time.perf_counter() - started
+    drained = await drain()
+    print(f"{'loop':>6} {loop_users:>11,} {elapsed:>9.2f} {1000 * elapsed / loop_users:>13.3f} "
+          f"{drained:>8.2f} {STUB_STATS['requests']:>14,}")
+
+    _reset_stub()
+    async with session_factory() as session:
+        started = time.perf_counter()
+        await NotificationService(session).create_bulk_notifications(
+            user_ids=user_ids, title="Info", body="Bulk fan-out", type="system"
+        )
+        await session.commit()
+        elapsed = time.perf_counter() - started
+    drained = await drain()
+    print(f"{'bulk':>6} {users:>11,} {elapsed:>9.2f} {1000 * elapsed / users:>13.3f} "
+          f"{drained:>8.2f} {STUB_STATS['requests']:>14,}")
+    assert STUB_STATS["messages"] == users
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000,
+    ))
@@ -0,0 +1,44 @@
+"""
+Microbenchmark: memory of the in-process rate limiter under distinct keys.
+
+Simulates credential stuffing (one login attempt per never-seen email) and
+reports traced memory of the limiter state as the number of keys grows.
+Usage: python benchmarks/bench_rate_limit_memory.py [total_keys]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import rate_limit
+from app.core.config import settings
+
+
+def run(total_keys: int) -> None:
+    checkpoints = {total_keys * step // 10 for step in range(1, 11)}
+    rate_limit._RATE_STATE.clear()
+
+    print(f"cap: {settings.RATE_LIMIT_LOCAL_MAX_KEYS:,} keys")
+    print(f"{'keys seen':>12} {'keys held':>12} {'memory (MiB)':>14}")
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+
+    for i in range(1, total_keys + 1):
+        rate_limit._allow_local(f"auth:login:email:user{i}@example.com", max_requests=10, window_seconds=60)
+        if i in checkpoints:
+            current = tracemalloc.get_traced_memory()[0] - baseline
+            print(f"{i:>12,} {len(rate_limit._RATE_STATE):>12,} {current / 2**20:>14.1f}")
+
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+    print(f"{total_keys / elapsed:,.0f} calls/s (under tracemalloc)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
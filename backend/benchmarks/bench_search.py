@@ -0,0 +1,136 @@
+"""
+Benchmark: user search on a large synthetic user table.
+
+Seeds N users with generated Indonesian names, then times the admin user
+list search (`UserService.list(search=...)`, 20 rows) for a set of terms:
+the previous unranked ``ILIKE '%term%'`` filter against `app.core.search`.
+
+Runs against a temporary SQLite database by default, where both are table
+scans (the LIKE fallback); pass a PostgreSQL URL to compare a sequential
+scan with the pg_trgm GIN indexes (the database is reset: use a scratch
+database with the pg_trgm extension available).
+Usage: python benchmarks/bench_search.py [users] [database_url]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.user import User
+from app.services.user import UserService
+
+FIRST_NAMES = ["Ahmad", "Budi", "Siti", "Dewi", "Rizky", "Fauzan", "Nur", "Putri", "Agus", "Indah",
+               "Hendra", "Wulan", "Yusuf", "Ratna", "Dimas", "Ayu", "Fajar", "Lestari", "Bayu", "Rahmat"]
+LAST_NAMES = ["Saputra", "Wijaya", "Santoso", "Hidayat", "Kurniawan", "Pratama", "Nugroho", "Lubis",
+              "Siregar", "Hasibuan", "Setiawan", "Rahmawati", "Sulistyo", "Permana", "Halim"]
+# Common name, rare surname fragment, email fragment, no match
+TERMS = ["ahmad", "hasibu", "user12345", "zzqx"]
+SEED_CHUNK = 10_000
+REPEATS = 5
+
+
+async def seed(engine, users: int) -> None:
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(7)
+    for start in range(0, users, SEED_CHUNK):
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), [
+                {
+                    "id": uuid.uuid4(),
+                    "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+                    "email": f"user{i}@example.com",
+                    "password_hash": "x",
+                    "role": "sahabat",
+                    "is_active": True,
+                }
+                for i in range(start, min(start + SEED_CHUNK, users))
+            ])
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+
+async def legacy_search(db: AsyncSession, term: str) -> list:
+    result = await db.execute(
+        select(User)
+        .where(or_(User.full_name.ilike(f"%{term}%"), User.email.ilike(f"%{term}%")))
+        .limit(20)
+    )
+    return list(result.scalars().all())
+
+
+async def ranked_search(db: AsyncSession, term: str) -> list:
+    return await UserService(db).list(search=term, limit=20)
+
+
+async def time_search(session_factory, search, term: str) -> tuple:
+    timings = []
+    for _ in range(REPEATS):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            rows = await search(session, term)
+            timings.append(time.perf_counter() - started)
+    return 1000 * statistics.median(timings), len(rows)
+
+
+async def set_trigram_indexes(engine, present: bool) -> None:
+    indexes = [
+        index for index in User.__table__.indexes
+        if index.dialect_options["postgresql"]["using"] == "gin"
+    ]
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn, index=index: (
+                index.create(sync_conn, checkfirst=True) if present else index.drop(sync_conn, checkfirst=True)
+            ))
+
+
+async def main(users: int, database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    started = time.perf_counter()
+    await seed(engine, users)
+    print(f"Seeded {users:,} users in {time.perf_counter() - started:.1f}s ({engine.dialect.name})")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    modes = [("ilike", legacy_search), ("search", ranked_search)]
+    if engine.dialect.name == "postgresql":
+        await set_trigram_indexes(engine, present=False)
+        modes = [("ilike seq", legacy_search)]
+        results = {term: [await time_search(session_factory, legacy_search, term)] for term in TERMS}
+        await set_trigram_indexes(engine, present=True)
+        modes += [("ilike trgm", legacy_search), ("search", ranked_search)]
+        for term in TERMS:
+            for _, search in modes[1:]:
+                results[term].append(await time_search(session_factory, search, term))
+    else:
+        results = {term: [await time_search(session_factory, search, term) for _, search in modes] for term in TERMS}
+
+    print(f"{'term':>10} " + " ".join(f"{mode + ' ms':>14} {'rows':>5}" for mode, _ in modes))
+    for term, timings in results.items():
+        print(f"{term:>10} " + " ".join(f"{ms:>14.1f} {rows:>5}" for ms, rows in timings))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    url = sys.argv[2] if len(sys.argv) > 2 else (
+        f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'search.db')}"
+    )
+    asyncio.run(main(users, url))
@@ -0,0 +1,144 @@
+"""
+Test aggregate query helpers
+"""
+
+import asyncio
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from app.core.aggregates import (
+    bucket_starts,
+    count_if,
+    fan_out,
+    filtered_counts,
+    time_bucket_series,
+)
+from app.models.donation import Donation
+
+
+def _donation(code: str, amount: str, created_at: datetime, status: str = "paid") -> Donation:
+    return Donation(
+        donation_code=code,
+        donor_name="Hamba Allah",
+        amount=Decimal(amount),
+        donation_type="infaq",
+        payment_method="transfer",
+        payment_status=status,
+        created_at=created_at,
+    )
+
+
+def test_bucket_starts_cross_year():
+    """Monthly buckets roll back over year boundaries."""
+    starts = bucket_starts("month", 3, today=date(2026, 2, 14))
+    assert starts == [date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)]
+
+
+def test_bucket_starts_weeks_start_on_monday():
+    """Weekly buckets are aligned to ISO weeks."""
+    starts = bucket_starts("week", 2, today=date(2026, 2, 15))  # Sunday
+    assert starts == [date(2026, 2, 2), date(2026, 2, 9)]
+
+
+@pytest.mark.asyncio
+async def test_time_bucket_series_zero_fills(db_session):
+    """Months without rows are reported as zero, filtered rows are excluded."""
+    db_session.add_all([
+        _donation("CKY-A", "10000", datetime(2026, 1, 5, tzinfo=timezone.utc)),
+        _donation("CKY-B", "5000", datetime(2026, 1, 20, tzinfo=timezone.utc)),
+        _donation("CKY-C", "7000", datetime(2026, 3, 2, tzinfo=timezone.utc)),
+        _donation("CKY-D", "9000", datetime(2026, 3, 3, tzinfo=timezone.utc), status="pending"),
+        _donation("CKY-E", "1000", datetime(2025, 6, 1, tzinfo=timezone.utc)),
+    ])
+    await db_session.flush()
+
+    series = await time_bucket_series(
+        db_session,
+        Donation.created_at,
+        func.sum(Donation.amount),
+        unit="month",
+        periods=3,
+        filters=[Donation.payment_status == "paid"],
+        today=date(2026, 3, 10),
+    )
+
+    assert [start for start, _ in series] == [date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)]
+    assert [Decimal(str(total)) for _, total in series] == [Decimal("15000"), Decimal("0"), Decimal("7000")]
+
+
+def test_count_if_renders_filter_clause_on_postgresql():
+    """PostgreSQL gets COUNT(*) FILTER, other dialects a SUM(CASE) fallback."""
+    condition = Donation.payment_status == "paid"
+    pg_sql = str(count_if(condition, "postgresql").compile(dialect=postgresql.dialect()))
+    assert "FILTER (WHERE" in pg_sql
+    assert "CASE WHEN" in str(count_if(condition, "sqlite"))
+
+
+@pytest.mark.asyncio
+async def test_filtered_counts_single_scan(db_session):
+    """All counters come back from one row, empty matches count as zero."""
+    now = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    db_session.add_all([
+        _donation("CKY-A", "10000", now),
+        _donation("CKY-B", "5000", now),
+        _donation("CKY-C", "7000", now, status="pending"),
+    ])
+    await db_session.flush()
+
+    counts = await filtered_counts(
+        db_session,
+        Donation,
+        {
+            "total": None,
+            "paid": Donation.payment_status == "paid",
+            "refunded": Donation.payment_status == "refunded",
+        },
+        extra={"amount": func.sum(Donation.amount)},
+    )
+
+    assert counts["total"] == 3
+    assert counts["paid"] == 2
+    assert counts["refunded"] == 0
+    assert Decimal(str(counts["amount"])) == Decimal("22000")
+
+
+@pytest.mark.asyncio
+async def test_fan_out_sqlite_runs_on_request_session(db_session):
+    """Without fan-out, jobs share the request session and see its pending rows."""
+    db_session.add(_donation("CKY-A", "10000", datetime(2026, 1, 5, tzinfo=timezone.utc)))
+    await db_session.flush()
+
+    async def donation_count(session):
+        return (await session.execute(select(func.count(Donation.id)))).scalar_one()
+
+    results = await fan_out(db_session, {"a": donation_count, "b": donation_count}, limit=2)
+
+    assert results == {"a": 1, "b": 1}
+
+
+@pytest.mark.asyncio
+async def test_fan_out_caps_concurrency(db_session):
+    """Jobs run on their own sessions, never more than `limit` at once."""
+    in_flight = 0
+    peak = 0
+    sessions = set()
+
+    async def job(session):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        sessions.add(id(session))
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return (await session.execute(select(func.count(Donation.id)))).scalar_one()
+
+    jobs = {f"job{i}": job for i in range(5)}
+    results = await fan_out(db_session, jobs, limit=2, concurrent=True)
+
+    assert results == {name: 0 for name in jobs}
+    assert peak == 2
+    assert id(db_session) not in sessions
@@ -0,0 +1,310 @@
+"""
+Test auction bidding
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.api.v1.auction.routes import auction_price_events
+from app.core import events
+from app.core.events import LocalEventBroker, StreamEvent
+from app.core.pagination import next_cursor
+from app.models.auction import AuctionBid, AuctionItem
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.auction import AuctionBidCreate
+from app.services.auction_service import AuctionService
+
+
+@pytest_asyncio.fixture
+async def auction(db_session):
+    """An open auction item and three users who can bid on it."""
+    donor, alice, budi = (
+        User(full_name=name, email=f"{name.lower()}@example.com", password_hash="x")
+        for name in ("Donatur", "Alice", "Budi")
+    )
+    db_session.add_all([donor, alice, budi])
+    await db_session.flush()
+    item = AuctionItem(
+        title="Kursi roda",
+        starting_price=Decimal("100000"),
+        current_price=Decimal("100000"),
+        min_increment=Decimal("5000"),
+        donor_id=donor.id,
+        status="ready",
+    )
+    db_session.add(item)
+    await db_session.flush()
+    return item, donor, alice, budi
+
+
+def _bid(amount):
+    return AuctionBidCreate(amount=Decimal(amount))
+
+
+@pytest.mark.asyncio
+async def test_bids_claim_price_and_notify_previous_bidder(db_session, auction):
+    """Each accepted bid moves the price, the version and the tracked top bidder."""
+    item, _, alice, budi = auction
+    service = AuctionService(db_session)
+
+    await service.place_bid(item.id, alice.id, _bid("105000"))
+    await service.place_bid(item.id, budi.id, _bid("120000"))
+    await service.place_bid(item.id, budi.id, _bid("125000"))  # raising own bid: no self-notification
+    # Notifications wait for the bids to commit
+    assert (await db_session.execute(select(Notification))).scalars().all() == []
+    await db_session.commit()
+    assert await service.send_outbid_notifications() == 1
+
+    item = await service.get_item(item.id)
+    assert (item.current_price, item.status, item.highest_bidder_id, item.version, item.bid_count) == (
+        Decimal("125000"), "bidding", budi.id, 3, 3
+    )
+    bids = (await db_session.execute(select(AuctionBid).order_by(AuctionBid.amount))).scalars().all()
+    assert len(bids) == 3
+    assert item.highest_bid_id == bids[-1].id
+    outbid = (await db_session.execute(select(Notification))).scalars().all()
+    assert [(n.user_id, n.type) for n in outbid] == [(alice.id, "auction_outbid")]
+
+
+@pytest.mark.asyncio
+async def test_invalid_bids_leave_item_untouched(db_session, auction):
+    """Too-low bids and bids by the donor are rejected before anything is written."""
+    item, donor, alice, _ = auction
+    service = AuctionService(db_session)
+
+    with pytest.raises(HTTPException) as too_low:
+        await service.place_bid(item.id, alice.id, _bid("104999"))
+    assert too_low.value.status_code == 400
+
+    with pytest.raises(HTTPException) as own_item:
+        await service.place_bid(item.id, donor.id, _bid("200000"))
+    assert own_item.value.status_code == 400
+
+    item = await service.get_item(item.id)
+    assert (item.current_price, item.version, item.highest_bidder_id, item.bid_count) == (
+        Decimal("100000"), 0, None, 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_approval_and_list_use_bid_summary(db_session, auction):
+    """Approving a bid moves the summary to it; list views read the summary without loading bids."""
+    item, _, alice, budi = auction
+    service = AuctionService(db_session)
+    first = await service.place_bid(item.id, alice.id, _bid("105000"))
+    await service.place_bid(item.id, budi.id, _bid("110000"))
+
+    item = await service.approve_bid(item.id, first.id, budi.id)
+    assert (item.highest_bid_id, item.highest_bidder_id, item.current_price, item.bid_count) == (
+        first.id, alice.id, Decimal("105000"), 2
+    )
+
+    db_session.expunge_all()
+    items, total = await service.list_items()
+    assert total == 1 and items[0].bid_count == 2
+    assert "bids" not in items[0].__dict__
+
+
+@pytest.mark.asyncio
+async def test_bid_ranking_and_history(db_session, auction):
+    """The detail view gets the top bids, the caller's best bid and the leader from SQL; history pages by cursor."""
+    item, donor, alice, budi = auction
+    service = AuctionService(db_session)
+    for bidder, amount in ((alice, "105000"), (budi, "110000"), (alice, "120000"), (budi, "130000")):
+        await service.place_bid(item.id, bidder.id, _bid(amount))
+    bids = (await db_session.execute(select(AuctionBid).order_by(AuctionBid.amount))).scalars().all()
+    for minutes, bid in enumerate(bids):  # distinct timestamps; SQLite stores whole seconds
+        bid.created_at = datetime(2026, 10, 1, 12, minutes, tzinfo=timezone.utc)
+    await db_session.flush()
+
+    top, my_max_bid, leads = await service.get_bid_ranking(item.id, alice.id, limit=3)
+    assert [(bid.amount, name) for bid, name in top] == [
+        (Decimal("130000"), "Budi"), (Decimal("120000"), "Alice"), (Decimal("110000"), "Budi")
+    ]
+    assert (my_max_bid, leads) == (Decimal("120000"), False)
+    assert (await service.get_bid_ranking(item.id, budi.id))[1:] == (Decimal("130000"), True)
+    assert await service.get_bid_ranking(item.id, donor.id) == (top + [(bids[0], "Alice")], None, False)
+
+    first_page = await service.list_bids(item.id, limit=3)
+    assert [bid.amount for bid, _ in first_page] == [Decimal("130000"), Decimal("120000"), Decimal("110000")]
+    rest = await service.list_bids(item.id, limit=3, cursor=next_cursor([bid for bid, _ in first_page], 3))
+    assert [(bid.amount, name) for bid, name in rest] == [(Decimal("105000"), "Alice")]
+
+
+@pytest.mark.asyncio
+async def test_sweeper_closes_expired_auctions_in_batches(db_session, auction):
+    """Expired items go to their highest pending bidder or are cancelled; others are left alone."""
+    item, donor, alice, budi = auction
+    service = AuctionService(db_session)
+    now = datetime.now(timezone.utc)
+
+    def new_item(title, end_time):
+        return AuctionItem(
+            title=title, starting_price=Decimal("100000"), current_price=Decimal("100000"),
+            min_increment=Decimal("5000"), donor_id=donor.id, status="ready", end_time=end_time,
+        )
+
+    unsold, running = new_item("Lemari", now - timedelta(minutes=1)), new_item("Meja", now + timedelta(hours=1))
+    db_session.add_all([unsold, running])
+    await db_session.flush()
+    await service.place_bid(item.id, alice.id, _bid("105000"))
+    winning = await service.place_bid(item.id, budi.id, _bid("110000"))
+    await service.place_bid(running.id, alice.id, _bid("105000"))
+    item.end_time = now - timedelta(minutes=5)  # bidding closed, not yet swept
+    await db_session.flush()
+    ids = {"item": item.id, "unsold": unsold.id, "running": running.id, "budi": budi.id, "winning": winning.id}
+    await db_session.commit()
+
+    assert await service.close_expired_auctions(batch_size=1, now=now) == 1
+    assert await service.close_expired_auctions(batch_size=1, now=now) == 1
+    assert await service.close_expired_auctions(batch_size=1, now=now) == 0
+
+    db_session.expunge_all()
+    closed = await service.get_item(ids["item"])
+    assert (closed.status, closed.payment_status, closed.winner_id, closed.current_price, closed.version) == (
+        "payment_pending", "awaiting_payment", ids["budi"], Decimal("110000"), 3
+    )
+    assert {bid.id: bid.status for bid in closed.bids}[ids["winning"]] == "approved"
+    assert sorted(bid.status for bid in closed.bids) == ["approved", "rejected"]
+    assert (await service.get_item(ids["unsold"])).status == "cancelled"
+    assert (await service.get_item(ids["running"])).status == "bidding"
+
+    won = (await db_session.execute(select(Notification).where(Notification.type == "auction_won"))).scalars().all()
+    assert [(n.user_id, n.reference_id) for n in won] == [(ids["budi"], str(ids["item"]))]
+    assert (await db_session.get(User, ids["budi"])).unread_notification_count == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_race_is_retried_then_rejected(db_session, auction, monkeypatch):
+    """A bid whose version was taken is re-validated against the winning price."""
+    item, _, alice, budi = auction
+    service = AuctionService(db_session)
+    execute = db_session.execute
+    raced = []
+
+    async def racing_execute(statement, *args, **kwargs):
+        # Let Budi's higher bid land between Alice's read and her conditional update.
+        if statement.is_dml and not raced:
+            raced.append(True)
+            await execute(
+                AuctionItem.__table__.update()
+                .where(AuctionItem.id == item.id)
+                .values(current_price=Decimal("150000"), highest_bidder_id=budi.id, version=AuctionItem.version + 1)
+            )
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", racing_execute)
+    with pytest.raises(HTTPException) as exc_info:
+        await service.place_bid(item.id, alice.id, _bid("110000"))
+    assert exc_info.value.detail == "Bid minimal Rp 155,000"
+
+
+@pytest.mark.asyncio
+async def test_bids_after_end_time_are_refused(db_session, auction, monkeypatch):
+    """An auction past its end takes no bids, also when it ends between the read and the claim."""
+    item, _, alice, budi = auction
+    service = AuctionService(db_session)
+    item.end_time = datetime.now(timezone.utc) + timedelta(hours=1)
+    await db_session.flush()
+    await service.place_bid(item.id, alice.id, _bid("105000"))
+
+    execute = db_session.execute
+    ended = []
+
+    async def ending_execute(statement, *args, **kwargs):
+        if statement.is_dml and not ended:
+            ended.append(True)
+            await execute(
+                AuctionItem.__table__.update()
+                .where(AuctionItem.id == item.id)
+                .values(end_time=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", ending_execute)
+    with pytest.raises(HTTPException) as exc_info:
+        await service.place_bid(item.id, budi.id, _bid("110000"))
+    assert exc_info.value.detail == "Waktu lelang sudah berakhir"
+    assert (await service.get_price_snapshot(item.id))["current_price"] == Decimal("105000")
+
+
+@pytest.mark.asyncio
+async def test_approval_conflicts_with_a_concurrent_close(db_session, auction, monkeypatch):
+    """An approval racing the sweeper (or a new bid) fails with 409 instead of overwriting its result."""
+    item, _, alice, budi = auction
+    service = AuctionService(db_session)
+    first = await service.place_bid(item.id, alice.id, _bid("105000"))
+    await service.place_bid(item.id, budi.id, _bid("110000"))
+
+    execute = db_session.execute
+    closed = []
+
+    async def closing_execute(statement, *args, **kwargs):
+        # The sweeper awards the item to Budi between the approval's read and its update.
+        if statement.is_dml and not closed:
+            closed.append(True)
+            await execute(
+                AuctionItem.__table__.update()
+                .where(AuctionItem.id == item.id)
+                .values(status="payment_pending", winner_id=budi.id, version=AuctionItem.version + 1)
+            )
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", closing_execute)
+    with pytest.raises(HTTPException) as exc_info:
+        await service.approve_bid(item.id, first.id, budi.id)
+    assert exc_info.value.status_code == 409
+    assert (await execute(select(AuctionBid.status))).scalars().all() == ["pending", "pending"]
+    assert (await execute(select(Notification).where(Notification.type == "auction_won"))).scalars().all() == []
+
+
+class _Request:
+    async def is_disconnected(self):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_price_stream_relays_committed_bids(db_session, auction, monkeypatch):
+    """Watchers get each committed bid's price, bid count and top bidder, never stale versions."""
+    broker = LocalEventBroker(queue_size=10, channel_prefix=events.AUCTION_CHANNEL_PREFIX)
+    monkeypatch.setitem(events._brokers, events.AUCTION_CHANNEL_PREFIX, broker)
+    item, _, alice, budi = auction
+    item_id, alice_id, budi_id = item.id, alice.id, budi.id
+    await db_session.commit()
+    service = AuctionService(db_session)
+
+    snapshot = await service.get_price_snapshot(item_id)
+    assert (snapshot["current_price"], snapshot["bid_count"], snapshot["top_bidder_name"], snapshot["version"]) == (
+        Decimal("100000"), 0, None, 0
+    )
+    stream = auction_price_events(_Request(), item_id, snapshot)
+    assert await stream.__anext__() == "retry: 5000\n\n"
+    assert '"version": 0' in await stream.__anext__()
+
+    next_frame = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    await service.place_bid(item_id, alice_id, _bid("105000"))
+    await db_session.rollback()  # uncommitted bids are never broadcast
+    await asyncio.sleep(0)
+    assert not next_frame.done()
+
+    await service.place_bid(item_id, budi_id, _bid("110000"))
+    await db_session.commit()
+    frame = await asyncio.wait_for(next_frame, timeout=1)
+    assert frame.startswith("event: price\n")
+    assert '"current_price": "110000' in frame
+    assert '"bid_count": 1, "top_bidder_name": "Budi", "status": "bidding", "version": 1' in frame
+
+    next_frame = asyncio.ensure_future(stream.__anext__())
+    await broker.publish([StreamEvent(str(item_id), "price", {**snapshot, "version": 1})])  # replayed
+    await broker.publish([StreamEvent(str(item_id), "price", {**snapshot, "version": 2})])
+    assert '"version": 2' in await asyncio.wait_for(next_frame, timeout=1)
+    await stream.aclose()
+    assert broker.subscriber_count() == 0
@@ -4,6 +4,11 @@ Test authentication endpoints
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.core import principal
+from app.models.user import User
+from app.services.user import UserService
 
 
 @pytest.mark.asyncio
@@ -60,3 +65,64 @@ async def test_login_invalid_credentials(client: AsyncClient):
     }
     response = await client.post("/api/v1/auth/login", json=login_data)
     assert response.status_code == 401
+
+
+async def _login(client: AsyncClient, sample_user_data) -> dict:
+    await client.post("/api/v1/auth/register", json=sample_user_data)
+    response = await client.post("/api/v1/auth/login", json={
+        "email": sample_user_data["email"],
+        "password": sample_user_data["password"]
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_principal_cached_until_invalidated(client: AsyncClient, db_session, sample_user_data, monkeypatch):
+    """Role changes through UserService take effect on the next request."""
+    monkeypatch.setattr(principal, "_PRINCIPALS", principal.OrderedDict())
+    headers = await _login(client, sample_user_data)
+
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200
+    user_id = response.json()["id"]
+    assert list(principal._PRINCIPALS) == [user_id]
+
+    # Direct writes bypass invalidation: the cached principal is still served.
+    await db_session.execute(update(User).values(role="admin"))
+    response = await client.get("/api/v1/dashboard/overview", headers=headers)
+    assert response.status_code == 403
+
+    await UserService(db_session).set_role(user_id, "admin")
+    assert user_id not in principal._PRINCIPALS
+    response = await client.get("/api/v1/dashboard/overview", headers=headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_rejected(client: AsyncClient, db_session, sample_user_data):
+    """Deactivation invalidates the principal so the token stops working."""
+    headers = await _login(client, sample_user_data)
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+
+    await UserService(db_session).deactivate(response.json()["id"])
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_principal_invalidated_again_after_commit(db_session, monkeypatch):
+    """A principal re-cached from the old row before commit is dropped once the change commits."""
+    monkeypatch.setattr(principal, "_PRINCIPALS", principal.OrderedDict())
+    user = User(full_name="Relawan", email="relawan@example.com", password_hash="x", role="relawan")
+    db_session.add(user)
+    await db_session.commit()
+    stale = principal.Principal.from_user(user)
+
+    await UserService(db_session).set_role(str(user.id), "admin")
+    # A concurrent request reloads the still-committed row and caches it
+    await principal.cache_principal(stale)
+    assert str(user.id) in principal._PRINCIPALS
+
+    await db_session.commit()
+    assert str(user.id) not in principal._PRINCIPALS
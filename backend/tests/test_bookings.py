@@ -0,0 +1,134 @@
+"""
+Test booking slot occupancy
+"""
+
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.locks import BOOKING_DATE_LOCK, advisory_xact_locks
+from app.models.booking import BookingSlotOccupancy
+from app.models.user import User
+from app.schemas.booking import BookingCreate
+from app.services.booking import BookingService
+
+TOMORROW = date.today() + timedelta(days=1)
+DAY_AFTER = TOMORROW + timedelta(days=1)
+
+
+@pytest_asyncio.fixture
+async def requesters(db_session):
+    alice, budi = (
+        User(full_name=name, email=f"{name.lower()}@example.com", password_hash="x")
+        for name in ("Alice", "Budi")
+    )
+    db_session.add_all([alice, budi])
+    await db_session.flush()
+    return alice, budi
+
+
+def _booking(dates, slots):
+    return BookingCreate(
+        booking_date=dates[0],
+        booking_dates=dates,
+        time_slot=slots[0],
+        time_slots=slots,
+        pickup_address="Jl. Merdeka 1",
+        dropoff_address="RS Sehat",
+        purpose="Kontrol rutin",
+    )
+
+
+async def _create(service, user, dates, slots):
+    return await service.create_booking(_booking(dates, slots), user.id, user.full_name, "0812")
+
+
+@pytest.mark.asyncio
+async def test_booking_occupies_each_date_and_slot(db_session, requesters):
+    """Bookings hold every selected (date, slot) until cancelled; conflicts are found by date lookup."""
+    alice, budi = requesters
+    service = BookingService(db_session)
+
+    booking = await _create(service, alice, [TOMORROW, DAY_AFTER], ["08:00", "10:00"])
+    held = (await db_session.execute(
+        select(BookingSlotOccupancy.booking_date, BookingSlotOccupancy.time_slot)
+        .where(BookingSlotOccupancy.booking_id == booking.id)
+    )).all()
+    assert sorted(held) == [(d, s) for d in (TOMORROW, DAY_AFTER) for s in ("08:00", "10:00")]
+
+    slots = {slot["time"]: slot["available"] for slot in await service.get_available_slots(DAY_AFTER)}
+    assert (slots["08:00"], slots["10:00"], slots["13:00"]) == (False, False, True)
+
+    with pytest.raises(HTTPException) as taken:
+        await _create(service, budi, [DAY_AFTER], ["10:00", "13:00"])
+    assert taken.value.status_code == 409
+    assert f"{DAY_AFTER.isoformat()} (10:00)" in taken.value.detail
+
+    with pytest.raises(HTTPException) as own:
+        await _create(service, alice, [TOMORROW], ["08:00"])
+    assert (own.value.status_code, own.value.detail) == (
+        409, f"Anda sudah memesan salah satu slot pada tanggal {TOMORROW.isoformat()}"
+    )
+
+    # The same first date and slot are fine once released by a cancellation
+    await service.update_status(str(booking.id), "cancelled", alice.id)
+    assert all(slot["available"] for slot in await service.get_available_slots(TOMORROW))
+    rebooked = await _create(service, budi, [TOMORROW], ["08:00"])
+    assert rebooked.status == "pending"
+
+
+@pytest.mark.asyncio
+async def test_unique_key_rejects_a_racing_booking(db_session, requesters):
+    """A booking that slipped past the pre-check still cannot take a held slot."""
+    alice, budi = requesters
+    service = BookingService(db_session)
+    booking = await _create(service, alice, [TOMORROW], ["15:00"])
+    await db_session.commit()
+    booking_id, budi_id = booking.id, budi.id
+
+    # Simulate the concurrent request: its pre-check saw no occupancy
+    execute = db_session.execute
+
+    async def stale_precheck(statement, *args, **kwargs):
+        if statement.is_select and BookingSlotOccupancy.__table__ in statement.get_final_froms():
+            statement = statement.where(False)
+        return await execute(statement, *args, **kwargs)
+
+    db_session.execute = stale_precheck
+    with pytest.raises(HTTPException) as raced:
+        await service.create_booking(_booking([TOMORROW], ["15:00"]), budi_id, "Budi", "0813")
+    del db_session.execute
+    assert (raced.value.status_code, raced.value.detail) == (409, "This slot was just booked by someone else")
+
+    holders = (await db_session.execute(select(BookingSlotOccupancy.booking_id))).scalars().all()
+    assert holders == [booking_id]
+
+
+class _PostgresSession:
+    """Records the statements a PostgreSQL session would run."""
+
+    class bind:
+        dialect = postgresql.dialect()
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=self.bind.dialect, compile_kwargs={"literal_binds": True})))
+
+
+@pytest.mark.asyncio
+async def test_date_locks_are_sorted_and_postgres_only(db_session):
+    """Each date is locked once, in ascending order; SQLite sessions take no locks."""
+    session = _PostgresSession()
+    await advisory_xact_locks(session, BOOKING_DATE_LOCK, [DAY_AFTER.toordinal(), TOMORROW.toordinal(), DAY_AFTER.toordinal()])
+    assert session.statements == [
+        f"SELECT pg_advisory_xact_lock({BOOKING_DATE_LOCK}, {day.toordinal()}) AS pg_advisory_xact_lock_1"
+        for day in (TOMORROW, DAY_AFTER)
+    ]
+
+    await advisory_xact_locks(db_session, BOOKING_DATE_LOCK, [TOMORROW.toordinal()])  # no-op, no error
@@ -0,0 +1,45 @@
+"""
+Test dashboard snapshots
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.models.user import User
+from app.services import dashboard
+from app.services.dashboard import DashboardService
+
+
+@pytest.fixture
+def local_snapshots(monkeypatch):
+    """Use the in-process snapshot store instead of Redis."""
+    monkeypatch.setattr(settings, "REDIS_CACHE_ENABLED", False)
+    monkeypatch.setattr(dashboard, "_LOCAL_SNAPSHOTS", {})
+
+
+@pytest.mark.asyncio
+async def test_snapshot_served_until_refreshed(db_session, local_snapshots):
+    """Reads hit the stored snapshot; refresh recomputes from the database."""
+    service = DashboardService(db_session)
+
+    first = await service.get_snapshot("users")
+    assert first["active"] == 0
+
+    db_session.add(User(full_name="Relawan", email="relawan@example.com", password_hash="x", role="relawan"))
+    await db_session.flush()
+
+    cached = await service.get_snapshot("users")
+    assert cached["active"] == 0
+
+    fresh = await service.refresh_snapshot("users")
+    assert fresh["active"] == 1
+    assert (await service.get_snapshot("users"))["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_snapshots(db_session, local_snapshots):
+    """The beat job stores one snapshot per dashboard route."""
+    refreshed = await DashboardService(db_session).refresh_all_snapshots()
+
+    assert refreshed == len(DashboardService.SNAPSHOTS)
+    assert set(dashboard._LOCAL_SNAPSHOTS) == set(DashboardService.SNAPSHOTS)
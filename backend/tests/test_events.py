@@ -0,0 +1,124 @@
+"""
+Test notification event streaming
+"""
+
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from app.api.v1.notifications.routes import notification_events
+from app.core import events
+from app.core.events import LocalEventBroker, RedisEventBroker, StreamEvent
+from app.models.user import User
+from app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """Fresh in-process broker for each test."""
+    local = LocalEventBroker(queue_size=10)
+    monkeypatch.setitem(events._brokers, events.USER_CHANNEL_PREFIX, local)
+    return local
+
+
+async def _drain(queue):
+    await asyncio.sleep(0)  # let the after-commit publish task run
+    received = []
+    while not queue.empty():
+        received.append(queue.get_nowait())
+    return received
+
+
+@pytest.mark.asyncio
+async def test_events_published_after_commit_only(db_session, broker):
+    """Notifications and new unread counts reach subscribers once committed; rollbacks publish nothing."""
+    user = User(full_name="Sahabat", email="sahabat@example.com", password_hash="x")
+    db_session.add(user)
+    await db_session.commit()
+    user_id = user.id
+    service = NotificationService(db_session)
+
+    async with broker.subscribe(user_id) as queue:
+        await service.create_notification(user_id=user_id, title="Dibatalkan", body="b", type="system", send_push=False)
+        assert await _drain(queue) == []
+        await db_session.rollback()
+        assert await _drain(queue) == []
+
+        notification = await service.create_notification(
+            user_id=user_id, title="Booking disetujui", body="b", type="booking", send_push=False
+        )
+        await db_session.commit()
+        received = await _drain(queue)
+
+        assert [e.event for e in received] == ["notification", "unread_count"]
+        assert received[0].data["id"] == str(notification.id)
+        assert received[1].data == {"count": 1}
+
+        await service.mark_all_as_read(user_id)
+        assert [(e.event, e.data) for e in await _drain(queue)] == [("unread_count", {"count": 0})]
+
+    assert broker.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_keeps_newest_events():
+    """A full queue drops its oldest event instead of blocking publishers."""
+    broker = LocalEventBroker(queue_size=2)
+    async with broker.subscribe("u1") as queue:
+        await broker.publish([StreamEvent("u1", "unread_count", {"count": n}) for n in range(5)])
+        assert [e.data["count"] for e in await _drain(queue)] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_fans_out_between_workers(monkeypatch):
+    """An event published by one worker reaches a stream subscribed on another."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        events, "get_redis", lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+    publisher, subscriber = RedisEventBroker(queue_size=10), RedisEventBroker(queue_size=10)
+
+    async with subscriber.subscribe("u1") as queue:
+        for _ in range(50):  # wait for the listener's subscription
+            await asyncio.sleep(0.01)
+            if await fakeredis.aioredis.FakeRedis(server=server).pubsub_numpat():
+                break
+        await publisher.publish([StreamEvent("u2", "unread_count", {"count": 9}),
+                                 StreamEvent("u1", "unread_count", {"count": 3})])
+        received = await asyncio.wait_for(queue.get(), timeout=2)
+
+    assert received == StreamEvent("u1", "unread_count", {"count": 3})
+    assert queue.empty()
+    await subscriber.close()
+
+
+class _Request:
+    """Stand-in for a Starlette request that disconnects on demand."""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.mark.asyncio
+async def test_stream_frames(broker):
+    """The stream opens with the unread count, then relays events as SSE frames."""
+    request = _Request()
+    stream = notification_events(request, "u1", 4)
+
+    assert await stream.__anext__() == "retry: 5000\n\n"
+    assert await stream.__anext__() == 'event: unread_count\ndata: {"count": 4}\n\n'
+
+    next_frame = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    await broker.publish([StreamEvent("u1", "notification", {"title": "Halo"})])
+    assert await next_frame == 'event: notification\ndata: {"title": "Halo"}\n\n'
+
+    request.disconnected = True
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert broker.subscriber_count() == 0
@@ -0,0 +1,433 @@
+"""
+Test notification fan-out
+"""
+
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.models.notification import Notification, PushOutbox, PushToken
+from app.models.user import User
+from app.services import notification_service
+from app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def expo_requests(monkeypatch):
+    """
+    Stub of the Expo push API capturing send requests.
+
+    Set `.fail` to simulate an outage; `.receipts` maps ticket ids to the
+    receipts /getReceipts answers with, and `.receipt_requests` records the
+    id lists it was asked for.
+    """
+    class Batches(list):
+        fail = False
+
+    batches = Batches()
+    batches.receipts = {}
+    batches.receipt_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/getReceipts"):
+            ids = json.loads(request.content)["ids"]
+            batches.receipt_requests.append(ids)
+            return httpx.Response(200, json={
+                "data": {ticket_id: batches.receipts[ticket_id] for ticket_id in ids if ticket_id in batches.receipts}
+            })
+        batches.append(json.loads(request.content))
+        if batches.fail:
+            return httpx.Response(503)
+        tickets = [
+            {"status": "error", "message": "not registered", "details": {"error": "DeviceNotRegistered"}}
+            if message["to"].endswith("[gone]")
+            else {"status": "ok", "id": f"ticket-{message['to']}"}
+            for message in batches[-1]
+        ]
+        return httpx.Response(200, json={"data": tickets})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(notification_service, "get_push_client", lambda: client)
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_bulk_fan_out_batches_rows_and_pushes(db_session, expo_requests):
+    """One row per distinct recipient; pushes are queued, then drained in chunks of 100."""
+    user_ids = [uuid.uuid4() for _ in range(150)]
+    db_session.add_all([
+        PushToken(user_id=user_id, token=f"ExponentPushToken[{i}]", device_type="android")
+        for i, user_id in enumerate(user_ids[:120])
+    ])
+    db_session.add(PushToken(user_id=user_ids[0], token="ExponentPushToken[tablet]", device_type="ios"))
+    await db_session.flush()
+
+    count = await NotificationService(db_session).create_bulk_notifications(
+        user_ids=user_ids + user_ids[:10],
+        title="Booking baru",
+        body="Ada booking baru menunggu persetujuan.",
+        type="booking",
+    )
+
+    assert count == 150
+    stored = await db_session.execute(select(func.count()).select_from(Notification))
+    assert stored.scalar_one() == 150
+    assert expo_requests == []
+    queued = await db_session.execute(select(func.count()).select_from(PushOutbox))
+    assert queued.scalar_one() == 121
+
+    service = NotificationService(db_session)
+    assert await service.drain_push_outbox() == 121
+    assert [len(batch) for batch in expo_requests] == [100, 21]
+    assert {message["to"] for batch in expo_requests for message in batch} >= {"ExponentPushToken[tablet]"}
+    assert await service.drain_push_outbox() == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_fan_out_without_recipients(db_session, expo_requests):
+    """Empty fan-outs touch neither the database nor Expo."""
+    count = await NotificationService(db_session).create_bulk_notifications(
+        user_ids=[], title="t", body="b", type="system"
+    )
+    assert count == 0
+    assert expo_requests == []
+
+
+async def _queue_push(db_session, token):
+    user_id = uuid.uuid4()
+    db_session.add(PushToken(user_id=user_id, token=token, device_type="android"))
+    await db_session.flush()
+    notification = await NotificationService(db_session).create_notification(
+        user_id=user_id, title="Tawaran Anda terlampaui", body="Ada tawaran lebih tinggi.", type="auction"
+    )
+    return notification
+
+
+@pytest.mark.asyncio
+async def test_create_notification_queues_push_without_calling_expo(db_session, expo_requests):
+    """The request transaction only writes the outbox; the drain delivers and records tickets."""
+    await _queue_push(db_session, "ExponentPushToken[phone]")
+    await _queue_push(db_session, "ExponentPushToken[gone]")
+    assert expo_requests == []
+
+    assert await NotificationService(db_session).drain_push_outbox() == 2
+    rows = {row.token: row for row in (await db_session.execute(select(PushOutbox))).scalars()}
+    sent = rows["ExponentPushToken[phone]"]
+    assert (sent.status, sent.ticket_id, sent.attempts) == ("sent", "ticket-ExponentPushToken[phone]", 1)
+    gone = rows["ExponentPushToken[gone]"]
+    assert (gone.status, gone.last_error) == ("failed", "not registered")
+    tokens = (await db_session.execute(select(PushToken.token))).scalars().all()
+    assert tokens == ["ExponentPushToken[phone]"]
+
+
+@pytest.mark.asyncio
+async def test_drain_retries_with_backoff_until_max_attempts(db_session, expo_requests, monkeypatch):
+    """Undelivered messages stay pending with a growing delay, then give up."""
+    monkeypatch.setattr(settings, "PUSH_OUTBOX_MAX_ATTEMPTS", 2)
+    expo_requests.fail = True
+    await _queue_push(db_session, "ExponentPushToken[phone]")
+    service = NotificationService(db_session)
+
+    before = datetime.now(timezone.utc)
+    assert await service.drain_push_outbox() == 1
+    row = (await db_session.execute(select(PushOutbox))).scalar_one()
+    assert (row.status, row.attempts) == ("pending", 1)
+    next_attempt = row.next_attempt_at.replace(tzinfo=row.next_attempt_at.tzinfo or timezone.utc)
+    assert next_attempt >= before + timedelta(seconds=settings.PUSH_OUTBOX_RETRY_BASE_SECONDS)
+
+    # Not due yet: nothing is claimed.
+    assert await service.drain_push_outbox() == 0
+
+    row.next_attempt_at = before
+    await db_session.flush()
+    assert await service.drain_push_outbox() == 1
+    assert (row.status, row.attempts) == ("failed", 2)
+
+
+async def _sent_push(db_session, token):
+    """Queue and send a push for a fresh user, leaving its receipt due."""
+    await _queue_push(db_session, token)
+    service = NotificationService(db_session)
+    await service.drain_push_outbox()
+    row = (await db_session.execute(select(PushOutbox).where(PushOutbox.token == token))).scalar_one()
+    row.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db_session.flush()
+    return row
+
+
+@pytest.mark.asyncio
+async def test_receipts_record_status_and_prune_dead_tokens(db_session, expo_requests):
+    """Receipts mark messages delivered or failed; DeviceNotRegistered tokens are deleted."""
+    ok = await _sent_push(db_session, "ExponentPushToken[ok]")
+    dead = await _sent_push(db_session, "ExponentPushToken[dead]")
+    waiting = await _sent_push(db_session, "ExponentPushToken[waiting]")
+    expo_requests.receipts = {
+        ok.ticket_id: {"status": "ok"},
+        dead.ticket_id: {
+            "status": "error",
+            "message": "The recipient device is not registered",
+            "details": {"error": "DeviceNotRegistered"},
+        },
+    }
+
+    assert await NotificationService(db_session).process_push_receipts() == 3
+
+    assert sorted(expo_requests.receipt_requests[0]) == sorted([ok.ticket_id, dead.ticket_id, waiting.ticket_id])
+    assert (ok.status, dead.status, waiting.status) == ("delivered", "failed", "sent")
+    assert dead.last_error == "The recipient device is not registered"
+    tokens = (await db_session.execute(select(PushToken.token))).scalars().all()
+    assert sorted(tokens) == ["ExponentPushToken[ok]", "ExponentPushToken[waiting]"]
+
+    # The pending receipt is re-checked later, not on the next run.
+    assert await NotificationService(db_session).process_push_receipts() == 0
+
+
+@pytest.mark.asyncio
+async def test_receipt_ids_are_fetched_in_chunks_of_1000(expo_requests):
+    """Large receipt checks are split into Expo's 1000-id limit."""
+    ids = [f"ticket-{i}" for i in range(2500)]
+    expo_requests.receipts = {ticket_id: {"status": "ok"} for ticket_id in ids}
+
+    receipts = await notification_service.fetch_expo_receipts(ids)
+
+    assert len(receipts) == 2500
+    assert sorted(len(chunk) for chunk in expo_requests.receipt_requests) == [500, 1000, 1000]
+
+
+@pytest.mark.asyncio
+async def test_purge_removes_old_finished_outbox_rows(db_session):
+    """Finished messages past the retention window are purged; pending and recent ones stay."""
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(hours=settings.PUSH_OUTBOX_RETENTION_HOURS + 1)
+    rows = {
+        (status, age): PushOutbox(
+            user_id=uuid.uuid4(), token=f"ExponentPushToken[{status}-{age}]", title="t", body="b",
+            status=status, created_at=created_at,
+        )
+        for status in ("pending", "sent", "delivered", "failed", "coalesced", "unconfirmed")
+        for age, created_at in (("old", old), ("new", now))
+    }
+    db_session.add_all(rows.values())
+    await db_session.commit()
+
+    service = NotificationService(db_session)
+    assert await service.purge_push_outbox(batch_size=3) == 3
+    assert await service.purge_push_outbox(batch_size=3) == 1
+    assert await service.purge_push_outbox(batch_size=3) == 0
+
+    kept = await db_session.execute(select(PushOutbox.token))
+    assert sorted(kept.scalars().all()) == sorted(
+        row.token for (status, age), row in rows.items() if age == "new" or status in ("pending", "sent")
+    )
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_follows_create_and_mark_read(db_session, expo_requests):
+    """The denormalized counter tracks unread rows without counting them."""
+    user = User(full_name="Sahabat", email="sahabat@example.com", password_hash="x")
+    other = User(full_name="Relawan", email="relawan@example.com", password_hash="x", role="relawan")
+    db_session.add_all([user, other])
+    await db_session.flush()
+    service = NotificationService(db_session)
+
+    first = await service.create_notification(user_id=user.id, title="a", body="a", type="system")
+    await service.create_bulk_notifications(user_ids=[user.id, other.id], title="b", body="b", type="system")
+    assert await service.get_unread_count(user.id) == 2
+    assert await service.get_unread_count(other.id) == 1
+
+    await service.mark_as_read(first.id, user.id)
+    await service.mark_as_read(first.id, user.id)  # already read: no double decrement
+    assert await service.get_unread_count(user.id) == 1
+
+    assert await service.mark_all_as_read(user.id) == 1
+    assert await service.get_unread_count(user.id) == 0
+    assert await service.get_unread_count(other.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_inbox_page_carries_total_and_unread(db_session, expo_requests):
+    """Offset pages carry the full match count; cursor pages skip it."""
+    user = User(full_name="Sahabat", email="sahabat@example.com", password_hash="x")
+    db_session.add(user)
+    await db_session.flush()
+    service = NotificationService(db_session)
+    base = datetime.now(timezone.utc) - timedelta(days=1)
+    for i in range(5):
+        notification = await service.create_notification(
+            user_id=user.id, title=f"n{i}", body="b", type="system", send_push=False
+        )
+        notification.created_at = base + timedelta(minutes=i)
+    await db_session.commit()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+    page = await service.get_notifications(user.id, limit=2)
+    event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+    assert (len(page["notifications"]), page["total"], page["unread_count"]) == (2, 5, 5)
+    assert len(statements) == 1
+
+    second = await service.get_notifications(user.id, limit=2, cursor=page["next_cursor"])
+    assert (len(second["notifications"]), second["total"], second["unread_count"]) == (2, None, 5)
+    assert not {n.id for n in page["notifications"]} & {n.id for n in second["notifications"]}
+
+    past_end = await service.get_notifications(user.id, limit=2, offset=10)
+    assert (past_end["notifications"], past_end["total"], past_end["unread_count"]) == ([], 5, 5)
+
+    with pytest.raises(HTTPException):
+        await service.mark_as_read(uuid.uuid4(), user.id)
+
+
+@pytest.mark.asyncio
+async def test_retention_removes_expired_notifications(db_session, expo_requests):
+    """Expired rows leave the inbox and the unread counter; retained ones stay."""
+    user = User(full_name="Sahabat", email="sahabat@example.com", password_hash="x")
+    db_session.add(user)
+    await db_session.flush()
+    service = NotificationService(db_session)
+    now = datetime.now(timezone.utc)
+    created = {}
+    for title, days in {"expired unread": 400, "expired read": 300, "recent": 2}.items():
+        created[title] = await service.create_notification(
+            user_id=user.id, title=title, body="b", type="system", send_push=False
+        )
+        created[title].created_at = now - timedelta(days=days)
+    await db_session.commit()
+    await service.mark_as_read(created["expired read"].id, user.id)
+    assert await service.get_unread_count(user.id) == 2
+
+    inbox = await service.get_notifications(user.id)
+    assert [n.title for n in inbox["notifications"]] == ["recent"]
+
+    assert await service.enforce_retention() == 2
+    titles = (await db_session.execute(select(Notification.title))).scalars().all()
+    assert titles == ["recent"]
+    assert await service.get_unread_count(user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_retention_detaches_only_after_counting(monkeypatch, tmp_path):
+    """On PostgreSQL the parent table is locked only by a short detach-and-drop transaction."""
+    steps = []
+
+    class Result:
+        def all(self):
+            return []
+
+    class Session:
+        class bind:
+            class dialect:
+                name = "postgresql"
+
+        async def execute(self, statement):
+            steps.append(" ".join(str(statement).split())[:40])
+            return Result()
+
+        async def commit(self):
+            steps.append("COMMIT")
+
+    def record(label):
+        async def step(db, *args, **kwargs):
+            steps.append(label)
+            return [("notifications_2020_01", datetime(2020, 1, 1).date())] if label == "list" else []
+        return step
+
+    for function, label in (
+        ("ensure_monthly_partitions", "ensure"),
+        ("list_monthly_partitions", "list"),
+        ("archive_partition", "archive"),
+        ("detach_partition", "DETACH"),
+        ("drop_detached_partition", "DROP"),
+    ):
+        monkeypatch.setattr(notification_service, function, record(label))
+    monkeypatch.setattr(settings, "NOTIFICATION_ARCHIVE_DIR", str(tmp_path))
+
+    assert await NotificationService(Session()).enforce_retention() == 1
+    assert steps == [
+        "ensure", "COMMIT", "list",
+        "archive", "COMMIT",
+        'WITH expired AS ( UPDATE "notifications_', "COMMIT",
+        "DETACH", "DROP", "COMMIT",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_notifications_update_in_place(db_session, expo_requests, monkeypatch):
+    """Repeated outbids keep one unread row per auction and push at most once per window."""
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: None)
+    monkeypatch.setattr(rate_limit, "_RATE_STATE", OrderedDict())
+    user = User(full_name="Sahabat", email="sahabat@example.com", password_hash="x")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add(PushToken(user_id=user.id, token="ExponentPushToken[phone]", device_type="android"))
+    service = NotificationService(db_session)
+    auction_id, other_auction_id = uuid.uuid4(), uuid.uuid4()
+
+    async def outbid(reference_id, n):
+        return await service.create_notification(
+            user_id=user.id, title="Tawaran Anda Dilewati", body=f"Tawaran ke-{n}", type="auction_outbid",
+            reference_type="auction", reference_id=reference_id, coalesce=True,
+        )
+
+    first = await outbid(auction_id, 1)
+    for n in range(2, 6):
+        assert (await outbid(auction_id, n)).id == first.id
+    await outbid(other_auction_id, 1)
+    await db_session.commit()
+
+    rows = (await db_session.execute(select(Notification).order_by(Notification.reference_id))).scalars().all()
+    assert len(rows) == 2
+    assert next(row for row in rows if row.id == first.id).body == "Tawaran ke-5"
+    assert await service.get_unread_count(user.id) == 2
+    queued = await db_session.execute(select(func.count()).select_from(PushOutbox))
+    assert queued.scalar_one() == 2
+
+    # The drain sends the newest text of each burst
+    assert await service.drain_push_outbox() == 2
+    assert sorted(message["body"] for message in expo_requests[0]) == ["Tawaran ke-1", "Tawaran ke-5"]
+
+    # Once read, the next outbid starts a new notification; its push waits out the window.
+    await service.mark_as_read(first.id, user.id)
+    assert (await outbid(auction_id, 6)).id != first.id
+    assert await service.get_unread_count(user.id) == 2
+    await db_session.commit()
+    assert await service.drain_push_outbox() == 1
+    assert len(expo_requests) == 1
+    statuses = await db_session.execute(select(PushOutbox.status).where(PushOutbox.body == "Tawaran ke-6"))
+    assert statuses.scalar_one() == "coalesced"
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_outbid_keeps_push_window_open(db_session, expo_requests, monkeypatch):
+    """The push rate-limit slot is only taken for committed notifications."""
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: None)
+    monkeypatch.setattr(rate_limit, "_RATE_STATE", OrderedDict())
+    user = User(full_name="Sahabat", email="sahabat@example.com", password_hash="x")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add(PushToken(user_id=user.id, token="ExponentPushToken[phone]", device_type="android"))
+    await db_session.commit()
+    user_id, auction_id = user.id, uuid.uuid4()
+    service = NotificationService(db_session)
+
+    async def outbid(body):
+        await service.create_notification(
+            user_id=user_id, title="Tawaran Anda Dilewati", body=body, type="auction_outbid",
+            reference_type="auction", reference_id=auction_id, coalesce=True,
+        )
+
+    await outbid("rolled back")
+    await db_session.rollback()
+    await outbid("committed")
+    await db_session.commit()
+
+    assert await service.drain_push_outbox() == 1
+    assert [message["body"] for batch in expo_requests for message in batch] == ["committed"]
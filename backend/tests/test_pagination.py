@@ -0,0 +1,60 @@
+"""
+Test keyset pagination
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor, next_cursor
+from app.models.donation import Donation
+from app.services.donation import DonationService
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_offset_order(db_session):
+    """Walking cursors visits every row once, in offset order, ties broken by id."""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.add_all([
+        Donation(
+            donation_code=f"CKY-{i}",
+            donor_name="Hamba Allah",
+            amount=Decimal("10000"),
+            donation_type="infaq",
+            payment_method="transfer",
+            payment_status="paid",
+            # Pairs share a timestamp so the id tie-breaker is exercised.
+            created_at=base + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    ])
+    await db_session.flush()
+
+    service = DonationService(db_session)
+    expected = [d.id for d in await service.list_donations(limit=100)]
+
+    seen, cursor = [], None
+    while True:
+        page = await service.list_donations(limit=2, cursor=cursor)
+        seen += [d.id for d in page]
+        cursor = next_cursor(page, 2)
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert len(seen) == 7
+
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    """Cursors are opaque but decode back to the sort key; junk is a 400."""
+    created_at = datetime(2026, 1, 1, 8, 30, tzinfo=timezone.utc)
+    row_id = "3f2b1c4e-8d7a-4e1f-9b6c-2a5d8e7f1c3b"
+    decoded = decode_cursor(encode_cursor(created_at, row_id))
+    assert decoded[0] == created_at
+    assert str(decoded[1]) == row_id
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
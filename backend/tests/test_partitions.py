@@ -0,0 +1,22 @@
+"""
+Test monthly partition helpers
+"""
+
+from datetime import date, datetime, timezone
+
+from app.core.partitions import add_months, partition_name, retention_cutoff
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_name():
+    assert partition_name("notifications", date(2026, 3, 1)) == "notifications_2026_03"
+
+
+def test_retention_cutoff_counts_current_month():
+    now = datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc)
+    assert retention_cutoff(1, now) == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert retention_cutoff(6, now) == datetime(2026, 5, 1, tzinfo=timezone.utc)
@@ -0,0 +1,96 @@
+"""
+Test rate limiting
+"""
+
+from collections import OrderedDict
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from fastapi import HTTPException
+
+from app.core import rate_limit
+
+
+@pytest.fixture
+def fake_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_failures(monkeypatch):
+    """Fresh local state; records Redis failures instead of starting the cool-down."""
+    failures = []
+    monkeypatch.setattr(rate_limit, "_RATE_STATE", OrderedDict())
+    monkeypatch.setattr(rate_limit, "mark_redis_unavailable", failures.append)
+    return failures
+
+
+def _use_redis(monkeypatch, server):
+    monkeypatch.setattr(
+        rate_limit, "get_redis", lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_limit_is_shared_between_clients(monkeypatch, fake_server, redis_failures):
+    """Every call gets a fresh client (as separate workers would) but one counter."""
+    _use_redis(monkeypatch, fake_server)
+
+    for _ in range(3):
+        await rate_limit.enforce_rate_limit("auth:login:ip:10.0.0.1", max_requests=3, window_seconds=60)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await rate_limit.enforce_rate_limit("auth:login:ip:10.0.0.1", max_requests=3, window_seconds=60)
+    assert exc_info.value.status_code == 429
+
+    await rate_limit.enforce_rate_limit("auth:login:ip:10.0.0.2", max_requests=3, window_seconds=60)
+    assert not rate_limit._RATE_STATE
+
+    client = fakeredis.aioredis.FakeRedis(server=fake_server, decode_responses=True)
+    assert await client.zcard("ratelimit:auth:login:ip:10.0.0.1") == 3
+    assert 0 < await client.pttl("ratelimit:auth:login:ip:10.0.0.1") <= 60_000
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_buckets_when_redis_is_down(monkeypatch, fake_server, redis_failures):
+    """Connection errors degrade to the per-process limiter."""
+    fake_server.connected = False
+    _use_redis(monkeypatch, fake_server)
+
+    await rate_limit.enforce_rate_limit("auth:forgot:ip:10.0.0.1", max_requests=1, window_seconds=60)
+    with pytest.raises(HTTPException):
+        await rate_limit.enforce_rate_limit("auth:forgot:ip:10.0.0.1", max_requests=1, window_seconds=60)
+
+    assert len(redis_failures) == 2
+    assert list(rate_limit._RATE_STATE) == ["auth:forgot:ip:10.0.0.1"]
+
+
+def test_local_gcra_allows_burst_then_spaces_requests(monkeypatch, redis_failures):
+    """A full burst is allowed, then one request per window / limit."""
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+
+    assert all(rate_limit._allow_local("k", max_requests=3, window_seconds=60) for _ in range(3))
+    assert not rate_limit._allow_local("k", max_requests=3, window_seconds=60)
+
+    clock[0] += 19.0
+    assert not rate_limit._allow_local("k", max_requests=3, window_seconds=60)
+    clock[0] += 1.0
+    assert rate_limit._allow_local("k", max_requests=3, window_seconds=60)
+
+
+def test_local_state_is_capped_and_drops_recovered_keys(monkeypatch, redis_failures):
+    """Distinct keys never exceed the cap; idle keys are evicted first."""
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_LOCAL_MAX_KEYS", 100)
+
+    for i in range(1_000):
+        rate_limit._allow_local(f"auth:login:email:{i}@example.com", max_requests=10, window_seconds=60)
+    assert len(rate_limit._RATE_STATE) == 100
+    assert "auth:login:email:999@example.com" in rate_limit._RATE_STATE
+
+    clock[0] += 61.0
+    rate_limit._allow_local("auth:login:ip:10.0.0.1", max_requests=10, window_seconds=60)
+    assert len(rate_limit._RATE_STATE) == 100 - rate_limit._EVICT_BATCH + 1
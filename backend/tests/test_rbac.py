@@ -0,0 +1,58 @@
+"""
+Test RBAC permission matrix
+"""
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from app.core import rbac
+from app.core.config import settings
+from app.models.rbac import RolePermission
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(rbac, "_matrix", None)
+    monkeypatch.setattr(rbac, "_next_check", 0.0)
+    monkeypatch.setattr(
+        rbac, "get_redis", lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+    return fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+
+@pytest.mark.asyncio
+async def test_matrix_served_from_memory_until_checked(db_session, fake_redis, monkeypatch):
+    """Between checks, new rows are not seen; lookups need no session."""
+    monkeypatch.setattr(settings, "RBAC_VERSION_CHECK_SECONDS", 3600)
+    db_session.add(RolePermission(role="relawan", resource="bookings", action="read"))
+    await db_session.flush()
+
+    matrix = await rbac.get_permission_matrix(db_session)
+    assert matrix.allows("relawan", "bookings", "read")
+    assert not matrix.allows("relawan", "bookings", "approve")
+
+    db_session.add(RolePermission(role="relawan", resource="bookings", action="approve"))
+    await db_session.flush()
+    assert await rbac.get_permission_matrix() is matrix
+
+
+@pytest.mark.asyncio
+async def test_version_bump_triggers_reload(db_session, fake_redis, monkeypatch):
+    """A bumped version stamp (from any worker) reloads on the next check."""
+    monkeypatch.setattr(settings, "RBAC_VERSION_CHECK_SECONDS", 0)
+    db_session.add(RolePermission(role="pengurus", resource="users", action="read"))
+    await db_session.flush()
+
+    first = await rbac.get_permission_matrix(db_session)
+    assert first.version == "0"
+    assert await rbac.get_permission_matrix(db_session) is first
+
+    db_session.add(RolePermission(role="pengurus", resource="users", action="update"))
+    await db_session.flush()
+    await fake_redis.incr(rbac.RBAC_VERSION_KEY)
+
+    reloaded = await rbac.get_permission_matrix(db_session)
+    assert reloaded.version == "1"
+    assert reloaded.allows("pengurus", "users", "update")
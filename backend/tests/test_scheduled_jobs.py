@@ -0,0 +1,78 @@
+"""
+Test the Celery job runner
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import events, redis
+from app.core.config import settings
+from app.services import notification_service
+from app.tasks import scheduled_jobs
+from app.tasks.scheduled_jobs import run_job
+
+
+def test_run_job_closes_loop_clients(monkeypatch):
+    """Clients created inside a job's event loop are closed when the loop ends."""
+    monkeypatch.setattr(settings, "REDIS_CACHE_ENABLED", True)
+    monkeypatch.setattr(redis, "_unavailable_until", 0.0)
+    clients = []
+
+    async def job():
+        clients.append(redis.get_redis())
+        clients.append(notification_service.get_push_client())
+
+    run_job(job)
+
+    assert None not in clients
+    assert not redis._CLIENTS and not notification_service._PUSH_CLIENTS
+    assert clients[1].is_closed
+
+
+def test_run_job_empties_engine_pool(monkeypatch, tmp_path):
+    """Connections pooled by one job's loop are never handed to the next job."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", poolclass=AsyncAdaptedQueuePool)
+    monkeypatch.setattr(scheduled_jobs, "engine", engine)
+    pooled = []
+
+    async def job():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        pooled.append(engine.pool.checkedin())
+
+    run_job(job)
+    run_job(job)
+
+    assert pooled == [1, 1]
+    assert engine.pool.checkedin() == 0
+
+
+class _SlowBroker(events.LocalEventBroker):
+    def __init__(self):
+        super().__init__(queue_size=10)
+        self.published = []
+
+    async def publish(self, stream_events):
+        await asyncio.sleep(0.01)
+        self.published.extend(stream_events)
+
+
+def test_run_job_delivers_events_of_its_last_commit(monkeypatch, tmp_path):
+    """Events published after the job's final commit are not cancelled with its loop."""
+    broker = _SlowBroker()
+    monkeypatch.setitem(events._brokers, events.AUCTION_CHANNEL_PREFIX, broker)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+
+    async def job():
+        async with AsyncSession(engine) as session:
+            await session.execute(text("SELECT 1"))
+            events.queue_auction_event(session, "item-1", "price", {"current_price": 150000})
+            await session.commit()
+        await engine.dispose()
+
+    run_job(job)
+
+    assert [(e.topic, e.event) for e in broker.published] == [("item-1", "price")]
@@ -0,0 +1,58 @@
+"""
+Test list search
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.search import apply_search
+from app.models.equipment import MedicalEquipment
+from app.models.user import User
+from app.services.equipment import EquipmentService
+from app.services.user import UserService
+
+
+@pytest.mark.asyncio
+async def test_user_search_matches_name_or_email(db_session):
+    """The SQLite fallback matches substrings of name or email, wildcards taken literally."""
+    db_session.add_all([
+        User(full_name=name, email=email, password_hash="x")
+        for name, email in (
+            ("Ahmad Fauzi", "ahmad@example.com"),
+            ("Fauziah", "f.ziah@example.com"),
+            ("Budi", "fauzan_budi@example.com"),
+            ("Siti", "siti@example.com"),
+        )
+    ])
+    await db_session.flush()
+    service = UserService(db_session)
+
+    assert {user.full_name for user in await service.list(search="FAUZ")} == {"Ahmad Fauzi", "Fauziah", "Budi"}
+    assert [user.full_name for user in await service.list(search="n_b")] == ["Budi"]
+    assert await service.list(search="%") == []
+    assert len(await service.list(search="  ")) == 4
+
+
+@pytest.mark.asyncio
+async def test_equipment_search(db_session):
+    db_session.add_all([
+        MedicalEquipment(name=name, category="mobility", total_stock=1, available_stock=1)
+        for name in ("Kursi Roda", "Kruk", "Tongkat Kursi")
+    ])
+    await db_session.flush()
+
+    found = await EquipmentService(db_session).list_equipment(search="kursi")
+    assert [equipment.name for equipment in found] == ["Kursi Roda", "Tongkat Kursi"]
+
+
+def test_postgresql_search_uses_trigram_operators():
+    """On PostgreSQL matches may also be trigram-similar and are ordered by similarity."""
+    query = apply_search(select(User.id), "postgresql", "fauzi", User.full_name, User.email)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "users.full_name ILIKE" in sql and "users.full_name %" in sql
+    assert "ORDER BY greatest(similarity(users.full_name" in sql
+    # Two-letter terms have no useful trigrams: substring match only
+    short = str(apply_search(select(User.id), "postgresql", "fa", User.full_name).compile(dialect=postgresql.dialect()))
+    assert "ILIKE" in short and "users.full_name %" not in short
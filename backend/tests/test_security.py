@@ -0,0 +1,43 @@
+"""
+Test password hashing pool
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.security import PasswordHashPool, get_password_hash_async, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_async_hash_roundtrip():
+    """Async hashing produces hashes the async verifier accepts."""
+    hashed = await get_password_hash_async("password123")
+    assert await verify_password_async("password123", hashed)
+    assert not await verify_password_async("wrong-password", hashed)
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency_without_blocking_loop():
+    """Blocking work runs on `workers` threads; the loop keeps ticking meanwhile."""
+    pool = PasswordHashPool(workers=2)
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.gather(*(pool.run(time.sleep, 0.05) for _ in range(6)))
+    ticking.cancel()
+
+    stats = pool.stats()
+    assert stats["completed"] == 6
+    assert stats["max_waiting"] == 4
+    assert stats["waiting"] == 0 and stats["running"] == 0
+    assert max(gaps) < 0.04